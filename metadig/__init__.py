@@ -11,6 +11,7 @@ from metadig import metadata
 from metadig import suites
 from .checks import getType
 from .checks import isResolvable
+from .checks import isResolvable_many
 from .checks import run_check
 from .variable import isBlank
 from .variable import toUnicode
@@ -18,9 +19,13 @@ from .object_store import StoreManager
 from .object_store import MetadataNotFoundError
 from .object_store import ObjectNotFoundError
 from .metadata import read_sysmeta_element
+from .metadata import parse_sysmeta
 from .metadata import find_eml_entity
+from .metadata import get_eml_entity_index
 from .metadata import find_entity_index
 from .metadata import read_csv_with_metadata
+from .metadata import read_csv_chunks_with_metadata
+from .metadata import read_csv_header_with_metadata
 from .metadata import get_valid_csv
 from .metadata import detect_text_encoding
 from .metadigclient import MetaDigClientUtilities
@@ -29,12 +34,17 @@ __all__ = [
     "StoreManager",
     "getType",
     "isResolvable",
+    "isResolvable_many",
     "isBlank",
     "toUnicode",
     "read_sysmeta_element",
+    "parse_sysmeta",
     "find_eml_entity",
+    "get_eml_entity_index",
     "find_entity_index",
     "read_csv_with_metadata",
+    "read_csv_chunks_with_metadata",
+    "read_csv_header_with_metadata",
     "get_valid_csv",
     "detect_text_encoding",
     "run_check",
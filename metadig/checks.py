@@ -1,14 +1,48 @@
 """Metadig check utilities"""
 
+import contextlib
+import copy
 import json
+import os
+import signal
 import sys
-import urllib.request
+import threading
+import time
 import urllib.error
-import urllib.parse
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
 from urllib.parse import urlparse
 from typing import Dict, Any, Optional
 from lxml import etree
+from .data_pid_resolver import get_data_pid_resolver
+from .http_client import TIMEOUT_ERRORS, get_http_client
+from .node_registry import get_node_registry
+from .resolution_cache import get_resolution_cache
+
+# Maximum number of parsed checks to keep in the process-wide check cache
+CHECK_CACHE_MAX_SIZE = 128
+
+_check_cache = OrderedDict()
+_check_cache_lock = threading.Lock()
+
+# Seconds to wait for a remote server to respond before giving up on a request
+URL_TIMEOUT = 30
+# Maximum number of urls resolved at the same time by 'isResolvable_many'
+RESOLVE_MAX_WORKERS = 16
+# Minimum seconds between the start of two requests to the same host in 'isResolvable_many'
+RESOLVE_HOST_INTERVAL = 0.1
+
+_resolve_executor = None
+_resolve_executor_pid = None
+_resolve_executor_lock = threading.Lock()
+
+
+class CheckTimeoutError(BaseException):
+    """Raised in a worker when a check runs past its time budget. It derives from
+    BaseException so that the broad exception handlers in check code do not swallow it.
+    """
 
 
 def getType(object_to_check):
@@ -21,7 +55,8 @@ def isResolvable(url):
     """Function that checks if a url is resolvable
 
     The function first checks if the url uses HTTP protocols, which is
-    currently the only protocol supported.
+    currently the only protocol supported. Results are cached by the normalized
+    url (see 'resolution_cache'), with a shorter lifetime for unresolvable urls.
 
     Args:
         url - the url to check for resolvability
@@ -47,14 +82,26 @@ def isResolvable(url):
             ),
         )
 
+    # Use the result of an earlier resolution of the url, if it has not expired
+    cache = get_resolution_cache()
+    if cache is not None:
+        result = cache.get(url)
+        if result is not None:
+            return result
+    result = _resolve_url(url)
+    if cache is not None and len(result) == 2:
+        cache.set(url, result)
+    return result
+
+
+def _resolve_url(url):
+    """Request an http(s) url and return the (bool, message) result of 'isResolvable'."""
     # Perform an HTTP 'Head' request - we just want to know if the file exists and do not need to
     # download it.
-    request = urllib.request.Request(url)
-    request.get_method = lambda: "HEAD"
-    # Python urllib2 strangely throws an error for an http status, and the response object is
-    # returned by the exception code.
     try:
-        response = urllib.request.urlopen(request)
+        response = get_http_client().request("HEAD", url, timeout=URL_TIMEOUT)
+        # Raise error statuses as an HTTPError, as urllib did, to report them below
+        response.raise_for_status()
     except urllib.error.HTTPError as he:
         # An error was encountered resolving the url, check which one so that we can print
         # a more meaningful error message than provided by HTTPError
@@ -74,18 +121,26 @@ def isResolvable(url):
                 'Error resolving URL "{}": {} {}'.format(url, he.code, he.headers),
             )
     except urllib.error.URLError as ue:
-        return (False, ue.reason[1])
+        if isinstance(ue.reason, TIMEOUT_ERRORS):
+            return (False, f"Timed out resolving URL {url}: {ue.reason}")
+        # Report the error description of a socket error (ex. 'Connection refused')
+        if isinstance(ue.reason, OSError) and ue.reason.strerror:
+            return (False, ue.reason.strerror)
+        return (False, str(ue.reason))
+    except TIMEOUT_ERRORS as te:
+        return (False, f"Timed out resolving URL {url}: {te}")
     except OSError as oe:
         return (False, repr(oe))
     # pylint: disable=W0718
     except Exception as e:
         return (False, repr(e))
+    except CheckTimeoutError:
+        raise
     # Disabling this warning for legacy code
     # pylint: disable=W0702
     except:
         return (False, "Unexpected error:", sys.exc_info()[0])
 
-    response.close()
     if response.code in set([200, 202, 203, 206, 301, 302, 303, 307, 308]):
         return (
             True,
@@ -95,72 +150,153 @@ def isResolvable(url):
         return (False, "Did not resolved the URL {}".format(url))
 
 
-def get_data_pids(identifier: str, member_node: str):
+class HostRateLimiter:
+    """Spaces out the start of requests to each host by a minimum interval. The limiter is
+    thread-safe, so that it can be shared by the workers resolving URLs concurrently.
+    """
+
+    def __init__(self, min_interval: float):
+        """
+        :param float min_interval: Minimum seconds between the start of two requests to the
+            same host
+        """
+        self.min_interval = min_interval
+        self._next_start = {}
+        self._lock = threading.Lock()
+
+    def wait(self, host: str):
+        """Block until a request to the host may start.
+
+        :param str host: The host (network location) of the request
+        """
+        if self.min_interval <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start.get(host, now))
+            self._next_start[host] = start + self.min_interval
+        if start > now:
+            time.sleep(start - now)
+
+
+def isResolvable_many(
+    urls,
+    max_workers: int = RESOLVE_MAX_WORKERS,
+    host_interval: float = RESOLVE_HOST_INTERVAL,
+):
+    """Checks if many urls are resolvable, resolving them concurrently.
+
+    Identical urls are only resolved once, and the requests to each host are spaced out by
+    'host_interval' seconds (on top of the per-host connection limit of the HTTP client).
+
+    Args:
+        urls - the urls to check for resolvability
+        max_workers - the maximum number of urls to resolve at the same time, up to the
+            'RESOLVE_MAX_WORKERS' threads of the shared thread pool
+        host_interval - the minimum seconds between the start of two requests to a host
+
+    Returns:
+        list: the result of 'isResolvable' for each url, in the order of 'urls'
+    """
+    urls = list(urls)
+    unique_urls = list(dict.fromkeys(urls))
+    if not unique_urls:
+        return []
+    rate_limiter = HostRateLimiter(host_interval)
+    worker_slots = threading.BoundedSemaphore(max_workers)
+
+    def resolve(url):
+        with worker_slots:
+            host = urlparse(url).netloc.lower()
+            if host:
+                rate_limiter.wait(host)
+            return isResolvable(url)
+
+    executor = get_resolve_executor()
+    futures = [executor.submit(resolve, url) for url in unique_urls]
+    try:
+        results = {url: future.result() for url, future in zip(unique_urls, futures)}
+    except BaseException:
+        # Do not wait for the remaining urls when the check is cancelled
+        for future in futures:
+            future.cancel()
+        raise
+    return [results[url] for url in urls]
+
+
+def get_resolve_executor():
+    """Returns the process-wide thread pool that resolves urls for 'isResolvable_many', so
+    that its threads, and their connections to the resolution cache, are reused between
+    calls. A new pool is created in a forked process.
+
+    :return: The thread pool
+    :rtype: ThreadPoolExecutor
+    """
+    global _resolve_executor, _resolve_executor_pid
+    with _resolve_executor_lock:
+        if _resolve_executor is None or _resolve_executor_pid != os.getpid():
+            _resolve_executor = ThreadPoolExecutor(
+                max_workers=RESOLVE_MAX_WORKERS, thread_name_prefix="metadig-resolve"
+            )
+            _resolve_executor_pid = os.getpid()
+        return _resolve_executor
+
+
+def get_data_pids(
+    identifier: str, member_node: str, member_node_url: Optional[str] = None
+):
     """Retrieve the associated data pids for the given pid by querying the appropriate
     member node's solr end point.
 
     :param str identifier: The persistent identifier to retrieve data pids for
     :param str member_node: The member node whose URL to query (ex. 'urn:node:ARCTIC')
+    :param str member_node_url: The member node's (v2) base url, if it has already been
+        retrieved with 'get_member_node_url'
     :return: List of data pids
     """
-    member_node_url = get_member_node_url(member_node)
-    encoded_identifier = urllib.parse.quote(identifier)
-    solr_query = f"/query/solr/?q=isDocumentedBy:%22{encoded_identifier}%22&fl=id"
-    query_url = member_node_url + solr_query
+    return get_data_pids_many([identifier], member_node, member_node_url)[identifier]
 
-    try:
-        # Create a request and parse response for the associated data pids (objects)
-        req = urllib.request.Request(query_url)
 
-        # Send the request and read the response
-        with urllib.request.urlopen(req) as response:
-            # Read and decode the response
-            xml_bytes = response.read()
-            # pylint: disable=I1101
-            root = etree.fromstring(xml_bytes)
+def get_data_pids_many(
+    identifiers, member_node: str, member_node_url: Optional[str] = None
+):
+    """Retrieve the associated data pids for many pids, by querying the appropriate member
+    node's solr end point for many pids at a time (see 'data_pid_resolver'). The data pids
+    of each pid are cached.
 
+    :param list identifiers: The persistent identifiers to retrieve data pids for
+    :param str member_node: The member node whose URL to query (ex. 'urn:node:ARCTIC')
+    :param str member_node_url: The member node's (v2) base url, if it has already been
+        retrieved with 'get_member_node_url'
+    :return: Dictionary of the list of data pids of each identifier
+    :raises RuntimeError: If the member node cannot be queried. The error raised by
+        'DataPidResolver.resolve' (ex. an 'HTTPError', 'URLError' or 'TimeoutError') is
+        chained as its cause.
+    """
+    if member_node_url is None:
+        member_node_url = get_member_node_url(member_node)
+    try:
+        return get_data_pid_resolver().resolve(identifiers, member_node_url)
     except Exception as ge:
         raise RuntimeError(f"Unexpected exception encountered: {ge}") from ge
 
-    # Iterate over the doc list and return a list of the data pids
-    data_pids = [
-        elem.text
-        for elem in root.xpath('//doc/str[@name="id"]')
-        if elem.text != identifier
-    ]
-    return data_pids
-
 
 def get_member_node_url(member_node: str):
-    """Retrieve the associated member node's baseUrl from the CN. Note, we append '/v2'
-    to the Base URL retrieved.
+    """Retrieve the associated member node's baseUrl from the member node registry, which
+    caches the CN node list (see 'node_registry'). Note, we append '/v2' to the Base URL
+    retrieved.
 
     :param str member_node: The persistent identifier to retrieve data pids for
     :return: baseUrl to the member node
     """
     try:
-        url = "https://cn.dataone.org/cn/v2/node"
-
-        # Create and send the request
-        req = urllib.request.Request(url)
-
-        with urllib.request.urlopen(req) as response:
-            data = response.read().decode("utf-8")
-            # Convert the string to bytes so lxml can parse it
-            xml_bytes = data.encode("utf-8")
-            # pylint: disable=I1101
-            root = etree.fromstring(xml_bytes)
-
+        base_url = get_node_registry().get_base_url(member_node)
     except Exception as ge:
         raise RuntimeError(f"Unexpected exception encountered: {ge}") from ge
 
-    # Find the matching node and return its baseURL
-    for node in root.findall(".//node"):
-        node_id = node.findtext("identifier")
-        if node_id == member_node:
-            base_url = node.findtext("baseURL")
-            v2_base_url = base_url + "/v2"
-            return v2_base_url
+    if base_url is not None:
+        v2_base_url = base_url + "/v2"
+        return v2_base_url
     raise ValueError(f"Base Url not found for member node: {member_node}.")
 
 
@@ -207,111 +343,442 @@ def get_sysmeta_vars(sysmeta_path: str):
     return sm_rn_vars
 
 
+class CompiledCheck:
+    """A metadig check that has been parsed and compiled, ready to be run against any number
+    of metadata documents. Use 'load_check' to retrieve instances from the process-wide cache.
+
+    Attributes:
+        path (str): Path to the check xml.
+        check_id (str): Value of the check's <id> element, or 'Unknown'.
+        environment (str): Value of the check's <environment> element, or None.
+        selectors (list): Tuples of (name, namespace_aware, selector element).
+        has_dialects (bool): Whether the check declares any <dialect> elements.
+        dialect_xpaths (list): Compiled xpaths of the check's dialects.
+        code: Code object of the check's <code> (with the 'call()' entry point appended),
+            or None if the check has no code.
+        code_error (Exception): Error raised while compiling the check code, if any.
+    """
+
+    def __init__(self, check_xml_path: str):
+        # pylint: disable=I1101
+        check_doc = etree.parse(check_xml_path).getroot()
+        self.path = check_xml_path
+        check_id_elem = check_doc.xpath(".//id")
+        self.check_id = check_id_elem[0].text if check_id_elem else "Unknown"
+        self.environment = check_doc.findtext("environment")
+
+        self.selectors = []
+        for selector in check_doc.xpath(".//selector"):
+            selector_name = selector.xpath("name")[0].text
+            ns_aware_attr = selector.get("namespaceAware") or ""
+            ns_aware = ns_aware_attr.strip().lower() == "true"
+            self.selectors.append((selector_name, ns_aware, selector))
+
+        dialect_nodes = check_doc.xpath("dialect")
+        self.has_dialects = bool(dialect_nodes)
+        self.dialect_xpaths = []
+        for dialect_node in dialect_nodes:
+            dialect_name_elem = dialect_node.xpath("name")
+            dialect_xpath_elem = dialect_node.xpath("xpath")
+            if dialect_name_elem and dialect_xpath_elem:
+                # pylint: disable=I1101
+                self.dialect_xpaths.append(etree.XPath(dialect_xpath_elem[0].text))
+
+        self.code = None
+        self.code_error = None
+        code_elem = check_doc.xpath("code")
+        if code_elem:
+            try:
+                self.code = compile(
+                    code_elem[0].text + "\ncall()", check_xml_path, "exec"
+                )
+            except SyntaxError as se:
+                # Surface the error when the check is run, just like 'exec' would
+                self.code_error = se
+
+    def is_valid_for(self, metadata_doc):
+        """Check if this check is valid for the given metadata document.
+
+        :param metadata_doc: XML representing the metadata document.
+        :return: True if valid, False otherwise.
+        """
+        if not self.has_dialects:
+            # If no dialect specified, assume check is valid for all metadata
+            return True
+        for dialect_xpath in self.dialect_xpaths:
+            if dialect_xpath(metadata_doc):
+                return True
+        return False
+
+
+def load_check(check_xml_path: str) -> CompiledCheck:
+    """Retrieve the parsed and compiled check for the given path from the process-wide
+    check cache, parsing it if it is not cached or if the file has changed on disk.
+
+    The cache is keyed by the absolute path of the check and validated against the file's
+    mtime and size. The least recently used checks are evicted once the cache holds more
+    than 'CHECK_CACHE_MAX_SIZE' checks.
+
+    :param str check_xml_path: Path to the XML file containing the check configuration.
+    :return: The compiled check
+    :rtype: CompiledCheck
+    """
+    abs_path = os.path.abspath(check_xml_path)
+    stat = os.stat(abs_path)
+    file_signature = (stat.st_mtime_ns, stat.st_size)
+
+    with _check_cache_lock:
+        cached = _check_cache.get(abs_path)
+        if cached is not None and cached[0] == file_signature:
+            _check_cache.move_to_end(abs_path)
+            return cached[1]
+
+    compiled_check = CompiledCheck(check_xml_path)
+
+    with _check_cache_lock:
+        _check_cache[abs_path] = (file_signature, compiled_check)
+        _check_cache.move_to_end(abs_path)
+        while len(_check_cache) > CHECK_CACHE_MAX_SIZE:
+            _check_cache.popitem(last=False)
+    return compiled_check
+
+
+def clear_check_cache():
+    """Remove all parsed checks from the process-wide check cache."""
+    with _check_cache_lock:
+        _check_cache.clear()
+
+
+class MetadataDocument:
+    """A metadata document that is read from disk once and shared by every check that is run
+    against it.
+
+    The namespace aware tree is parsed on first use, and the namespace-stripped view that most
+    selectors are evaluated against is only built when a selector needs it. Callers that already
+    hold a parsed tree can supply its root element instead of the raw bytes.
+
+    Attributes:
+        path (str): Path to the metadata document, if it was read from disk.
+    """
+
+    def __init__(
+        self, raw: Optional[bytes] = None, root=None, path: Optional[str] = None
+    ):
+        """Initialize the metadata document.
+
+        :param bytes raw: Raw content of the metadata document.
+        :param root: Root element of an already parsed (namespace aware) metadata document.
+        :param str path: Path to the metadata document, used in messages.
+        """
+        if raw is None and root is None:
+            raise ValueError(
+                "Either the raw metadata document or its root is required."
+            )
+        self.path = path
+        self._raw = raw
+        self._root = root
+        self._root_no_ns = None
+        self._text = None
+
+    @classmethod
+    def from_path(cls, metadata_xml_path: str):
+        """Read the metadata document at the given path.
+
+        :param str metadata_xml_path: Path to the XML metadata document.
+        :return: The metadata document
+        :rtype: MetadataDocument
+        """
+        with open(metadata_xml_path, "rb") as f:
+            raw = f.read()
+        return cls(raw=raw, path=metadata_xml_path)
+
+    @property
+    def raw(self) -> bytes:
+        """The raw bytes of the metadata document."""
+        if self._raw is None:
+            # pylint: disable=I1101
+            self._raw = etree.tostring(
+                self._root.getroottree(), encoding="UTF-8", xml_declaration=True
+            )
+        return self._raw
+
+    @property
+    def root(self):
+        """The namespace aware root element of the metadata document."""
+        if self._root is None:
+            # pylint: disable=I1101
+            self._root = etree.fromstring(self._raw, base_url=self.path)
+        return self._root
+
+    @property
+    def root_no_ns(self):
+        """The root element of a copy of the metadata document with namespaces removed."""
+        if self._root_no_ns is None:
+            root_no_ns = copy.deepcopy(self.root)
+            # Remove namespaces
+            for elem in root_no_ns.iter():
+                if elem.tag.startswith("{") and not elem.tag.startswith(
+                    "{http://www.w3.org/2001/XMLSchema-instance}"
+                ):
+                    elem.tag = elem.tag.split("}", 1)[1]
+            self._root_no_ns = root_no_ns
+        return self._root_no_ns
+
+    @property
+    def text(self) -> str:
+        """The metadata document decoded as a utf-8 string, with newlines translated the same
+        way as reading the document in text mode."""
+        if self._text is None:
+            self._text = (
+                self.raw.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+            )
+        return self._text
+
+
+class EvaluationContext:
+    """The values that every check run against a metadata document needs, resolved once:
+    the sysmeta variables, the system metadata document, the member node url and the data
+    pids. A suite resolves its context in the parent process and ships it to its workers, so
+    the CN node list and solr are queried once per suite instead of once per check.
+
+    Attributes:
+        sysmeta_vars (dict): The variables returned by 'get_sysmeta_vars'.
+        system_metadata (str): The system metadata document as a string.
+        member_node_url (str): The (v2) base url of the authoritative member node.
+        data_pids (list): The data pids documented by the metadata document.
+    """
+
+    def __init__(
+        self,
+        sysmeta_vars: Dict[str, Any],
+        system_metadata: str,
+        member_node_url: Optional[str],
+        data_pids: list,
+    ):
+        self.sysmeta_vars = sysmeta_vars
+        self.system_metadata = system_metadata
+        self.member_node_url = member_node_url
+        self.data_pids = data_pids
+
+    @classmethod
+    def from_sysmeta_path(
+        cls,
+        metadata_sysmeta_path: str,
+        sysmeta_vars: Optional[Dict[str, Any]] = None,
+        data_pids: Optional[list] = None,
+    ):
+        """Resolve the evaluation context for the given sysmeta document.
+
+        :param str metadata_sysmeta_path: Path to the sysmeta for the XML metadata document
+        :param Dict sysmeta_vars: The variables already parsed from the sysmeta document
+            with 'get_sysmeta_vars', if available.
+        :param list data_pids: The data pids already retrieved for the document (ex. with
+            'get_data_pids_many'), if available.
+        :return: The evaluation context
+        :rtype: EvaluationContext
+        """
+        if sysmeta_vars is None:
+            sysmeta_vars = get_sysmeta_vars(metadata_sysmeta_path)
+        # read in the sysmeta to provide to checks as a string
+        with open(metadata_sysmeta_path, "r", encoding="utf-8") as f:
+            system_metadata = f.read()
+        identifier = sysmeta_vars.get("identifier")
+        auth_mn_node = sysmeta_vars.get("authoritative_member_node")
+        member_node_url = get_member_node_url(auth_mn_node)
+        if data_pids is None:
+            data_pids = get_data_pids(identifier, auth_mn_node, member_node_url)
+        return cls(sysmeta_vars, system_metadata, member_node_url, data_pids)
+
+
+@dataclass
+class CheckResult:
+    """The result of running a check, as a compact record that is cheap to pass between
+    processes. Results are only serialized to JSON at the edge, with 'dumps_results'.
+
+    Attributes:
+        check_id (str): The file name of the check.
+        identifiers (list): The identifiers the check was run against.
+        output: The output of the check.
+        status (str): The status of the check (ex. 'SUCCESS', 'FAILURE' or 'ERROR').
+    """
+
+    __slots__ = ("check_id", "identifiers", "output", "status")
+    check_id: str
+    identifiers: Any
+    output: Any
+    status: str
+
+    @classmethod
+    def from_output(cls, check_id: str, check_output: Dict[str, Any]):
+        """Create a check result from the output dictionary of a check.
+
+        :param str check_id: The file name of the check.
+        :param Dict check_output: The 'metadigpy_result' of the check, or its output and
+            status.
+        :return: The check result
+        :rtype: CheckResult
+        """
+        return cls(
+            check_id,
+            check_output.get("identifiers", ["N/A"]),
+            check_output.get("output"),
+            check_output.get("status"),
+        )
+
+    @classmethod
+    def from_timeout(cls, check_id: str, msg: str):
+        """Create the result of a check that ran past its time budget.
+
+        :param str check_id: The file name of the check.
+        :param str msg: The time budget that was exceeded.
+        :return: The check result
+        :rtype: CheckResult
+        """
+        return cls(check_id, "N/A", f"Check timed out: {msg}", "ERROR")
+
+    @classmethod
+    def from_error(cls, check_id: str, msg: Optional[str]):
+        """Create the result of a check that could not be run.
+
+        :param str check_id: The file name of the check.
+        :param str msg: Why the check could not be run.
+        :return: The check result
+        :rtype: CheckResult
+        """
+        return cls(check_id, "N/A", f"Unexpected exception: {msg}", "ERROR")
+
+    def to_dict(self):
+        """Get the check result as a dictionary, in the format of the suite results."""
+        return {
+            "check_id": self.check_id,
+            "identifiers": self.identifiers,
+            "output": self.output,
+            "status": self.status,
+        }
+
+
+def encode_result(obj):
+    """JSON encoder hook ('default') that serializes check results and the values checks
+    commonly return.
+
+    :param obj: The object that the json module cannot serialize by itself.
+    :return: A JSON serializable version of the object
+    """
+    if isinstance(obj, CheckResult):
+        return obj.to_dict()
+    if isinstance(obj, Path):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps_results(results, compact: bool = False):
+    """Serialize check or suite results to JSON.
+
+    :param results: A 'CheckResult', or any JSON serializable structure containing them
+        (ex. the suite results returned by 'suites.run_suite' in structured mode).
+    :param bool compact: Whether to write compact JSON without indentation or whitespace,
+        instead of indenting it by 4 spaces.
+    :return: The results as a JSON string
+    :rtype: str
+    """
+    if compact:
+        return json.dumps(results, default=encode_result, separators=(",", ":"))
+    return json.dumps(results, default=encode_result, indent=4)
+
+
 def run_check(
     check_xml_path: str,
-    metadata_xml_path: str,
+    metadata_xml_path: Optional[str],
     metadata_sysmeta_path: str,
     store_props: Optional[Dict[str, Any]] = None,
+    evaluation_context: Optional[EvaluationContext] = None,
+    metadata_document: Optional[MetadataDocument] = None,
+    structured: bool = False,
 ):
     """
     Run a validation check against an XML metadata document.
 
     :param str check_xml_path: Path to the XML file containing the check configuration.
-    :param str metadata_xml_path: Path to the XML metadata document.
+    :param str metadata_xml_path: Path to the XML metadata document. May be None when a
+        'metadata_document' is supplied.
     :param str metadata_sysmeta_path: Path to the sysmeta for the XML metadata document
     :param Dict store_props: Dictionary containing the store properties: store_type, store_path,
         store_depth, store_width, store_algorithm, store_metadata_namespace
+    :param EvaluationContext evaluation_context: The already resolved sysmeta, member node
+        url and data pids for the metadata document, to skip resolving them for this check.
+    :param MetadataDocument metadata_document: An already loaded metadata document to run the
+        check against instead of reading 'metadata_xml_path'.
+    :param bool structured: Whether to return the result as a 'CheckResult' instead of a
+        JSON string.
     :return: The result of the check function.
     """
-    # Load the metadata and check XML files
-    # pylint: disable=I1101
-    metadata_doc = etree.parse(metadata_xml_path).getroot()
-    metadata_doc_no_ns = etree.parse(metadata_xml_path).getroot()
-
-    # Remove namespaces
-    for elem in metadata_doc_no_ns.iter():
-        if elem.tag.startswith("{") and not elem.tag.startswith(
-            "{http://www.w3.org/2001/XMLSchema-instance}"
-        ):
-            elem.tag = elem.tag.split("}", 1)[1]
-
-    # Load the check XML & ensure the check is valid
-    check_doc = etree.parse(check_xml_path).getroot()
-    check_id_elem = check_doc.xpath(".//id")
-    check_id = check_id_elem[0].text if check_id_elem else "Unknown"
-    if not is_check_valid(check_doc, metadata_doc):
+    # Load the metadata document once, its trees are parsed on demand
+    if metadata_document is None:
+        metadata_document = MetadataDocument.from_path(metadata_xml_path)
+    metadata_doc = metadata_document.root
+
+    # Load the check from the check cache & ensure the check is valid
+    compiled_check = load_check(check_xml_path)
+    check_id = compiled_check.check_id
+    if not compiled_check.is_valid_for(metadata_doc):
         print(
-            f"Check {check_id} is not valid for metadata document {metadata_xml_path}"
+            f"Check {check_id} is not valid for metadata document"
+            + f" {metadata_document.path or metadata_xml_path}"
         )
         return
 
-    # Extract selectors and apply them
-    selectors = check_doc.xpath(".//selector")
-    if not selectors:
+    # Ensure selectors are defined
+    if not compiled_check.selectors:
         raise ValueError("No selectors are defined for this check.")
 
     # Prepare check variables
     check_vars = {}
-    sysmeta_check_vars = get_sysmeta_vars(metadata_sysmeta_path)
-    identifier = sysmeta_check_vars.get("identifier")
-    auth_mn_node = sysmeta_check_vars.get("authoritative_member_node")
-    data_pids = get_data_pids(identifier, auth_mn_node)
-    # TODO: Potential Optimization Point
-    # `variables-congruent` is the only check at this time that requires it, and seems
-    # like we're adding a lot of overhead for just one check.
-    # if "data.table-text-delimited.variables-congruent" == check_id:
-    document = Path(metadata_xml_path).read_text(encoding="utf-8")
-    check_vars["document"] = document
+    if evaluation_context is None:
+        evaluation_context = EvaluationContext.from_sysmeta_path(metadata_sysmeta_path)
+    data_pids = evaluation_context.data_pids
+    # The document string is decoded from the bytes already read for the metadata document
+    check_vars["document"] = metadata_document.text
     check_vars["dataPids"] = data_pids
     check_vars["storeConfiguration"] = store_props
-    # read in the sysmeta and add it to check vars as a string
-    with open(metadata_sysmeta_path, "r", encoding="utf-8") as f:
-        metadata_sysmeta_read = f.read()
-    check_vars["systemMetadata"] = metadata_sysmeta_read
+    # add the sysmeta to check vars as a string
+    check_vars["systemMetadata"] = evaluation_context.system_metadata
     # add in mdq params
     resources_dir = (Path(__file__).parent.parent / "metadig/resources").resolve()
     check_vars["mdq_params"] = {
         "metadigDataDir": resources_dir,
     }
     # Extract the information from selectors
-    for selector in selectors:
-        # selector_xpath = selector.xpath("xpath")[0].text
-        selector_name = selector.xpath("name")[0].text
-        ns_aware_elem = selector.get("namespaceAware")
-        ns_aware = ns_aware_elem and ns_aware_elem[0].text.lower() == "true"
-        metadata_doc_to_use = metadata_doc if ns_aware else metadata_doc_no_ns
+    for selector_name, ns_aware, selector in compiled_check.selectors:
+        metadata_doc_to_use = metadata_doc if ns_aware else metadata_document.root_no_ns
         variable_list = select_nodes(metadata_doc_to_use, selector)
         check_vars[selector_name] = variable_list
 
     # Execute check function
-    code_elem = check_doc.xpath("code")
-    if code_elem:
-        exec_code_string = code_elem[0].text + "\ncall()"
+    if compiled_check.code is not None or compiled_check.code_error is not None:
         try:
+            if compiled_check.code_error is not None:
+                raise compiled_check.code_error
             # pylint: disable=W0122
-            exec(exec_code_string, check_vars)
-            metadigpy_result = check_vars.get("metadigpy_result")
-            if metadigpy_result is None:
+            exec(compiled_check.code, check_vars)
+            check_output = check_vars.get("metadigpy_result")
+            if check_output is None:
                 # If there is no metadigpy_result, it is not a data-suite check, so we
                 # fallback to the existing global variables.
-                fallback = {
+                check_output = {
                     "output": check_vars.get("output", "No output."),
                     "status": check_vars.get("status", "FAILURE"),
                 }
-                json_output = json.dumps(fallback, indent=4)
-            else:
-                json_output = json.dumps(metadigpy_result, indent=4)
-            return json_output
         # pylint: disable=W0718
         except Exception as e:
-            exception_output = {}
-            exception_output["identifiers"] = [data_pids]
-            exception_output["output"] = [
-                f"Unexpected exception while running check: {e}"
-            ]
-            exception_output["status"] = "ERROR"
-            json_output = json.dumps(exception_output, indent=4)
-            return json_output
+            check_output = {}
+            check_output["identifiers"] = [data_pids]
+            check_output["output"] = [f"Unexpected exception while running check: {e}"]
+            check_output["status"] = "ERROR"
+        if structured:
+            return CheckResult.from_output(
+                check_xml_path.rsplit("/", 1)[-1], check_output
+            )
+        return json.dumps(check_output, indent=4)
     else:
         raise IOError("Check code is unavailable/cannot be found.")
 
@@ -320,7 +787,8 @@ def try_run_check(obj_tuple):
     """Executes a 'run_check' function in a try block that can be called by multiprocessing.
 
     :param str obj_tuple: a tuple containing the arguments for the 'run_check' function:
-        check_xml_path, metadata_xml_path, metadata_sysmeta_path, store_props
+        check_xml_path, metadata_xml_path, metadata_sysmeta_path, store_props and optionally
+        an evaluation_context
     :return: The results of the check, and the check_id, and an additional message
     """
     try:
@@ -333,6 +801,61 @@ def try_run_check(obj_tuple):
         return None, check_id, str(so_exception)
 
 
+def run_check_task(obj_tuple, timeout: Optional[float] = None):
+    """Executes a 'run_check' function in structured mode, so that it can be called by
+    multiprocessing without serializing its result to JSON.
+
+    :param str obj_tuple: a tuple containing the arguments for the 'run_check' function:
+        check_xml_path, metadata_xml_path, metadata_sysmeta_path, store_props and optionally
+        an evaluation_context
+    :param float timeout: Number of seconds the check may run for before it is cancelled.
+    :return: The result of the check
+    :rtype: CheckResult
+    """
+    check_id = obj_tuple[0].rsplit("/", 1)[-1]
+    try:
+        with check_time_budget(timeout):
+            result = run_check(*obj_tuple, structured=True)
+        if result is None:
+            # The check is not valid for the metadata document
+            return CheckResult.from_error(check_id, None)
+        return result
+    except CheckTimeoutError as te:
+        return CheckResult.from_timeout(check_id, str(te))
+    # pylint: disable=W0718
+    except Exception as so_exception:
+        return CheckResult.from_error(check_id, str(so_exception))
+
+
+@contextlib.contextmanager
+def check_time_budget(timeout: Optional[float]):
+    """Context manager that raises a 'CheckTimeoutError' in the running code once 'timeout'
+    seconds have passed. The budget is enforced with a real-time interval timer, so it is only
+    available in the main thread of a process on platforms with 'signal.setitimer'; otherwise
+    the code runs without a budget.
+
+    :param float timeout: Number of seconds the code may run for, or None for no budget.
+    """
+    if (
+        timeout is None
+        or not hasattr(signal, "setitimer")
+        or threading.current_thread() is not threading.main_thread()
+    ):
+        yield
+        return
+
+    def raise_timeout(signum, frame):
+        raise CheckTimeoutError(f"Check exceeded its time budget of {timeout} seconds")
+
+    previous_handler = signal.signal(signal.SIGALRM, raise_timeout)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous_handler)
+
+
 def is_check_valid(check_doc, metadata_doc):
     """
     Check if the given check document is valid for the metadata document.
@@ -0,0 +1,275 @@
+"""
+Module: data_pid_resolver.py
+
+This module looks up the data objects documented by metadata documents, by querying the Solr
+index of a member node for the objects whose 'isDocumentedBy' field names each metadata
+identifier. Many identifiers are looked up with each query, the results are paged through so
+that large packages are not truncated by the default number of Solr rows, and the data pids of
+each identifier are cached.
+
+Classes:
+- DataPidResolver: Batched, paged and cached lookup of the data pids of metadata identifiers.
+
+Example Usage:
+    resolver = get_data_pid_resolver()
+    data_pids = resolver.resolve(
+        ["doi:10.18739/A2QJ78081", "doi:10.18739/A2RJ48X0F"],
+        "https://arcticdata.io/metacat/d1/mn/v2",
+    )
+    # {"doi:10.18739/A2QJ78081": ["urn:uuid:6a7a874a-..."], "doi:10.18739/A2RJ48X0F": [...]}
+"""
+
+import threading
+import time
+import urllib.parse
+from collections import OrderedDict
+from typing import Optional
+from lxml import etree
+from .http_client import get_http_client
+
+_default_resolver = None
+_default_resolver_lock = threading.Lock()
+
+
+class DataPidResolver:
+    """
+    Resolves metadata identifiers to the pids of the data objects they document.
+
+    Attributes:
+        batch_size (int): Maximum number of identifiers ORed into one query.
+        rows (int): Number of Solr documents requested per page.
+        ttl (float): Seconds for which the data pids of an identifier are cached.
+        max_cache_size (int): Maximum number of identifiers whose data pids are cached.
+        timeout (float): Seconds to wait for the member node to respond, or None for the
+            HTTP client's default.
+
+    Methods:
+        resolve(identifiers, member_node_url):
+            Returns the data pids of each identifier.
+
+        clear_cache():
+            Removes all of the cached data pids.
+    """
+
+    DEFAULT_BATCH_SIZE = 50
+    DEFAULT_ROWS = 1000
+    # Seconds for which the data pids of an identifier are cached
+    DEFAULT_TTL = 60 * 60
+    DEFAULT_MAX_CACHE_SIZE = 4096
+    # Maximum length of the encoded query of a batch, to keep request URLs within the limits
+    # of servers and proxies
+    MAX_QUERY_LENGTH = 4000
+
+    def __init__(
+        self,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        rows: int = DEFAULT_ROWS,
+        ttl: float = DEFAULT_TTL,
+        max_cache_size: int = DEFAULT_MAX_CACHE_SIZE,
+        timeout: Optional[float] = None,
+    ):
+        """
+        Initializes the DataPidResolver.
+
+        Args:
+            batch_size (int): Maximum number of identifiers ORed into one query.
+            rows (int): Number of Solr documents requested per page.
+            ttl (float): Seconds for which the data pids of an identifier are cached.
+            max_cache_size (int): Maximum number of identifiers whose data pids are cached.
+            timeout (float): Seconds to wait for the member node to respond.
+        """
+        self.batch_size = batch_size
+        self.rows = rows
+        self.ttl = ttl
+        self.max_cache_size = max_cache_size
+        self.timeout = timeout
+        # Data pids and the time they were fetched, keyed by (member node url, identifier)
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    def resolve(self, identifiers, member_node_url: str):
+        """
+        Returns the data pids of each metadata identifier, querying the member node for the
+        identifiers that are not cached.
+
+        Args:
+            identifiers (list): The metadata identifiers.
+            member_node_url (str): The member node's (v2) base url.
+
+        Returns:
+            dict: The list of data pids of each identifier, keyed by identifier.
+
+        Raises:
+            urllib.error.HTTPError: If the member node responds with an error status (see
+                'HTTPResponse.raise_for_status').
+            urllib.error.URLError: If the member node cannot be reached, as raised by
+                'HTTPClient.request'.
+            TimeoutError: If the member node does not respond in time ('socket.timeout'
+                before Python 3.10, see 'http_client.TIMEOUT_ERRORS').
+            http.client.HTTPException: If the member node sends an invalid response.
+            lxml.etree.XMLSyntaxError: If a response cannot be parsed.
+        """
+        data_pids = {}
+        missing = []
+        for identifier in dict.fromkeys(identifiers):
+            cached = self._get_cached(member_node_url, identifier)
+            if cached is None:
+                missing.append(identifier)
+            else:
+                data_pids[identifier] = cached
+        for batch in self._batches(missing):
+            batch_data_pids = self._query(batch, member_node_url)
+            for identifier in batch:
+                self._set_cached(
+                    member_node_url, identifier, batch_data_pids[identifier]
+                )
+                data_pids[identifier] = list(batch_data_pids[identifier])
+        return data_pids
+
+    def clear_cache(self):
+        """Removes all of the cached data pids."""
+        with self._cache_lock:
+            self._cache.clear()
+
+    def _get_cached(self, member_node_url, identifier):
+        """Return a copy of the cached data pids of an identifier, or None if they are
+        missing or expired."""
+        key = (member_node_url, identifier)
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is None:
+                return None
+            fetched_at, data_pids = cached
+            if time.time() - fetched_at >= self.ttl:
+                del self._cache[key]
+                return None
+            self._cache.move_to_end(key)
+            return list(data_pids)
+
+    def _set_cached(self, member_node_url, identifier, data_pids):
+        """Cache the data pids of an identifier, evicting the least recently used."""
+        with self._cache_lock:
+            self._cache[(member_node_url, identifier)] = (time.time(), tuple(data_pids))
+            self._cache.move_to_end((member_node_url, identifier))
+            while len(self._cache) > self.max_cache_size:
+                self._cache.popitem(last=False)
+
+    def _batches(self, identifiers):
+        """Split identifiers into batches of at most 'batch_size' identifiers, whose encoded
+        query is at most 'MAX_QUERY_LENGTH' characters long."""
+        batch = []
+        query_length = 0
+        for identifier in identifiers:
+            # The encoded phrase, and the encoded " OR " that joins it to the others
+            term_length = len(urllib.parse.quote(solr_phrase(identifier))) + 8
+            if batch and (
+                len(batch) >= self.batch_size
+                or query_length + term_length > self.MAX_QUERY_LENGTH
+            ):
+                yield batch
+                batch = []
+                query_length = 0
+            batch.append(identifier)
+            query_length += term_length
+        if batch:
+            yield batch
+
+    def _query(self, identifiers, member_node_url):
+        """Query the data pids of a batch of identifiers, paging through the results."""
+        data_pids = {identifier: [] for identifier in identifiers}
+        terms = " OR ".join(solr_phrase(identifier) for identifier in identifiers)
+        params = {
+            "q": f"isDocumentedBy:({terms})",
+            "fl": "id,isDocumentedBy",
+            "rows": self.rows,
+            # Cursors require a sort on the unique key
+            "sort": "id asc",
+            "cursorMark": "*",
+        }
+        start = 0
+        while True:
+            query_url = (
+                f"{member_node_url}/query/solr/?{urllib.parse.urlencode(params)}"
+            )
+            response = get_http_client().request("GET", query_url, timeout=self.timeout)
+            if response.status == 400 and params.get("cursorMark") == "*":
+                # Older Solr versions reject the cursor parameters, so page with offsets
+                del params["cursorMark"]
+                del params["sort"]
+                continue
+            response.raise_for_status()
+            # pylint: disable=I1101
+            root = etree.fromstring(response.body)
+            docs = root.xpath("//result/doc")
+            for doc in docs:
+                pid = doc.findtext('str[@name="id"]')
+                for documented_by in doc.xpath(
+                    'arr[@name="isDocumentedBy"]/str/text()'
+                ):
+                    if documented_by in data_pids and pid != documented_by:
+                        data_pids[documented_by].append(pid)
+
+            # A short page is the last one
+            if len(docs) < self.rows:
+                break
+            if "cursorMark" in params:
+                next_cursor_mark = root.findtext('str[@name="nextCursorMark"]')
+                if next_cursor_mark is not None:
+                    if next_cursor_mark == params["cursorMark"]:
+                        break
+                    params["cursorMark"] = next_cursor_mark
+                    continue
+                # The server does not support cursors, so page with offsets instead
+                del params["cursorMark"]
+            start += len(docs)
+            num_found = int(root.xpath("string(//result/@numFound)") or 0)
+            if not docs or start >= num_found:
+                break
+            params["start"] = start
+        return data_pids
+
+
+def solr_phrase(value: str):
+    """
+    Quotes a value as a Solr phrase, escaping the characters that are special in a phrase.
+
+    Args:
+        value (str): The value to quote.
+
+    Returns:
+        str: The quoted value.
+    """
+    escaped = value.replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{escaped}"'
+
+
+def get_data_pid_resolver():
+    """
+    Returns the process-wide data pid resolver, creating it with the default settings if
+    'configure_data_pid_resolver' has not been called.
+
+    Returns:
+        DataPidResolver: The data pid resolver.
+    """
+    global _default_resolver
+    with _default_resolver_lock:
+        if _default_resolver is None:
+            _default_resolver = DataPidResolver()
+        return _default_resolver
+
+
+def configure_data_pid_resolver(**kwargs):
+    """
+    Replaces the process-wide data pid resolver.
+
+    Args:
+        **kwargs: The DataPidResolver settings (ex. 'batch_size' or 'ttl').
+
+    Returns:
+        DataPidResolver: The new data pid resolver.
+    """
+    global _default_resolver
+    resolver = DataPidResolver(**kwargs)
+    with _default_resolver_lock:
+        _default_resolver = resolver
+    return resolver
@@ -0,0 +1,416 @@
+"""
+Module: http_client.py
+
+This module provides the HTTP client used by the metadig network helpers (ex. 'isResolvable',
+'get_data_pids' and 'get_member_node_url'). Connections are pooled per host and kept alive
+between requests, so that checking many URLs on the same server, or querying the same member
+node for many packages, does not open a new TCP and TLS connection for every request.
+
+Requests time out. Idempotent requests that fail to connect, or that receive a transient error
+status (ex. 503), are retried a bounded number of times with jittered exponential backoff. The
+number of concurrent requests to each host is limited. Errors are raised as the 'urllib.error'
+exceptions that the callers have always handled: 'HTTPError' for error statuses (see
+'HTTPResponse.raise_for_status') and 'URLError' for connection failures.
+
+Requests go through the proxies configured for urllib (ex. the 'http_proxy', 'https_proxy' and
+'no_proxy' environment variables). A forked process does not reuse the connections of its
+parent, and opens its own.
+
+Classes:
+- HTTPResponse: The status, headers and body of a response.
+- HTTPClient: Pooled, keep-alive HTTP client with timeouts, retries and per-host limits.
+
+Example Usage:
+    client = get_http_client()
+    response = client.request("GET", "https://cn.dataone.org/cn/v2/node")
+    response.raise_for_status()
+    node_list = response.body
+"""
+
+import base64
+import http.client
+import os
+import random
+import socket
+import ssl
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from typing import Optional
+
+# Seconds to wait for a remote server to respond before giving up on a request
+DEFAULT_TIMEOUT = 30
+# Errors raised when a server does not respond in time ('socket.timeout' is only an alias of
+# 'TimeoutError' from Python 3.10)
+TIMEOUT_ERRORS = (TimeoutError, socket.timeout)
+
+_default_client = None
+_default_client_lock = threading.Lock()
+
+
+class HTTPResponse:
+    """
+    A response to a request made by the HTTPClient. The body is read in full, so that the
+    connection can be reused.
+
+    Attributes:
+        url (str): The URL of the response, after following redirects.
+        status (int): The HTTP status code.
+        reason (str): The HTTP reason phrase.
+        headers (http.client.HTTPMessage): The response headers.
+        body (bytes): The response body (empty for 'HEAD' requests).
+    """
+
+    def __init__(self, url, status, reason, headers, body):
+        self.url = url
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.body = body
+
+    @property
+    def code(self):
+        """The HTTP status code, as named by 'urllib' responses."""
+        return self.status
+
+    def raise_for_status(self):
+        """
+        Raises an 'urllib.error.HTTPError' if the response has an error status.
+
+        Raises:
+            urllib.error.HTTPError: If the status is 400 or above.
+        """
+        if self.status >= 400:
+            raise urllib.error.HTTPError(
+                self.url, self.status, self.reason, self.headers, None
+            )
+
+
+class _HostPool:
+    """The idle connections to a host, and the limit on concurrent requests to it."""
+
+    def __init__(self, max_connections, proxy=None):
+        self.idle = []
+        # The (host, port, headers) of the proxy the host is reached through, or None
+        self.proxy = proxy
+        self.lock = threading.Lock()
+        self.slots = threading.BoundedSemaphore(max_connections)
+        self.max_idle = max_connections
+
+
+class HTTPClient:
+    """
+    A thread-safe HTTP client that pools keep-alive connections per host.
+
+    Attributes:
+        timeout (float): Default seconds to wait for a server to respond.
+        max_retries (int): Number of times an idempotent request is retried after a
+            connection failure or a retryable status. Timed out requests, and
+            host names that do not resolve, are not retried.
+        backoff_factor (float): Seconds of backoff before the first retry, doubled for every
+            following retry.
+        max_backoff (float): Maximum seconds of backoff before a retry.
+        max_connections_per_host (int): Maximum number of concurrent requests, and of idle
+            connections kept, per host.
+        max_redirects (int): Maximum number of redirects followed for a request.
+
+    Methods:
+        request(method, url, headers, body, timeout):
+            Sends a request and returns its HTTPResponse, following redirects.
+
+        close():
+            Closes all of the idle connections.
+    """
+
+    # Methods that are safe to send again after a failure
+    IDEMPOTENT_METHODS = frozenset(["GET", "HEAD", "OPTIONS", "PUT", "DELETE"])
+    # Statuses that indicate a transient failure of the server
+    RETRY_STATUSES = frozenset([429, 502, 503, 504])
+    REDIRECT_STATUSES = frozenset([301, 302, 303, 307, 308])
+    USER_AGENT = "metadig-py"
+
+    def __init__(
+        self,
+        timeout: float = DEFAULT_TIMEOUT,
+        max_retries: int = 2,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 10,
+        max_connections_per_host: int = 8,
+        max_redirects: int = 10,
+    ):
+        """
+        Initializes the HTTPClient.
+
+        Args:
+            timeout (float): Default seconds to wait for a server to respond.
+            max_retries (int): Number of times an idempotent request is retried.
+            backoff_factor (float): Seconds of backoff before the first retry.
+            max_backoff (float): Maximum seconds of backoff before a retry.
+            max_connections_per_host (int): Maximum concurrent requests per host.
+            max_redirects (int): Maximum number of redirects followed for a request.
+        """
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.max_connections_per_host = max_connections_per_host
+        self.max_redirects = max_redirects
+        self._pools = {}
+        self._pools_lock = threading.Lock()
+        # The process the pools were created in
+        self._pid = os.getpid()
+        self._ssl_context = ssl.create_default_context()
+        # Read once, as urllib's default opener does
+        self._proxies = urllib.request.getproxies()
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[dict] = None,
+        body: Optional[bytes] = None,
+        timeout: Optional[float] = None,
+    ):
+        """
+        Sends a request, following redirects, and returns the final response. Error statuses
+        are returned rather than raised, see 'HTTPResponse.raise_for_status'.
+
+        Args:
+            method (str): The HTTP method (ex. 'GET' or 'HEAD').
+            url (str): The http or https URL to request.
+            headers (dict): Additional request headers.
+            body (bytes): The request body.
+            timeout (float): Seconds to wait for the server to respond, instead of the
+                client's default.
+
+        Returns:
+            HTTPResponse: The response.
+
+        Raises:
+            urllib.error.URLError: If the URL is not http(s), or the server cannot be reached.
+            urllib.error.HTTPError: If there are too many redirects.
+            TimeoutError: If the server does not respond in time ('socket.timeout' before
+                Python 3.10).
+        """
+        method = method.upper()
+        if timeout is None:
+            timeout = self.timeout
+        for _ in range(self.max_redirects + 1):
+            response = self._request_with_retries(method, url, headers, body, timeout)
+            location = response.headers.get("Location")
+            if response.status not in self.REDIRECT_STATUSES or not location:
+                return response
+            url = urllib.parse.urljoin(url, location)
+            if response.status == 303 and method != "HEAD":
+                method, body = "GET", None
+        raise urllib.error.HTTPError(
+            url, response.status, "Too many redirects", response.headers, None
+        )
+
+    def close(self):
+        """Closes all of the idle connections."""
+        self._check_pid()
+        with self._pools_lock:
+            pools = list(self._pools.values())
+        for pool in pools:
+            with pool.lock:
+                idle, pool.idle = pool.idle, []
+            for conn in idle:
+                conn.close()
+
+    def _request_with_retries(self, method, url, headers, body, timeout):
+        """Send a request, retrying idempotent requests after transient failures."""
+        url_comps = urllib.parse.urlsplit(url)
+        if url_comps.scheme not in ("http", "https") or not url_comps.hostname:
+            raise urllib.error.URLError(f"Unsupported URL: {url}")
+        retries = self.max_retries if method in self.IDEMPOTENT_METHODS else 0
+        attempt = 0
+        while True:
+            try:
+                response = self._send(method, url_comps, headers, body, timeout)
+            except TIMEOUT_ERRORS:
+                # A server that did not respond in time is not asked again, as every retry
+                # would wait for the full timeout
+                raise
+            except (OSError, http.client.HTTPException) as e:
+                # Host names that do not resolve are not transient failures
+                if attempt >= retries or isinstance(
+                    getattr(e, "reason", e), socket.gaierror
+                ):
+                    raise
+            else:
+                if response.status not in self.RETRY_STATUSES or attempt >= retries:
+                    return response
+            self._backoff(attempt)
+            attempt += 1
+
+    def _backoff(self, attempt):
+        """Sleep for a random time up to the exponential backoff of the attempt."""
+        cap = min(self.max_backoff, self.backoff_factor * (2**attempt))
+        time.sleep(random.uniform(cap / 2, cap))
+
+    def _send(self, method, url_comps, headers, body, timeout):
+        """Send a single request on a pooled connection and read its response."""
+        port = url_comps.port or (443 if url_comps.scheme == "https" else 80)
+        key = (url_comps.scheme, url_comps.hostname, port)
+        path = url_comps.path or "/"
+        if url_comps.query:
+            path = f"{path}?{url_comps.query}"
+        request_headers = {"User-Agent": self.USER_AGENT}
+        if headers:
+            request_headers.update(headers)
+
+        pool = self._get_pool(key)
+        if pool.proxy is not None and url_comps.scheme == "http":
+            # Plain http requests are sent to the proxy with the absolute URL
+            path = f"http://{url_comps.netloc}{path}"
+            request_headers.update(pool.proxy[2])
+        with pool.slots:
+            with pool.lock:
+                conn = pool.idle.pop() if pool.idle else None
+            # A kept-alive connection may have been closed by the server, in which case the
+            # request is sent again on a new connection
+            while True:
+                reused = conn is not None
+                if conn is None:
+                    conn = self._new_connection(key, timeout, pool.proxy)
+                conn.timeout = timeout
+                if conn.sock is not None:
+                    conn.sock.settimeout(timeout)
+                try:
+                    conn.request(method, path, body=body, headers=request_headers)
+                    response = conn.getresponse()
+                    response_body = response.read()
+                except (
+                    ConnectionError,
+                    http.client.RemoteDisconnected,
+                    http.client.BadStatusLine,
+                ) as e:
+                    conn.close()
+                    conn = None
+                    if reused and method in self.IDEMPOTENT_METHODS:
+                        continue
+                    raise urllib.error.URLError(e) from e
+                except TIMEOUT_ERRORS:
+                    conn.close()
+                    raise
+                except OSError as e:
+                    conn.close()
+                    raise urllib.error.URLError(e) from e
+                except Exception:
+                    conn.close()
+                    raise
+                break
+
+            if response.will_close:
+                conn.close()
+            else:
+                with pool.lock:
+                    if len(pool.idle) < pool.max_idle:
+                        pool.idle.append(conn)
+                        conn = None
+                if conn is not None:
+                    conn.close()
+        return HTTPResponse(
+            url_comps.geturl(),
+            response.status,
+            response.reason,
+            response.headers,
+            response_body,
+        )
+
+    def _check_pid(self):
+        """Drop the pools inherited from the parent process after a fork. Their connections
+        are shared with the parent, and their locks may have been held by its threads.
+        """
+        if self._pid != os.getpid():
+            self._pools = {}
+            self._pools_lock = threading.Lock()
+            self._pid = os.getpid()
+
+    def _get_pool(self, key):
+        """Return the pool of connections to a (scheme, host, port)."""
+        self._check_pid()
+        with self._pools_lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                pool = _HostPool(
+                    self.max_connections_per_host, self._get_proxy(key[0], key[1])
+                )
+                self._pools[key] = pool
+            return pool
+
+    def _get_proxy(self, scheme, host):
+        """Return the (host, port, headers) of the proxy for a scheme and host, or None if
+        the host is reached directly."""
+        proxy_url = self._proxies.get(scheme)
+        if not proxy_url or urllib.request.proxy_bypass(host):
+            return None
+        if "://" not in proxy_url:
+            proxy_url = f"http://{proxy_url}"
+        proxy_comps = urllib.parse.urlsplit(proxy_url)
+        proxy_headers = {}
+        if proxy_comps.username is not None:
+            credentials = urllib.parse.unquote(proxy_comps.username)
+            if proxy_comps.password is not None:
+                credentials += ":" + urllib.parse.unquote(proxy_comps.password)
+            proxy_headers["Proxy-Authorization"] = "Basic " + base64.b64encode(
+                credentials.encode("utf-8")
+            ).decode("ascii")
+        return (proxy_comps.hostname, proxy_comps.port or 80, proxy_headers)
+
+    def _new_connection(self, key, timeout, proxy=None):
+        """Create a connection to a (scheme, host, port), through a proxy if one is
+        given."""
+        scheme, host, port = key
+        if proxy is not None:
+            proxy_host, proxy_port, proxy_headers = proxy
+            if scheme == "https":
+                # https requests are tunnelled through the proxy with CONNECT
+                conn = http.client.HTTPSConnection(
+                    proxy_host, proxy_port, timeout=timeout, context=self._ssl_context
+                )
+                conn.set_tunnel(host, port, headers=proxy_headers)
+                return conn
+            return http.client.HTTPConnection(proxy_host, proxy_port, timeout=timeout)
+        if scheme == "https":
+            return http.client.HTTPSConnection(
+                host, port, timeout=timeout, context=self._ssl_context
+            )
+        return http.client.HTTPConnection(host, port, timeout=timeout)
+
+
+def get_http_client():
+    """
+    Returns the process-wide HTTP client, creating it with the default settings if
+    'configure_http_client' has not been called.
+
+    Returns:
+        HTTPClient: The HTTP client.
+    """
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = HTTPClient()
+        return _default_client
+
+
+def configure_http_client(**kwargs):
+    """
+    Replaces the process-wide HTTP client, closing the connections of the previous one.
+
+    Args:
+        **kwargs: The HTTPClient settings (ex. 'max_retries' or 'max_connections_per_host').
+
+    Returns:
+        HTTPClient: The new HTTP client.
+    """
+    global _default_client
+    client = HTTPClient(**kwargs)
+    with _default_client_lock:
+        previous_client, _default_client = _default_client, client
+    if previous_client is not None:
+        previous_client.close()
+    return client
@@ -1,8 +1,19 @@
 """Metadig metadata utilities"""
 
 import xml.etree.ElementTree as ET
+import codecs
+import functools
 import io
 import hashlib
+import mmap
+import os
+import pathlib
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+import numpy
 import pandas
 import chardet
 import re
@@ -15,6 +26,34 @@ except ImportError:
     # to proceed with the check.
     from metadig.checks import ListWithGet as ArrayList
 
+# Maximum number of bytes of data object content (sysmeta, raw bytes, decoded text, parsed
+# tables and headers) kept in the per-process data object cache. 'SuiteRunner' workers are
+# each given an equal share of the runner's budget instead (see 'suites.SuiteRunner')
+DATA_OBJECT_CACHE_MAX_BYTES = 1024**3
+# Maximum number of data objects kept in the per-process data object cache
+DATA_OBJECT_CACHE_MAX_ENTRIES = 4096
+
+# Maximum number of bytes the encoding of a data object is detected from, when it is not
+# ASCII or UTF-8
+ENCODING_SAMPLE_SIZE = 1024**2
+# Number of bytes fed to the encoding detector and decoders at a time
+ENCODING_CHUNK_SIZE = 64 * 1024
+
+# Default number of rows in each chunk of a csv read with 'read_csv_chunks_with_metadata'
+CSV_CHUNK_ROWS = 50_000
+# Number of bytes 'read_csv_header_with_metadata' starts reading the header of a csv from
+CSV_HEADER_READ_SIZE = 16 * 1024
+# Maximum number of bytes of value hashes computed at a time when hashing columns
+COLUMN_HASH_BATCH_BYTES = 4 * 1024**2
+# Default maximum number of duplicate rows copied into the sample of 'DuplicateRowGroups'
+DUPLICATE_ROW_SAMPLE_SIZE = 100
+# Number of EML documents whose entity index is memoized by 'get_eml_entity_index'
+EML_ENTITY_INDEX_CACHE_SIZE = 8
+
+_data_object_cache = OrderedDict()
+_data_object_cache_lock = threading.RLock()
+_data_object_cache_bytes = 0
+
 
 def read_sysmeta_element(stream, element):
     """
@@ -48,6 +87,90 @@ def read_sysmeta_element(stream, element):
         ) from e
 
 
+@dataclass
+class SystemMetadata:
+    """
+    The commonly used fields of a system metadata document, as returned by 'parse_sysmeta'.
+    Fields that are missing from the document are None.
+
+    Attributes:
+        identifier (str): The identifier of the object.
+        format_id (str): The format of the object.
+        size (int): The size of the object in bytes.
+        checksum (str): The checksum of the object.
+        checksum_algorithm (str): The algorithm of the checksum.
+        file_name (str): The file name of the object.
+    """
+
+    __slots__ = (
+        "identifier",
+        "format_id",
+        "size",
+        "checksum",
+        "checksum_algorithm",
+        "file_name",
+    )
+    identifier: Optional[str]
+    format_id: Optional[str]
+    size: Optional[int]
+    checksum: Optional[str]
+    checksum_algorithm: Optional[str]
+    file_name: Optional[str]
+
+
+# The system metadata elements read by 'parse_sysmeta'
+SYSMETA_ELEMENTS = ("identifier", "formatId", "size", "checksum", "fileName")
+
+
+def parse_sysmeta(stream):
+    """
+    Reads the commonly used fields of a stream of system metadata in a single pass, and
+    stops reading as soon as all of them have been found.
+
+    Args:
+        stream (BufferedReader): A stream containing system metadata.
+
+    Returns:
+        SystemMetadata: The fields of the system metadata.
+
+    Raises:
+        ValueError: If there is an error parsing the sysmeta.
+    """
+    values = {}
+    checksum_algorithm = None
+    depth = 0
+    try:
+        if stream.seekable():
+            stream.seek(0)
+        for event, elem in ET.iterparse(stream, events=("start", "end")):
+            if event == "start":
+                depth += 1
+                continue
+            depth -= 1
+            # Only the children of the root element are fields
+            if depth != 1:
+                continue
+            if elem.tag in SYSMETA_ELEMENTS and elem.tag not in values:
+                values[elem.tag] = elem.text
+                if elem.tag == "checksum":
+                    checksum_algorithm = elem.get("algorithm")
+                if len(values) == len(SYSMETA_ELEMENTS):
+                    break
+            elem.clear()
+    except ET.ParseError as e:
+        raise ValueError(f"Error parsing XML: {e}") from e
+
+    size = values.get("size")
+    return SystemMetadata(
+        identifier=values.get("identifier"),
+        format_id=values.get("formatId"),
+        size=int(size) if size is not None else None,
+        checksum=values.get("checksum"),
+        checksum_algorithm=checksum_algorithm,
+        file_name=values.get("fileName"),
+    )
+
+
 def find_eml_entity(doc, identifier, file_name):
     """
     Searches through a string EML document to find and return dataTable and otherEntity elements
@@ -65,37 +188,97 @@ def find_eml_entity(doc, identifier, file_name):
         identifier or file_name, according to the specified priority (id, entityName, objectName).
         Returns None if no match is found.
     """
+    return get_eml_entity_index(doc).find(identifier, file_name)
 
-    # extract lists into single items
-    list_types = (list, ArrayList)
-
-    if isinstance(file_name, list_types):
-        file_name = file_name[0]
 
-    if isinstance(identifier, list_types):
-        identifier = identifier[0]
+class EMLEntityIndex:
+    """
+    An index of the dataTable and otherEntity elements of an EML document, built once so
+    that entities can be looked up by id, entityName and objectName without scanning the
+    document for every data object. Get the index of a document with
+    'get_eml_entity_index', which memoizes it.
 
-    root = ET.fromstring(doc)
+    The elements are shared by every lookup and must be treated as read-only.
 
-    # Search through dataTable and otherEntity elements
-    for element in root.findall(".//dataTable") + root.findall(".//otherEntity"):
-        # Check if identifier matches the id element
-        id_attr = element.attrib.get("id")
-        if id_attr is not None and id_attr == identifier.replace(":", "-"):
-            return element
+    Attributes:
+        entities (list): The dataTable elements followed by the otherEntity elements, in
+            document order.
+    """
 
-        # Check if fileName matches the entity name element
-        entity_name_elem = element.find(".//entityName")
-        if entity_name_elem is not None and entity_name_elem.text == file_name:
-            return element
+    def __init__(self, doc):
+        """
+        Parses the EML document and indexes its entities.
+
+        Args:
+            doc (str): XML document as a string.
+        """
+        root = ET.fromstring(doc)
+        self.entities = root.findall(".//dataTable") + root.findall(".//otherEntity")
+        # Position of the first entity with each id, entityName and objectName
+        self._positions_by_id = {}
+        self._positions_by_entity_name = {}
+        self._positions_by_object_name = {}
+        for position, element in enumerate(self.entities):
+            id_attr = element.attrib.get("id")
+            if id_attr is not None:
+                self._positions_by_id.setdefault(id_attr, position)
+            entity_name_elem = element.find(".//entityName")
+            if entity_name_elem is not None:
+                self._positions_by_entity_name.setdefault(
+                    entity_name_elem.text, position
+                )
+            object_name_elem = element.find(".//objectName")
+            if object_name_elem is not None:
+                self._positions_by_object_name.setdefault(
+                    object_name_elem.text, position
+                )
+
+    def find(self, identifier, file_name):
+        """
+        Finds the first entity, in the order of 'entities', whose id matches the identifier
+        or whose entityName or objectName matches the file name, like 'find_eml_entity'.
+
+        Args:
+            identifier (str): Identifier to match against the id element.
+            file_name (str): File name to match against the entityName or objectName
+                elements.
+
+        Returns:
+            xml.etree.Element: The matching dataTable or otherEntity element, or None if no
+            match is found.
+        """
+        # extract lists into single items
+        list_types = (list, ArrayList)
+
+        if isinstance(file_name, list_types):
+            file_name = file_name[0]
+
+        if isinstance(identifier, list_types):
+            identifier = identifier[0]
+
+        positions = [
+            self._positions_by_id.get(identifier.replace(":", "-")),
+            self._positions_by_entity_name.get(file_name),
+            self._positions_by_object_name.get(file_name),
+        ]
+        positions = [position for position in positions if position is not None]
+        if not positions:
+            return None
+        return self.entities[min(positions)]
+
+
+@functools.lru_cache(maxsize=EML_ENTITY_INDEX_CACHE_SIZE)
+def get_eml_entity_index(doc):
+    """
+    Get the memoized entity index of an EML document.
 
-        # Check if fileName matches the object name element
-        object_name_elem = element.find(".//objectName")
-        if object_name_elem is not None and object_name_elem.text == file_name:
-            return element
+    Args:
+        doc (str): XML document as a string.
 
-    # Return None if no match is found
-    return None
+    Returns:
+        EMLEntityIndex: The index of the entities of the document.
+    """
+    return EMLEntityIndex(doc)
 
 
 def get_valid_csv(manager, pid):
@@ -115,14 +298,385 @@ def get_valid_csv(manager, pid):
     """
     obj, sys = manager.get_object(pid)
     try:
-        fname = read_sysmeta_element(sys, "fileName")
-        if read_sysmeta_element(sys, "formatId") != "text/csv":
+        sysmeta = parse_sysmeta(sys)
+        fname = sysmeta.file_name
+        if sysmeta.format_id != "text/csv":
             return None, fname, "SKIP"
     finally:
         sys.close()
     return obj, fname, "VALID"
 
 
+class DataObject:
+    """
+    The content of a data object in a store, loaded lazily and memoized, so that every check
+    that touches the data object in a process reads, decodes and parses it only once. Get
+    data objects with 'get_data_object', which shares them through a process-wide cache that
+    is bounded by 'DATA_OBJECT_CACHE_MAX_BYTES' and 'DATA_OBJECT_CACHE_MAX_ENTRIES' and evicts
+    the least recently used objects.
+
+    The bytes, text and tables of a data object are shared between checks and must be treated
+    as read-only.
+
+    Attributes:
+        manager: The store manager the data object is retrieved from.
+        pid (str): Identifier of the data object.
+    """
+
+    def __init__(self, manager, pid):
+        self.manager = manager
+        self.pid = pid
+        self._lock = threading.RLock()
+        self._sysmeta = None
+        self._system_metadata = None
+        self._raw = None
+        self._encoding = None
+        self._encoding_error = None
+        self._text = None
+        self._tables = {}
+        # False until the path of the data object's file is looked up
+        self._local_path = False
+        # Number of bytes held by each part of the content, for the cache's memory budget
+        self._part_sizes = {}
+
+    @property
+    def nbytes(self):
+        """The approximate number of bytes of content held by the data object."""
+        return sum(self._part_sizes.values())
+
+    @property
+    def sysmeta(self):
+        """The system metadata document of the data object, as bytes."""
+        with self._lock:
+            if self._sysmeta is None:
+                obj, sys_stream = self.manager.get_object(self.pid)
+                try:
+                    self._sysmeta = sys_stream.read()
+                    self._set_local_path(obj)
+                finally:
+                    obj.close()
+                    sys_stream.close()
+                self._set_part_size("sysmeta", len(self._sysmeta))
+            return self._sysmeta
+
+    @property
+    def system_metadata(self):
+        """The fields of the system metadata of the data object, parsed once with
+        'parse_sysmeta'."""
+        with self._lock:
+            if self._system_metadata is None:
+                self._system_metadata = parse_sysmeta(io.BytesIO(self.sysmeta))
+                self._set_part_size(
+                    "system_metadata",
+                    sys.getsizeof(self._system_metadata)
+                    + sum(
+                        _get_content_size(getattr(self._system_metadata, field))
+                        for field in SystemMetadata.__slots__
+                    ),
+                )
+            return self._system_metadata
+
+    @property
+    def file_name(self):
+        """The 'fileName' of the data object, from its system metadata."""
+        return self.system_metadata.file_name
+
+    @property
+    def format_id(self):
+        """The 'formatId' of the data object, from its system metadata."""
+        return self.system_metadata.format_id
+
+    @property
+    def raw(self):
+        """The content of the data object, as bytes."""
+        with self._lock:
+            if self._raw is None:
+                obj, sys_stream = self.manager.get_object(self.pid)
+                try:
+                    self._raw = obj.read()
+                    self._set_local_path(obj)
+                    if self._sysmeta is None:
+                        self._sysmeta = sys_stream.read()
+                finally:
+                    obj.close()
+                    sys_stream.close()
+                self._set_part_size("raw", len(self._raw))
+                self._set_part_size("sysmeta", len(self._sysmeta))
+            return self._raw
+
+    @property
+    def encoding(self):
+        """The encoding of the data object, as detected by 'detect_text_encoding'."""
+        self._detect_encoding()
+        return self._encoding
+
+    @property
+    def encoding_error(self):
+        """The decoding error details returned by 'detect_text_encoding', or None."""
+        self._detect_encoding()
+        return self._encoding_error
+
+    @property
+    def text(self):
+        """The content of the data object decoded with its detected encoding.
+
+        Raises:
+            UnicodeDecodeError: If the content cannot be decoded with the detected encoding.
+        """
+        with self._lock:
+            if self._text is None:
+                self._text = self.raw.decode(self.encoding)
+                self._set_part_size("text", sys.getsizeof(self._text))
+            return self._text
+
+    def read_csv(
+        self, fd, header_line, nan_filter=False, dtype_string=False, engine=None
+    ):
+        """Parse the data object as a table with 'read_csv_with_metadata'. Each distinct set
+        of arguments is parsed once. The content is parsed from its loaded bytes, or else
+        from its memory-mapped file when the store is local, without decoding it first.
+
+        Args:
+            fd (str): Field delimiter from metadata.
+            header_line (int or list): Number of header lines from metadata.
+            nan_filter (bool): Whether to detect missing values.
+            dtype_string (bool): Whether to coerce all column types to string.
+            engine (str): The pandas parser engine, or None for the default engine.
+
+        Returns:
+            tuple: The data frame (or None) and the error message (or None) returned by
+            'read_csv_with_metadata'.
+        """
+        table_key = repr((fd, header_line, nan_filter, dtype_string, engine))
+        with self._lock:
+            table = self._tables.get(table_key)
+            if table is None:
+                table = read_csv_with_metadata(
+                    self._get_csv_source(),
+                    fd,
+                    header_line,
+                    self.encoding,
+                    nan_filter=nan_filter,
+                    dtype_string=dtype_string,
+                    engine=engine,
+                )
+                self._tables[table_key] = table
+                self._set_part_size(f"table:{table_key}", _get_content_size(table))
+            return table
+
+    def read_csv_header(self, fd, header_line):
+        """Read the column names of the data object with 'read_csv_header_with_metadata',
+        from its bytes if they are loaded, or else from the beginning of its content in the
+        store. Each distinct set of arguments is read once.
+
+        Args:
+            fd (str): Field delimiter from metadata.
+            header_line (int or list): Number of header lines from metadata.
+
+        Returns:
+            tuple: The list of column names (or None) and the error message (or None)
+            returned by 'read_csv_header_with_metadata'.
+        """
+        header_key = "header:" + repr((fd, header_line))
+        with self._lock:
+            header = self._tables.get(header_key)
+            if header is None:
+                encoding = self._encoding if "encoding" in self._part_sizes else None
+                if self._raw is not None:
+                    header = read_csv_header_with_metadata(
+                        self._raw, fd, header_line, encoding
+                    )
+                else:
+                    obj, sys_stream = self.manager.get_object(self.pid)
+                    try:
+                        header = read_csv_header_with_metadata(
+                            obj, fd, header_line, encoding
+                        )
+                    finally:
+                        obj.close()
+                        sys_stream.close()
+                self._tables[header_key] = header
+                self._set_part_size(header_key, _get_content_size(header))
+            return header
+
+    def read_csv_chunks(
+        self,
+        fd,
+        header_line,
+        nan_filter=False,
+        dtype_string=False,
+        chunksize=CSV_CHUNK_ROWS,
+    ):
+        """Parse the data object in chunks of rows with 'read_csv_chunks_with_metadata',
+        streaming its content from the store rather than loading it. The chunks are not
+        memoized. The detected encoding is used if it is already known.
+
+        Args:
+            fd (str): Field delimiter from metadata.
+            header_line (int or list): Number of header lines from metadata.
+            nan_filter (bool): Whether to detect missing values.
+            dtype_string (bool): Whether to coerce all column types to string.
+            chunksize (int): Number of rows in each chunk.
+
+        Returns:
+            tuple: The iterator of data frames (or None) and the error message (or None)
+            returned by 'read_csv_chunks_with_metadata'.
+        """
+        with self._lock:
+            encoding = self._encoding if "encoding" in self._part_sizes else None
+        obj, sys_stream = self.manager.get_object(self.pid)
+        sys_stream.close()
+        try:
+            chunks, error = read_csv_chunks_with_metadata(
+                obj,
+                fd,
+                header_line,
+                encoding,
+                nan_filter=nan_filter,
+                dtype_string=dtype_string,
+                chunksize=chunksize,
+            )
+        except BaseException:
+            obj.close()
+            raise
+        if chunks is None:
+            obj.close()
+            return None, error
+        return _close_after(chunks, obj), None
+
+    @property
+    def local_path(self):
+        """The path of the data object's file, if the store keeps it in a local file, or
+        None."""
+        with self._lock:
+            if self._local_path is False:
+                obj, sys_stream = self.manager.get_object(self.pid)
+                obj.close()
+                sys_stream.close()
+                self._set_local_path(obj)
+            return self._local_path
+
+    def _set_local_path(self, obj):
+        """Remember the path of the file an object stream from the store was opened from."""
+        path = getattr(obj, "name", None)
+        self._local_path = (
+            path if isinstance(path, str) and os.path.isfile(path) else None
+        )
+
+    def _get_csv_source(self):
+        """The content to parse tables from: the loaded bytes, or else the path of a
+        non-empty local file, or else the bytes loaded from the store."""
+        if self._raw is None and self.local_path and os.path.getsize(self.local_path):
+            return pathlib.Path(self.local_path)
+        return self.raw
+
+    def _detect_encoding(self):
+        with self._lock:
+            if "encoding" not in self._part_sizes:
+                source = self._get_csv_source()
+                if isinstance(source, pathlib.Path):
+                    # Detect the encoding from the memory-mapped file, without loading it
+                    with open(source, "rb") as f, mmap.mmap(
+                        f.fileno(), 0, access=mmap.ACCESS_READ
+                    ) as content:
+                        encoding = detect_text_encoding(content)
+                else:
+                    encoding = detect_text_encoding(source)
+                self._encoding, self._encoding_error = encoding
+                self._set_part_size("encoding", _get_content_size(encoding))
+
+    def _set_part_size(self, part, size):
+        """Record the size of a part of the content and keep the cache within its budget."""
+        global _data_object_cache_bytes
+        with _data_object_cache_lock:
+            previous_size = self._part_sizes.get(part, 0)
+            self._part_sizes[part] = size
+            if _data_object_cache.get((id(self.manager.store), self.pid)) is self:
+                _data_object_cache_bytes += size - previous_size
+                _evict_data_objects(keep=self)
+
+
+def _get_content_size(value):
+    """Approximate the number of bytes of memory held by a part of a data object's content:
+    bytes, a string, a data frame, None, or a list or tuple of them."""
+    if value is None:
+        return 0
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(_get_content_size(item) for item in value)
+    if hasattr(value, "memory_usage"):
+        return int(value.memory_usage(deep=True).sum())
+    return sys.getsizeof(value)
+
+
+def _close_after(iterable, stream):
+    """Yield from an iterable, and close the stream when iteration stops."""
+    try:
+        yield from iterable
+    finally:
+        stream.close()
+
+
+def get_data_object(manager, pid):
+    """
+    Get the memoized data object for a pid in a store, so that checks share its content.
+
+    Args:
+        manager: a store manager returned from StoreManager()
+        pid (str): Identifier of the data object.
+
+    Returns:
+        DataObject: The data object, whose content is loaded on first use.
+    """
+    global _data_object_cache_bytes
+    cache_key = (id(manager.store), pid)
+    with _data_object_cache_lock:
+        data_object = _data_object_cache.get(cache_key)
+        if data_object is not None:
+            if data_object.manager.store is manager.store:
+                _data_object_cache.move_to_end(cache_key)
+                return data_object
+            # The id belongs to a store that no longer exists
+            del _data_object_cache[cache_key]
+            _data_object_cache_bytes -= data_object.nbytes
+        data_object = DataObject(manager, pid)
+        _data_object_cache[cache_key] = data_object
+        _evict_data_objects(keep=data_object)
+        return data_object
+
+
+def clear_data_object_cache():
+    """Remove all the data objects from the data object cache."""
+    global _data_object_cache_bytes
+    with _data_object_cache_lock:
+        _data_object_cache.clear()
+        _data_object_cache_bytes = 0
+
+
+def _evict_data_objects(keep=None):
+    """Evict the least recently used data objects until the cache is within its budget of
+    bytes and entries. The data object being loaded ('keep') is only evicted when it alone
+    exceeds the budget of bytes.
+    """
+    global _data_object_cache_bytes
+    for cache_key, data_object in list(_data_object_cache.items()):
+        if (
+            _data_object_cache_bytes <= DATA_OBJECT_CACHE_MAX_BYTES
+            and len(_data_object_cache) <= DATA_OBJECT_CACHE_MAX_ENTRIES
+        ):
+            return
+        if data_object is keep:
+            continue
+        del _data_object_cache[cache_key]
+        _data_object_cache_bytes -= data_object.nbytes
+    if keep is not None and _data_object_cache_bytes > DATA_OBJECT_CACHE_MAX_BYTES:
+        cache_key = (id(keep.manager.store), keep.pid)
+        if _data_object_cache.get(cache_key) is keep:
+            del _data_object_cache[cache_key]
+            _data_object_cache_bytes -= keep.nbytes
+
+
 def find_entity_index(fname, pid, entity_names, ids):
     """
     Finds the index of a documented entity from a list of entities in a metadata document. The
@@ -138,38 +692,280 @@ def find_entity_index(fname, pid, entity_names, ids):
         z: Index of matching entity in documentation.
 
     """
-    # Box up single items into a list for interating later
-    list_types = (list, ArrayList)
+    return EntityListIndex(entity_names, ids).find_index(fname, pid)
 
-    ids_l = ids if isinstance(ids, list_types) else [ids]
-    entity_names_l = (
-        entity_names if isinstance(entity_names, list_types) else [entity_names]
-    )
 
-    # Checks all elements in entity_names to find matches with fname
-    z = [i for i, x in enumerate(entity_names_l) if x == fname]
-    # If z is empty, we will try to match by pid instead
-    if not z:
-        z = [i for i, x in enumerate(ids_l) if x == pid.replace(":", "-")]
+class EntityListIndex:
+    """
+    An index of the lists of entity names and identifiers of a metadata document, built
+    once so that checks can find the entity of each data object with dictionary lookups
+    rather than scanning the lists for every data object.
+
+    Methods:
+        find_index(fname, pid):
+            Finds the index of a documented entity, like 'find_entity_index'.
+    """
+
+    def __init__(self, entity_names, ids):
+        """
+        Indexes the lists of entity names and identifiers.
+
+        Args:
+            entity_names: List of entity names to search for filename in
+            ids: List of identifiers to search for identifier in
+        """
+        # Box up single items into a list for interating later
+        list_types = (list, ArrayList)
+
+        ids_l = ids if isinstance(ids, list_types) else [ids]
+        entity_names_l = (
+            entity_names if isinstance(entity_names, list_types) else [entity_names]
+        )
+
+        # Index of the first occurrence of each entity name and identifier
+        self._indices_by_entity_name = {}
+        for i, x in enumerate(entity_names_l):
+            self._indices_by_entity_name.setdefault(x, i)
+        self._indices_by_id = {}
+        for i, x in enumerate(ids_l):
+            self._indices_by_id.setdefault(x, i)
+
+    def find_index(self, fname, pid):
+        """
+        Finds the index of a documented entity, first by filename, then by identifier.
+
+        Args:
+            fname (str): Filename of the file to match.
+            pid (str): Identifier of file to match.
 
-    return z[0] if z else None
+        Returns:
+            z: Index of matching entity in documentation, or None if no match.
+        """
+        z = self._indices_by_entity_name.get(fname)
+        # If there is no match, we will try to match by pid instead
+        if z is None:
+            z = self._indices_by_id.get(pid.replace(":", "-"))
+        return z
 
 
 def read_csv_with_metadata(
-    d_read, fd, header_line, d_encoding=None, nan_filter=False, dtype_string=False
+    d_read,
+    fd,
+    header_line,
+    d_encoding=None,
+    nan_filter=False,
+    dtype_string=False,
+    engine=None,
 ):
     """Uses pandas to read in a csv with given field delimiter and header rows to skip
 
-    :param str or bytes d_read: RData as read in from the stream
+    Bytes, binary streams and paths are decoded by the parser itself, without decoding the
+    whole content into a string first. Local files given as a path are memory-mapped rather
+    than read into memory, unless the pyarrow engine is used.
+
+    :param d_read: Data as a decoded str, or as bytes, a binary stream (ex. from a store) or
+        a path (pathlib.Path) of the content
     :param str fd: ield delimiter from metadata
     :param int header_line: Number of rows to skip
-    :param str d_encoding: Encoding type to use to read the given bytes
+    :param str d_encoding: Encoding type to use to read the given bytes. When None, bytes,
+        streams and paths are decoded as utf-8, replacing the bytes that cannot be decoded.
     :param dtype_string: Whether to coerce all column types to string
+    :param str engine: The pandas parser engine (ex. 'pyarrow', which must be installed), or
+        None for the default engine
 
     :return: A tuple containing:
         - df: Pandas data.frame with data
         - error: error message on exception
     """
+    fd, pd_header_val, error_msg = get_csv_read_options(fd, header_line, nan_filter)
+    if error_msg is not None:
+        return None, error_msg
+
+    if dtype_string == True:
+        ty = str
+    else:
+        ty = None
+
+    read_options = {}
+    if isinstance(d_read, str):
+        source = io.StringIO(d_read)
+        if d_encoding is not None:
+            read_options.update(encoding=d_encoding, dtype=ty)
+    else:
+        if isinstance(d_read, (bytes, bytearray, memoryview)):
+            # A BytesIO shares the buffer of the bytes rather than copying them
+            source = io.BytesIO(d_read)
+        else:
+            source = d_read
+        read_options.update(
+            encoding=d_encoding if d_encoding is not None else "utf-8",
+            encoding_errors="strict" if d_encoding is not None else "replace",
+            dtype=ty,
+        )
+        if isinstance(d_read, os.PathLike) and engine != "pyarrow":
+            read_options["memory_map"] = True
+    if engine is not None:
+        read_options["engine"] = engine
+
+    try:
+        return (
+            pandas.read_csv(
+                source,
+                delimiter=fd,
+                header=pd_header_val,
+                na_filter=nan_filter,
+                **read_options,
+            ),
+            None,
+        )
+    # pylint: disable=W0718
+    except Exception as e:
+        return None, f"Error reading CSV: {str(e)}"
+
+
+def read_csv_chunks_with_metadata(
+    source,
+    fd,
+    header_line,
+    d_encoding=None,
+    nan_filter=False,
+    dtype_string=False,
+    chunksize=CSV_CHUNK_ROWS,
+):
+    """Uses pandas to read a csv in chunks of rows, with the same field delimiter and header
+    handling as 'read_csv_with_metadata', so that only one chunk is held in memory at a time.
+
+    Errors in the header are returned, while errors found in later rows are raised when the
+    chunk that holds them is read.
+
+    :param source: Path of the csv, or a binary stream of its content (ex. from a store)
+    :param str fd: Field delimiter from metadata
+    :param int header_line: Number of rows to skip
+    :param str d_encoding: Encoding to decode the content with. When None, the content is
+        decoded as utf-8, replacing the bytes that cannot be decoded.
+    :param bool nan_filter: Whether to detect missing values
+    :param bool dtype_string: Whether to coerce all column types to string
+    :param int chunksize: Number of rows in each chunk
+
+    :return: A tuple containing:
+        - chunks: Iterator of pandas data.frames of consecutive rows, whose index continues
+          from one chunk to the next, or None on exception
+        - error: error message on exception
+    """
+    fd, pd_header_val, error_msg = get_csv_read_options(fd, header_line, nan_filter)
+    if error_msg is not None:
+        return None, error_msg
+
+    try:
+        reader = pandas.read_csv(
+            source,
+            delimiter=fd,
+            header=pd_header_val,
+            encoding=d_encoding if d_encoding is not None else "utf-8",
+            encoding_errors="strict" if d_encoding is not None else "replace",
+            na_filter=nan_filter,
+            dtype=str if dtype_string == True else None,
+            chunksize=chunksize,
+        )
+    # pylint: disable=W0718
+    except Exception as e:
+        return None, f"Error reading CSV: {str(e)}"
+    return _iter_csv_chunks(reader), None
+
+
+def read_csv_header_with_metadata(
+    source, fd, header_line, d_encoding=None, read_size=CSV_HEADER_READ_SIZE
+):
+    """Uses pandas to read only the column names of a csv, with the same field delimiter and
+    header handling as 'read_csv_with_metadata'. Only the beginning of the content is read:
+    'read_size' bytes at first, and more until the header row and the row after it are
+    complete.
+
+    :param source: The content as a decoded str, as in 'read_csv_with_metadata', or as bytes,
+        a binary stream (ex. from a store) or a path (os.PathLike, ex. pathlib.Path)
+    :param str fd: Field delimiter from metadata
+    :param int header_line: Number of rows to skip
+    :param str d_encoding: Encoding to decode the content with. When None, the encoding is
+        detected from the bytes that are read. Ignored for decoded content.
+    :param int read_size: Number of bytes to read first
+
+    :return: A tuple containing:
+        - columns: List of the column names, or None on exception
+        - error: error message on exception
+    """
+    fd, pd_header_val, error_msg = get_csv_read_options(fd, header_line, False)
+    if error_msg is not None:
+        return None, error_msg
+
+    if isinstance(source, str):
+        # The content has already been decoded
+        source, d_encoding = source.encode("utf-8"), "utf-8"
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        stream = io.BytesIO(source)
+    elif isinstance(source, os.PathLike):
+        stream = open(os.fspath(source), "rb")
+    else:
+        stream = source
+
+    try:
+        content = b""
+        block_size = read_size
+        while True:
+            block = stream.read(block_size)
+            content += block
+            at_eof = not block
+            # Only parse complete lines, unless the whole content has been read
+            complete = content if at_eof else content[: content.rfind(b"\n") + 1]
+            if complete or at_eof:
+                encoding = d_encoding
+                if encoding is None:
+                    encoding = detect_text_encoding(complete)[0] or "utf-8"
+                try:
+                    df = pandas.read_csv(
+                        io.StringIO(complete.decode(encoding, errors="replace")),
+                        delimiter=fd,
+                        header=pd_header_val,
+                        nrows=1,
+                        na_filter=False,
+                        dtype=str,
+                    )
+                # pylint: disable=W0718
+                except Exception as e:
+                    # The header may be cut off by the end of what has been read so far
+                    if at_eof:
+                        return None, f"Error reading CSV: {str(e)}"
+                else:
+                    # A complete row after the header means the header was read whole
+                    if len(df) > 0 or at_eof:
+                        return list(df.columns), None
+            # Read as much again as has been read so far
+            block_size = max(read_size, len(content))
+    # pylint: disable=W0718
+    except Exception as e:
+        return None, f"Error reading CSV: {str(e)}"
+    finally:
+        if stream is not source:
+            stream.close()
+
+
+def _iter_csv_chunks(reader):
+    """Yield the chunks of a pandas csv reader, and close it when iteration stops."""
+    with reader:
+        yield from reader
+
+
+def get_csv_read_options(fd, header_line, nan_filter):
+    """Normalize the field delimiter and header line from metadata into pandas options.
+
+    :param str fd: Field delimiter from metadata
+    :param int header_line: Number of rows to skip
+    :param bool nan_filter: Whether to detect missing values
+
+    :return: A tuple containing:
+        - fd: The field delimiter to pass to pandas
+        - header: The row number of the header to pass to pandas
+        - error: error message if the header line cannot be determined, or None
+    """
     # Ensure fd is an int or str
     if isinstance(fd, list):
         fd = fd[0]  # Extract first element if list
@@ -179,11 +975,6 @@ def read_csv_with_metadata(
     if not isinstance(nan_filter, bool):
         raise ValueError("Argument 'nan_filter' must be a boolean")
 
-    if dtype_string == True:
-        ty = str
-    else:
-        ty = None
-
     pd_header_val = 0
     if isinstance(header_line, list):
         # When a list is provided, the expectation is that this value is coming from the sysmeta
@@ -206,34 +997,8 @@ def read_csv_with_metadata(
             "Unable to read CSV, cannot determine 'header_line'. It must be an integer."
             + f" Detected type: {type(header_line)}. Value: {header_line}"
         )
-        return None, error_msg
-
-    try:
-        if d_encoding is not None:
-            return (
-                pandas.read_csv(
-                    io.StringIO(d_read),
-                    delimiter=fd,
-                    header=pd_header_val,
-                    encoding=d_encoding,
-                    na_filter=nan_filter,
-                    dtype=ty,
-                ),
-                None,
-            )
-        else:
-            return (
-                pandas.read_csv(
-                    io.StringIO(d_read),
-                    delimiter=fd,
-                    header=pd_header_val,
-                    na_filter=nan_filter,
-                ),
-                None,
-            )
-    # pylint: disable=W0718
-    except Exception as e:
-        return None, f"Error reading CSV: {str(e)}"
+        return fd, None, error_msg
+    return fd, pd_header_val, None
 
 
 def find_duplicate_column_names(pandas_df: pandas.DataFrame):
@@ -267,35 +1032,125 @@ def find_duplicate_column_names(pandas_df: pandas.DataFrame):
 def find_duplicate_column_content(pandas_df: pandas.DataFrame):
     """Find duplicate columns in a text delimited file by calculating the hash of the column.
 
+    The values of the data frame are hashed in batches of columns of the same type, rather
+    than column by column. Columns are first grouped by their type, number of missing values
+    and smallest, largest and summed value hashes, and only the columns that share a group
+    are compared by the hash of their content. Columns with the same hash are then compared
+    value by value, so that hash collisions are not reported.
+
     :param df pandas_df: Data frame to check for duplicate columns
     :return: List of tuples of the duplicate columns. Each tuple shows the name of the
         duplicate columns and the calculated hash.
     """
+    num_columns = pandas_df.shape[1]
+    null_counts = pandas_df.isna().sum().values
+    min_hashes = numpy.zeros(num_columns, dtype=numpy.uint64)
+    max_hashes = numpy.zeros(num_columns, dtype=numpy.uint64)
+    sum_hashes = numpy.zeros(num_columns, dtype=numpy.uint64)
+    if pandas_df.shape[0] > 0:
+        for positions, value_hashes in iter_column_hashes(pandas_df):
+            min_hashes[positions] = value_hashes.min(axis=1)
+            max_hashes[positions] = value_hashes.max(axis=1)
+            # The sum wraps around, and tells apart columns with the same range of values
+            sum_hashes[positions] = value_hashes.sum(axis=1, dtype=numpy.uint64)
+
+    # Group the columns that may be duplicates of each other
+    candidate_groups = {}
+    for position, candidate_key in enumerate(
+        zip(pandas_df.dtypes, null_counts, min_hashes, max_hashes, sum_hashes)
+    ):
+        candidate_groups.setdefault(candidate_key, []).append(position)
+    candidates = sorted(
+        position
+        for positions in candidate_groups.values()
+        if len(positions) > 1
+        for position in positions
+    )
 
-    def hash_series(series):
-        """Get the hash based on the column's values, ignoring the index"""
-        return hashlib.md5(
-            pandas.util.hash_pandas_object(series, index=False).values
-        ).hexdigest()
+    # Hash the content of the candidate columns
+    column_hashes = {}
+    for positions, value_hashes in iter_column_hashes(pandas_df, candidates):
+        for position, position_hashes in zip(positions, value_hashes):
+            column_hashes[position] = hashlib.md5(position_hashes).hexdigest()
+
+    # Position of each duplicate column, mapped to the position of its original
+    duplicate_positions = {}
+    for positions in candidate_groups.values():
+        if len(positions) < 2:
+            continue
+        # Positions of the distinct columns of the group, by the hash of their content
+        seen_hashes = {}
+        for position in positions:
+            originals = seen_hashes.setdefault(column_hashes[position], [])
+            for original in originals:
+                if pandas_df.iloc[:, position].equals(pandas_df.iloc[:, original]):
+                    duplicate_positions[position] = original
+                    break
+            else:
+                originals.append(position)
 
-    # Empty dict to store each unique column
-    seen_hashes = {}
-    # List to hold pairs (tuples) of columns
     duplicates = []
-
-    for col in pandas_df.columns:
-        # Get the unique hash value
-        col_hash = hash_series(pandas_df[col])
-        # Check to see if this hash is present, indicating a duplicate column
-        if col_hash in seen_hashes:
-            duplicates.append((col, seen_hashes[col_hash], col_hash))
-        else:
-            # Store this into the list of seen hashes
-            seen_hashes[col_hash] = col
+    for position in sorted(duplicate_positions):
+        original = duplicate_positions[position]
+        duplicates.append(
+            (
+                pandas_df.columns[position],
+                pandas_df.columns[original],
+                column_hashes[position],
+            )
+        )
 
     return duplicates
 
 
+def iter_column_hashes(pandas_df: pandas.DataFrame, positions=None):
+    """Hash the values of the columns of a data frame, ignoring the index, in batches of
+    columns of the same type of at most 'COLUMN_HASH_BATCH_BYTES' of hashes.
+
+    :param df pandas_df: Data frame to hash
+    :param list positions: Positions of the columns to hash, or None to hash all of them
+    :return: Iterator of tuples containing:
+        - positions: List of the positions of the columns in the batch
+        - hashes: Array with a row of value hashes for each column of the batch, equal to
+          the values of 'pandas.util.hash_pandas_object' for the column
+    """
+    num_rows = pandas_df.shape[0]
+    batch_columns = max(1, COLUMN_HASH_BATCH_BYTES // max(1, num_rows * 8))
+    if positions is None:
+        positions = range(pandas_df.shape[1])
+    positions_by_dtype = {}
+    for position in positions:
+        positions_by_dtype.setdefault(pandas_df.dtypes.iloc[position], []).append(
+            position
+        )
+
+    for dtype, dtype_positions in positions_by_dtype.items():
+        if not (isinstance(dtype, numpy.dtype) and dtype.kind in "biufcO"):
+            # Other types (ex. dates, categories) are hashed as in 'hash_pandas_object'
+            for position in dtype_positions:
+                yield [position], pandas.util.hash_pandas_object(
+                    pandas_df.iloc[:, position], index=False
+                ).values.reshape(1, num_rows)
+            continue
+        for batch_start in range(0, len(dtype_positions), batch_columns):
+            batch = dtype_positions[batch_start : batch_start + batch_columns]
+            values = numpy.empty((len(batch), num_rows), dtype=dtype)
+            # Copy runs of adjacent columns at once, as they are usually stored together
+            run_start = 0
+            for run_end in range(1, len(batch) + 1):
+                if run_end < len(batch) and batch[run_end] == batch[run_end - 1] + 1:
+                    continue
+                values[run_start:run_end] = (
+                    pandas_df.iloc[:, batch[run_start] : batch[run_end - 1] + 1]
+                    .to_numpy(dtype=dtype)
+                    .T
+                )
+                run_start = run_end
+            yield batch, pandas.util.hash_array(values.ravel()).reshape(
+                len(batch), num_rows
+            )
+
+
 def find_duplicate_rows(pandas_df: pandas.DataFrame):
     """Find duplicate rows in a text delimited file.
 
@@ -311,6 +1166,160 @@ def find_duplicate_rows(pandas_df: pandas.DataFrame):
         return duplicates
 
 
+def find_duplicate_row_groups(
+    pandas_df: pandas.DataFrame, sample_size=DUPLICATE_ROW_SAMPLE_SIZE
+):
+    """Find duplicate rows in a text delimited file, as the indices and group ids of the
+    duplicate rows rather than a copy of them.
+
+    :param df pandas_df: Data frame to check for duplicate rows
+    :param int sample_size: Maximum number of rows that repeat an earlier row to keep a copy
+        of, or None to keep all of them
+    :return: The duplicate rows, or None if no duplicate rows are found
+    :rtype: DuplicateRowGroups
+    """
+    return find_duplicate_row_groups_in_chunks([pandas_df], sample_size)
+
+
+def find_duplicate_row_groups_in_chunks(chunks, sample_size=DUPLICATE_ROW_SAMPLE_SIZE):
+    """Find duplicate rows in a text delimited file read in chunks, as the indices and group
+    ids of the duplicate rows. Only the hash and index of each row, and the sample of rows
+    that repeat an earlier row, are kept between chunks.
+
+    :param chunks: Iterable of data frames of consecutive rows, as returned by
+        'read_csv_chunks_with_metadata'
+    :param int sample_size: Maximum number of rows that repeat an earlier row to keep a copy
+        of, or None to keep all of them
+    :return: The duplicate rows, or None if no duplicate rows are found
+    :rtype: DuplicateRowGroups
+    """
+    duplicate_rows = DuplicateRowGroups(sample_size)
+    for chunk in chunks:
+        duplicate_rows.update(chunk)
+    if duplicate_rows.num_groups == 0:
+        return None
+    return duplicate_rows
+
+
+class DuplicateRowGroups:
+    """
+    The duplicate rows of a table, found incrementally from the hash of each row as the
+    rows are added in chunks. Rows with the same hash are considered equal.
+
+    Attributes:
+        sample_size (int): Maximum number of rows that repeat an earlier row kept in the
+            sample, or None for no limit.
+    """
+
+    def __init__(self, sample_size=DUPLICATE_ROW_SAMPLE_SIZE):
+        self.sample_size = sample_size
+        self._sample_rows = []
+        self._num_sample_rows = 0
+        # Sorted runs of the distinct hashes of the rows added so far, kept while the sample
+        # is not full. Runs of similar sizes are merged, so that there are few runs and each
+        # hash is only merged a logarithmic number of times.
+        self._seen_hashes = []
+        self._row_hashes = []
+        self._row_indices = []
+        self._groups = None
+
+    def update(self, pandas_df: pandas.DataFrame):
+        """Add the next rows of the table.
+
+        Args:
+            pandas_df (DataFrame): Data frame of the rows following the rows already added.
+        """
+        row_hashes = pandas.util.hash_pandas_object(pandas_df, index=False).values
+        if self.sample_size is None or self._num_sample_rows < self.sample_size:
+            is_repeat = pandas.Series(row_hashes).duplicated(keep="first").values
+            for seen_hashes in self._seen_hashes:
+                is_repeat |= _sorted_contains(seen_hashes, row_hashes)
+            # The first rows added are always kept, for the columns of an empty sample
+            if is_repeat.any() or not self._sample_rows:
+                # Only the rows that fit in the sample are copied
+                repeat_positions = numpy.flatnonzero(is_repeat)
+                if self.sample_size is not None:
+                    repeat_positions = repeat_positions[
+                        : self.sample_size - self._num_sample_rows
+                    ]
+                repeats = pandas_df.iloc[repeat_positions]
+                self._sample_rows.append(repeats)
+                self._num_sample_rows += len(repeats)
+            if self.sample_size is None or self._num_sample_rows < self.sample_size:
+                run = _merge_sorted_hashes(row_hashes)
+                while self._seen_hashes and len(self._seen_hashes[-1]) <= 2 * len(run):
+                    run = _merge_sorted_hashes(self._seen_hashes.pop(), run)
+                self._seen_hashes.append(run)
+            else:
+                self._seen_hashes = []
+        self._row_hashes.append(row_hashes)
+        self._row_indices.append(pandas_df.index.to_numpy())
+        self._groups = None
+
+    @property
+    def sample(self):
+        """DataFrame: Copy of the first rows that repeat an earlier row, up to
+        'sample_size' rows, or None if no rows have been added."""
+        if len(self._sample_rows) > 1:
+            self._sample_rows = [pandas.concat(self._sample_rows)]
+        return self._sample_rows[0] if self._sample_rows else None
+
+    @property
+    def row_indices(self):
+        """numpy.ndarray: The indices of all the rows that are equal to another row,
+        including their first occurrence, in table order."""
+        return self._find_groups()[0]
+
+    @property
+    def group_ids(self):
+        """numpy.ndarray: The group of each row in 'row_indices'. Equal rows share a
+        group, and groups are numbered from 0 in the order of their first row."""
+        return self._find_groups()[1]
+
+    @property
+    def num_groups(self):
+        """int: The number of distinct rows that are repeated."""
+        return self._find_groups()[2]
+
+    @property
+    def num_duplicate_rows(self):
+        """int: The number of rows that repeat an earlier row."""
+        return len(self.row_indices) - self.num_groups
+
+    def _find_groups(self):
+        if self._groups is None:
+            if len(self._row_hashes) > 1:
+                self._row_hashes = [numpy.concatenate(self._row_hashes)]
+                self._row_indices = [numpy.concatenate(self._row_indices)]
+            if self._row_hashes:
+                row_hashes, row_indices = self._row_hashes[0], self._row_indices[0]
+            else:
+                row_hashes = numpy.empty(0, dtype=numpy.uint64)
+                row_indices = numpy.empty(0, dtype=numpy.int64)
+            is_duplicated = pandas.Series(row_hashes).duplicated(keep=False).values
+            group_ids, groups = pandas.factorize(row_hashes[is_duplicated])
+            self._groups = (row_indices[is_duplicated], group_ids, len(groups))
+        return self._groups
+
+
+def _merge_sorted_hashes(*hashes):
+    """The sorted distinct values of arrays of hashes."""
+    merged = numpy.sort(numpy.concatenate(hashes), kind="stable")
+    is_distinct = numpy.empty(len(merged), dtype=bool)
+    is_distinct[:1] = True
+    numpy.not_equal(merged[1:], merged[:-1], out=is_distinct[1:])
+    return merged[is_distinct]
+
+
+def _sorted_contains(sorted_values, values):
+    """Whether each of the values is in a sorted array, found by binary search."""
+    if len(sorted_values) == 0:
+        return numpy.zeros(len(values), dtype=bool)
+    positions = numpy.searchsorted(sorted_values, values)
+    positions[positions == len(sorted_values)] = 0
+    return sorted_values[positions] == values
+
+
 def find_number_of_columns(pandas_df: pandas.DataFrame):
     """Find the number of columns in a text delimited file.
 
@@ -321,35 +1330,148 @@ def find_number_of_columns(pandas_df: pandas.DataFrame):
     return pandas_df.shape[1]
 
 
-def detect_text_encoding(raw: bytes):
+def find_duplicate_column_content_in_chunks(chunks):
+    """Find duplicate columns in a text delimited file read in chunks, by calculating the
+    hash of each column across all the chunks. Only the hash state of each column is kept
+    between chunks.
+
+    :param chunks: Iterable of data frames of consecutive rows, as returned by
+        'read_csv_chunks_with_metadata'
+    :return: List of tuples of the duplicate columns, in the same format as
+        'find_duplicate_column_content'. Column types are inferred for each chunk, so the
+        hashes may differ from the ones calculated over the whole data frame.
+    """
+    column_hashes = None
+    for chunk in chunks:
+        if column_hashes is None:
+            column_hashes = OrderedDict((col, hashlib.md5()) for col in chunk.columns)
+        for col, col_hash in column_hashes.items():
+            col_hash.update(
+                pandas.util.hash_pandas_object(chunk[col], index=False).values
+            )
+
+    seen_hashes = {}
+    duplicates = []
+    for col, col_hash in (column_hashes or {}).items():
+        col_hash = col_hash.hexdigest()
+        if col_hash in seen_hashes:
+            duplicates.append((col, seen_hashes[col_hash], col_hash))
+        else:
+            seen_hashes[col_hash] = col
+
+    return duplicates
+
+
+def find_duplicate_rows_in_chunks(chunks, sample_size=DUPLICATE_ROW_SAMPLE_SIZE):
+    """Find duplicate rows in a text delimited file read in chunks. Rows are compared by
+    their hash, and only the hashes of the rows read so far are kept between chunks.
+
+    :param chunks: Iterable of data frames of consecutive rows, as returned by
+        'read_csv_chunks_with_metadata'
+    :param int sample_size: Maximum number of duplicate rows to return
+    :return: Data frame of the first rows that repeat an earlier row, up to 'sample_size'
+        rows, or None if no duplicate rows are found. Unlike 'find_duplicate_rows', the first
+        occurrence of each row is not included. Use 'find_duplicate_row_groups_in_chunks' to
+        find all of the duplicate rows.
+    :rtype: DataFrame
+    """
+    duplicate_rows = find_duplicate_row_groups_in_chunks(chunks, sample_size)
+    if duplicate_rows is None:
+        return None
+    return duplicate_rows.sample
+
+
+def find_number_of_columns_in_chunks(chunks):
+    """Find the number of columns in a text delimited file read in chunks. Only the first
+    chunk is read.
+
+    :param chunks: Iterable of data frames of consecutive rows, as returned by
+        'read_csv_chunks_with_metadata'
+    :return: The number of columns in an integer
+    :rtype: int
+    """
+    for chunk in chunks:
+        return find_number_of_columns(chunk)
+    return 0
+
+
+def detect_text_encoding(raw: bytes, sample_size: Optional[int] = ENCODING_SAMPLE_SIZE):
     """Determine the encoding of the given bytes and return problematic sequences if
     found.
 
-    :param bytes raw: Raw byte content
+    ASCII and UTF-8 content is recognized by validating it with the built-in codecs, without
+    running chardet. UTF-8 content that starts with a byte order mark is 'utf-8-sig'. Other content is detected by feeding chardet's incremental detector
+    chunks of at most 'sample_size' bytes, stopping as soon as the detector is confident.
+
+    :param bytes raw: Raw byte content, as bytes or another buffer (ex. a memory-mapped file)
+    :param int sample_size: Maximum number of bytes to detect the encoding from when the
+        content is neither ASCII nor UTF-8, or None to use all of the content.
     :return: A tuple containing:
-        - encoding (str): One of 'ascii', 'utf-8', or 'other'
+        - encoding (str): One of 'ascii', 'utf-8', 'utf-8-sig', or 'other'
         - error (str or None): None if decoding succeeded, or a string with error details
     :rtype: tuple
     """
-    # First detect the encoding type
-    detected_encoding_result = chardet.detect(raw)
+    # Buffers other than bytes (ex. a memory-mapped file) are validated with the ascii codec
+    if (
+        raw.isascii()
+        if isinstance(raw, bytes)
+        else find_decode_error(raw, "ascii") is None
+    ):
+        return "ascii", None
+    if find_decode_error(raw, "utf-8") is None:
+        # Decoding with 'utf-8-sig' drops the byte order mark, as chardet would report
+        if raw[: len(codecs.BOM_UTF8)] == codecs.BOM_UTF8:
+            return "utf-8-sig", None
+        return "utf-8", None
+
+    # Detect the encoding type from a sample of the content
+    detector = chardet.UniversalDetector()
+    sample = memoryview(raw)[:sample_size] if sample_size is not None else raw
+    for chunk_start in range(0, len(sample), ENCODING_CHUNK_SIZE):
+        detector.feed(sample[chunk_start : chunk_start + ENCODING_CHUNK_SIZE])
+        if detector.done:
+            break
+    detected_encoding_result = detector.close()
     encoding = detected_encoding_result.get("encoding")
     # Now try to decode it
-    try:
-        raw.decode(encoding)
+    decode_error = find_decode_error(raw, encoding)
+    if decode_error is None:
         return encoding, None
-    # pylint: disable=W0612
-    except UnicodeDecodeError as e:
-        # If there an a decoding error, return the identified encoding type and the confidence
-        # level, along with details on where we ran into the error.
-        confidence = detected_encoding_result.get("confidence")
-        encoding_msg = (
-            "A decoding error has been detected while attempting to decode the document"
-            + f" with detected encoding: {encoding}. Confidence level of encoding type:"
-            + f" {round(confidence*100, 2)}%. Error Details:"
-            + f" Error at byte {e.start}: {raw[e.start:e.end]}"
-        )
-        return encoding, encoding_msg
+    # If there an a decoding error, return the identified encoding type and the confidence
+    # level, along with details on where we ran into the error.
+    error_start, error_end = decode_error
+    confidence = detected_encoding_result.get("confidence")
+    encoding_msg = (
+        "A decoding error has been detected while attempting to decode the document"
+        + f" with detected encoding: {encoding}. Confidence level of encoding type:"
+        + f" {round(confidence*100, 2)}%. Error Details:"
+        + f" Error at byte {error_start}: {raw[error_start:error_end]}"
+    )
+    return encoding, encoding_msg
+
+
+def find_decode_error(raw: bytes, encoding: str):
+    """Decode the given bytes chunk by chunk, without holding the decoded text, and find the
+    first sequence that cannot be decoded.
+
+    :param bytes raw: Raw byte content
+    :param str encoding: The encoding to decode the content with
+    :return: The (start, end) byte offsets of the first undecodable sequence, or None if the
+        content can be decoded
+    :rtype: tuple
+    """
+    decoder = codecs.getincrementaldecoder(encoding)()
+    content = memoryview(raw)
+    for chunk_start in range(0, len(content), ENCODING_CHUNK_SIZE):
+        chunk = content[chunk_start : chunk_start + ENCODING_CHUNK_SIZE]
+        final = chunk_start + ENCODING_CHUNK_SIZE >= len(content)
+        try:
+            decoder.decode(chunk, final)
+        except UnicodeDecodeError as e:
+            # Offsets are relative to the bytes held back from earlier chunks plus this chunk
+            buffered_start = chunk_start - len(e.object) + len(chunk)
+            return buffered_start + e.start, buffered_start + e.end
+    return None
 
 
 def escape_for_markdown(string: str):
@@ -11,6 +11,7 @@ from lxml import etree
 from hashstore import HashStoreFactory
 from hashstore.filehashstore import HashStoreRefsAlreadyExists
 from metadig import checks, suites
+from metadig.http_client import get_http_client
 
 
 class MetaDigPyParser:
@@ -92,6 +93,19 @@ class MetaDigPyParser:
             dest="check_folder_path",
             help="Path to folder containining the xml checks to execute for a suite.",
         )
+        self.parser.add_argument(
+            "-corpus",
+            "-corpus_path",
+            dest="corpus_path",
+            help="Path to a manifest or folder of metadata and sysmeta documents to run a"
+            + " suite against, instead of a single '-metadata_doc' and '-sysmeta_doc'.",
+        )
+        self.parser.add_argument(
+            "-output",
+            "-output_path",
+            dest="output_path",
+            help="Path to the file to write a corpus' newline-delimited JSON suite results to.",
+        )
 
     def get_parser_args(self):
         """Get command line arguments."""
@@ -186,15 +200,14 @@ class MetaDigClientUtilities:
             sysmeta_query = f"/meta/{encoded_identifier}"
             query_url = member_node_url + sysmeta_query
             try:
-                # Create a request and parse response for the associated data pids (objects)
-                req = urllib.request.Request(query_url)
-
-                # Send the request and read the response
-                with urllib.request.urlopen(req) as response:
-                    # Read and decode the response
-                    system_metadata = response.read()
-                    # pylint: disable=I1101
-                    sysmeta_etree = etree.fromstring(system_metadata)
+                # Send the request and parse the response for the system metadata
+                response = get_http_client().request(
+                    "GET", query_url, timeout=checks.URL_TIMEOUT
+                )
+                response.raise_for_status()
+                system_metadata = response.body
+                # pylint: disable=I1101
+                sysmeta_etree = etree.fromstring(system_metadata)
 
             except Exception as ge:
                 raise RuntimeError(f"Unexpected exception encountered: {ge}") from ge
@@ -308,6 +321,8 @@ def main():
     import_hashstore_data = getattr(args, "import_hashstore_data")
     data_folder_path = getattr(args, "data_folder_path")
     check_folder_path = getattr(args, "check_folder_path")
+    corpus_path = getattr(args, "corpus_path")
+    output_path = getattr(args, "output_path")
 
     if run_check:
         if store_path is None:
@@ -333,16 +348,34 @@ def main():
             raise ValueError("'-suite_path' arg is required to run a suite")
         if check_folder_path is None:
             raise ValueError("'-check_folder_path' arg is required to run a suite")
-        if metadata_doc_path is None:
-            raise ValueError("'-metadata_doc' arg is required to run a suite")
-        if sysmeta_path is None:
-            raise ValueError("'-sysmeta_doc' arg is required to run a suite")
+        if corpus_path is None:
+            if metadata_doc_path is None:
+                raise ValueError("'-metadata_doc' arg is required to run a suite")
+            if sysmeta_path is None:
+                raise ValueError("'-sysmeta_doc' arg is required to run a suite")
+        elif output_path is None:
+            raise ValueError("'-output' arg is required to run a suite on a corpus")
         if store_path is None:
             raise ValueError("'-store_path' arg is required to run a suite")
 
         # Get the store configuration from the given config file at the store_path
         storemanager_props = mcdu.get_store_manager_props(store_path)
 
+        if corpus_path is not None:
+            # Run the suite against every document of the corpus
+            documents_written = suites.run_corpus(
+                suite_path,
+                check_folder_path,
+                corpus_path,
+                output_path,
+                storemanager_props,
+            )
+            print(
+                f"Suite results for {documents_written} documents have been written to:"
+                + f" {output_path}"
+            )
+            return
+
         # Run the check
         suite_results = suites.run_suite(
             suite_path,
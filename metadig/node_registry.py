@@ -0,0 +1,364 @@
+"""
+Module: node_registry.py
+
+This module provides a cache of the DataONE member node registry, so that the base URLs of
+member nodes are looked up in a dictionary instead of downloading and parsing the node list
+from the CN for every check and every data object.
+
+The node list is kept in memory and in a JSON snapshot on disk, which is shared by every
+process using the same snapshot path. Once the snapshot is older than its time to live, the
+node list is refreshed with a conditional request, so an unchanged node list is not
+downloaded again. In offline mode, the node list is only ever read from a snapshot: either
+a JSON snapshot written by this module, or a copy of the CN node list XML.
+
+The snapshot of the default registry is set by the METADIG_NODE_SNAPSHOT environment variable
+(an empty value keeps the node list in memory only), and is otherwise under ~/.cache/metadig.
+Failures to refresh the node list or to read and write the snapshot are logged as warnings.
+
+Classes:
+- NodeRegistry: Cache of the member node base URLs, keyed by node identifier.
+
+Example Usage:
+    registry = NodeRegistry("/var/cache/metadig/member_nodes.json")
+    base_url = registry.get_base_url("urn:node:ARCTIC")
+
+    # Air-gapped workers, with a copy of https://cn.dataone.org/cn/v2/node
+    configure_node_registry("/etc/metadig/member_nodes.xml", offline=True)
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Optional
+from lxml import etree
+from .http_client import get_http_client
+
+# The CN endpoint that lists the member nodes and their base URLs
+NODE_LIST_URL = "https://cn.dataone.org/cn/v2/node"
+# Snapshot of the node list used by the default registry
+DEFAULT_SNAPSHOT_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "metadig", "member_nodes.json"
+)
+# Environment variable that overrides the snapshot of the default registry
+SNAPSHOT_PATH_ENV_VAR = "METADIG_NODE_SNAPSHOT"
+
+logger = logging.getLogger(__name__)
+
+_default_registry = None
+_default_registry_lock = threading.Lock()
+
+
+class NodeRegistry:
+    """
+    A cache of the member node registry, mapping node identifiers to their base URLs.
+
+    Attributes:
+        snapshot_path (str): Path of the JSON snapshot of the node list, or None to only
+            keep it in memory.
+        ttl (float): Seconds after which the node list is refreshed.
+        offline (bool): Whether to only read the node list from a snapshot, and never from
+            the CN.
+        node_list_url (str): The URL of the node list.
+        timeout (float): Seconds to wait for the CN to respond.
+
+    Methods:
+        get_base_url(node_id):
+            Returns the base URL of a member node, or None if it is not registered.
+
+        refresh(force):
+            Refreshes the node list from the CN.
+    """
+
+    SNAPSHOT_VERSION = 1
+    # Seconds after which the node list is refreshed
+    DEFAULT_TTL = 24 * 60 * 60
+    # Minimum seconds between refreshes caused by looking up an unknown node
+    MISS_REFRESH_INTERVAL = 5 * 60
+
+    def __init__(
+        self,
+        snapshot_path: Optional[str] = None,
+        ttl: float = DEFAULT_TTL,
+        offline: bool = False,
+        node_list_url: str = NODE_LIST_URL,
+        timeout: float = 30,
+    ):
+        """
+        Initializes the NodeRegistry. The node list is loaded on first use.
+
+        Args:
+            snapshot_path (str): Path of the snapshot of the node list, or None to only keep
+                it in memory. In offline mode, the snapshot is required, and can also be a
+                copy of the CN node list XML.
+            ttl (float): Seconds after which the node list is refreshed.
+            offline (bool): Whether to only read the node list from a snapshot.
+            node_list_url (str): The URL of the node list.
+            timeout (float): Seconds to wait for the CN to respond.
+        """
+        if offline and snapshot_path is None:
+            raise ValueError("A snapshot path is required in offline mode")
+        self.snapshot_path = snapshot_path
+        self.ttl = ttl
+        self.offline = offline
+        self.node_list_url = node_list_url
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        # Base URLs keyed by node identifier, or None until the node list is loaded
+        self._base_urls = None
+        # When the node list was last fetched or confirmed unchanged, in epoch seconds
+        self._fetched_at = 0.0
+        # When the node list was last requested from the CN (or read from the snapshot in
+        # offline mode), in epoch seconds
+        self._requested_at = 0.0
+        self._etag = None
+        self._last_modified = None
+
+    def get_base_url(self, node_id: str):
+        """
+        Returns the base URL of a member node. Unknown nodes cause the node list to be
+        refreshed, at most once every 'MISS_REFRESH_INTERVAL' seconds.
+
+        Args:
+            node_id (str): The identifier of the member node (ex. 'urn:node:ARCTIC').
+
+        Returns:
+            str: The base URL of the member node, or None if it is not registered.
+
+        Raises:
+            RuntimeError: If no node list is available offline.
+            Exception: Errors retrieving the node list, when no snapshot is available.
+        """
+        with self._lock:
+            self._ensure_current()
+            base_url = self._base_urls.get(node_id)
+            if (
+                base_url is None
+                and not self.offline
+                and time.time() - self._requested_at >= self.MISS_REFRESH_INTERVAL
+            ):
+                try:
+                    self._refresh()
+                # pylint: disable=W0718
+                except Exception as e:
+                    logger.warning("Unable to refresh the member node list: %s", e)
+                base_url = self._base_urls.get(node_id)
+            return base_url
+
+    def refresh(self, force: bool = False):
+        """
+        Refreshes the node list from the CN, with a conditional request unless forced.
+
+        Args:
+            force (bool): Whether to download the node list even if it has not changed.
+
+        Raises:
+            RuntimeError: If the registry is offline.
+        """
+        if self.offline:
+            raise RuntimeError("The member node registry is offline")
+        with self._lock:
+            if force:
+                self._etag = self._last_modified = None
+            self._refresh()
+
+    def _ensure_current(self):
+        """Load the node list, and refresh it if it is older than the time to live. A stale
+        node list that could not be refreshed is only refreshed again once every
+        'MISS_REFRESH_INTERVAL' seconds, so that lookups do not wait on a CN that is down.
+        """
+        if self._base_urls is not None and (
+            not self._is_stale() or self._is_retry_pending()
+        ):
+            return
+        # Another process may have refreshed the snapshot
+        self._load_snapshot()
+        if self.offline:
+            self._requested_at = time.time()
+            if self._base_urls is None:
+                raise RuntimeError(
+                    f"No member node snapshot is available offline at {self.snapshot_path}"
+                )
+            return
+        if self._base_urls is None or self._is_stale():
+            try:
+                self._refresh()
+            # pylint: disable=W0718
+            except Exception as e:
+                if self._base_urls is None:
+                    raise
+                logger.warning("Using a stale member node list: %s", e)
+
+    def _is_stale(self):
+        return time.time() - self._fetched_at >= self.ttl
+
+    def _is_retry_pending(self):
+        """Whether the last request did not update the node list, and was made less than
+        'MISS_REFRESH_INTERVAL' seconds ago."""
+        return (
+            self._fetched_at < self._requested_at
+            and time.time() - self._requested_at < self.MISS_REFRESH_INTERVAL
+        )
+
+    def _refresh(self):
+        """Request the node list from the CN, unless it has not been modified since it was
+        last fetched, and save it to the snapshot."""
+        headers = {}
+        if self._base_urls is not None:
+            if self._etag:
+                headers["If-None-Match"] = self._etag
+            if self._last_modified:
+                headers["If-Modified-Since"] = self._last_modified
+        self._requested_at = time.time()
+        response = get_http_client().request(
+            "GET", self.node_list_url, headers=headers, timeout=self.timeout
+        )
+        # A 304 response means that the node list has not been modified
+        if response.status != 304 or self._base_urls is None:
+            response.raise_for_status()
+            self._base_urls = parse_node_list(response.body)
+            self._etag = response.headers.get("ETag")
+            self._last_modified = response.headers.get("Last-Modified")
+        self._fetched_at = time.time()
+        self._save_snapshot()
+
+    def _load_snapshot(self):
+        """Load the node list from the snapshot, if it exists and is newer than the node list
+        in memory."""
+        if self.snapshot_path is None:
+            return
+        try:
+            with open(self.snapshot_path, "rb") as snapshot_file:
+                content = snapshot_file.read()
+            modified_at = os.path.getmtime(self.snapshot_path)
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            logger.warning(
+                "Unable to read member node snapshot %s: %s", self.snapshot_path, e
+            )
+            return
+        try:
+            if content.lstrip().startswith(b"<"):
+                # A copy of the CN node list
+                snapshot = {
+                    "fetched_at": modified_at,
+                    "base_urls": parse_node_list(content),
+                }
+            else:
+                snapshot = json.loads(content)
+                if snapshot.get("version") != self.SNAPSHOT_VERSION:
+                    return
+        # pylint: disable=W0718
+        except Exception as e:
+            logger.warning(
+                "Unable to parse member node snapshot %s: %s", self.snapshot_path, e
+            )
+            return
+        if self._base_urls is None or snapshot["fetched_at"] > self._fetched_at:
+            self._base_urls = snapshot["base_urls"]
+            self._fetched_at = snapshot["fetched_at"]
+            self._etag = snapshot.get("etag")
+            self._last_modified = snapshot.get("last_modified")
+
+    def _save_snapshot(self):
+        """Write the node list to the snapshot, replacing it atomically."""
+        if self.snapshot_path is None:
+            return
+        snapshot = {
+            "version": self.SNAPSHOT_VERSION,
+            "fetched_at": self._fetched_at,
+            "etag": self._etag,
+            "last_modified": self._last_modified,
+            "base_urls": self._base_urls,
+        }
+        tmp_snapshot_path = f"{self.snapshot_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.snapshot_path) or ".", exist_ok=True)
+            with open(tmp_snapshot_path, "w", encoding="utf-8") as snapshot_file:
+                json.dump(snapshot, snapshot_file)
+            os.replace(tmp_snapshot_path, self.snapshot_path)
+        except OSError as e:
+            logger.warning(
+                "Unable to save member node snapshot %s: %s", self.snapshot_path, e
+            )
+
+
+def parse_node_list(xml_bytes: bytes):
+    """
+    Parses a CN node list into the base URLs of its nodes.
+
+    Args:
+        xml_bytes (bytes): The node list XML document.
+
+    Returns:
+        dict: The base URL of each node, keyed by node identifier.
+    """
+    # pylint: disable=I1101
+    root = etree.fromstring(xml_bytes)
+    base_urls = {}
+    for node in root.findall(".//node"):
+        node_id = node.findtext("identifier")
+        base_url = node.findtext("baseURL")
+        if node_id is not None and base_url is not None:
+            base_urls.setdefault(node_id, base_url)
+    return base_urls
+
+
+def get_default_snapshot_path():
+    """
+    Returns the snapshot path of the default member node registry, which is read from the
+    METADIG_NODE_SNAPSHOT environment variable and defaults to 'DEFAULT_SNAPSHOT_PATH'.
+
+    Returns:
+        str: The path of the snapshot, or None if the variable is set to an empty value to
+            keep the node list in memory only.
+    """
+    snapshot_path = os.environ.get(SNAPSHOT_PATH_ENV_VAR)
+    if snapshot_path is None:
+        return DEFAULT_SNAPSHOT_PATH
+    return os.path.expanduser(snapshot_path) if snapshot_path else None
+
+
+def get_node_registry():
+    """
+    Returns the process-wide member node registry, creating it with the default snapshot
+    path (see 'get_default_snapshot_path') if 'configure_node_registry' has not been called.
+
+    Returns:
+        NodeRegistry: The member node registry.
+    """
+    global _default_registry
+    with _default_registry_lock:
+        if _default_registry is None:
+            _default_registry = NodeRegistry(get_default_snapshot_path())
+        return _default_registry
+
+
+def configure_node_registry(
+    snapshot_path: Optional[str] = DEFAULT_SNAPSHOT_PATH,
+    ttl: float = NodeRegistry.DEFAULT_TTL,
+    offline: bool = False,
+    node_list_url: str = NODE_LIST_URL,
+):
+    """
+    Replaces the process-wide member node registry.
+
+    Args:
+        snapshot_path (str): Path of the snapshot of the node list, or None to only keep it
+            in memory. It is required in offline mode.
+        ttl (float): Seconds after which the node list is refreshed.
+        offline (bool): Whether to only read the node list from a snapshot.
+        node_list_url (str): The URL of the node list.
+
+    Returns:
+        NodeRegistry: The new member node registry.
+    """
+    global _default_registry
+    registry = NodeRegistry(
+        snapshot_path, ttl=ttl, offline=offline, node_list_url=node_list_url
+    )
+    with _default_registry_lock:
+        _default_registry = registry
+    return registry
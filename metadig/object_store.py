@@ -10,6 +10,9 @@ Classes:
 configuration.
 - HashStore: Implementation of ObjectStore interface for a hash-based store.
 
+Stores are cached per process by their normalized configuration, so creating a
+StoreManager for a store that has already been opened does not initialize it again.
+
 Example Usage:
     configuration = {
         'store_type': 'HashStore',
@@ -19,6 +22,8 @@ Example Usage:
     print(obj)
 """
 
+import os
+import threading
 from abc import ABC, abstractmethod
 from hashstore import HashStoreFactory
 from hashstore.filehashstore import PidRefsDoesNotExist
@@ -48,12 +53,19 @@ class ObjectStore(ABC):
         """
 
 
+# Stores created by StoreManager, keyed by their normalized configuration
+_store_cache = {}
+_store_cache_lock = threading.Lock()
+
+
 class StoreManager:
     """
     Manage different types of stores based on the configuration.
 
     Initializes and manage instances of various store classes
     based on the 'store_type' value provided in the configuration dictionary.
+    Store instances are shared by every StoreManager in the process with the
+    same configuration.
 
     Attributes:
         store: An instance of the selected store class.
@@ -66,6 +78,9 @@ class StoreManager:
             Private method that creates and returns an instance of the appropriate
             store class based on the 'store_type' value in the configuration.
 
+        clear_cache():
+            Removes all the cached store instances.
+
         get_object(identifier):
             Retrieves an object stream and it's metadata from the hashstore as
              a tuple
@@ -81,7 +96,37 @@ class StoreManager:
                 Required properties: store_type, store_path, store_depth, store_width,
                 store_algorithm, store_metadata_namespace
         """
-        self.store = self._create_store(configuration)
+        self.store = self._get_store(configuration)
+
+    @classmethod
+    def _get_store(cls, configuration):
+        """
+        Returns the cached store instance for the configuration, creating it
+        when the configuration has not been seen before in this process.
+
+        Args:
+            configuration (dict): A dictionary containing configuration options
+                including the 'store_type' that determines the type of store to manage.
+
+        Returns:
+            object: An instance of the selected store class.
+        """
+        cache_key = get_store_cache_key(configuration)
+        with _store_cache_lock:
+            store = _store_cache.get(cache_key)
+            if store is None:
+                store = cls._create_store(configuration)
+                _store_cache[cache_key] = store
+            return store
+
+    @staticmethod
+    def clear_cache():
+        """
+        Removes all the cached store instances, so that the next StoreManager
+        created for each configuration initializes its store again.
+        """
+        with _store_cache_lock:
+            _store_cache.clear()
 
     @staticmethod
     def _create_store(configuration):
@@ -146,15 +191,7 @@ class HashStore(ObjectStore):
     def __init__(self, configuration):
 
         # if the config is not a dictionary, convert it
-        if not isinstance(configuration, dict):
-            if hasattr(configuration, "keySet"):
-                configuration = {
-                    str(key): configuration.get(key) for key in configuration.keySet()
-                }
-            else:
-                raise TypeError(
-                    "Configuration must be a dictionary or have a keySet method."
-                )
+        configuration = configuration_to_dict(configuration)
 
         # configuration.pop('store_type', None)
         # check required keys are present
@@ -200,6 +237,56 @@ class HashStore(ObjectStore):
         return obj, meta
 
 
+def configuration_to_dict(configuration):
+    """
+    Converts a store configuration to a dictionary. Configurations that are
+    not dictionaries (ex. java maps) are converted through their keySet method.
+
+    Args:
+        configuration (dict): The store configuration.
+
+    Returns:
+        dict: The store configuration as a dictionary.
+
+    Raises:
+        TypeError: If the configuration is not a dictionary and has no keySet method.
+    """
+    if isinstance(configuration, dict):
+        return configuration
+    if hasattr(configuration, "keySet"):
+        return {str(key): configuration.get(key) for key in configuration.keySet()}
+    raise TypeError("Configuration must be a dictionary or have a keySet method.")
+
+
+def get_store_cache_key(configuration):
+    """
+    Normalizes a store configuration into a key for the store cache, so that
+    equivalent configurations share a store: keys and values are compared as
+    strings, numbers as integers when possible, and the store path as an
+    absolute path.
+
+    Args:
+        configuration (dict): The store configuration.
+
+    Returns:
+        tuple: The sorted (key, value) pairs of the normalized configuration.
+    """
+    normalized = {}
+    for key, value in configuration_to_dict(configuration).items():
+        key = str(key)
+        if key == "store_path" and value is not None:
+            value = os.path.normpath(os.path.abspath(str(value)))
+        elif key in ("store_depth", "store_width"):
+            try:
+                value = int(value)
+            except (TypeError, ValueError):
+                value = str(value)
+        elif value is not None:
+            value = str(value)
+        normalized[key] = value
+    return tuple(sorted(normalized.items()))
+
+
 class ObjectNotFoundError(Exception):
     """Custom exception class for when an object is not found."""
 
@@ -0,0 +1,292 @@
+"""
+Module: resolution_cache.py
+
+This module provides the cache of URL resolutions behind 'checks.isResolvable', so that the
+same DOIs and landing pages, cited across versions of a package and across documents, are not
+resolved again for every check.
+
+Results are keyed by the normalized URL and stored in an SQLite database, which can be shared
+by the worker processes of a suite run and by later runs. Resolvable URLs are cached for longer
+than unresolvable ones (error statuses and network failures), which are more likely to change.
+The database of the default cache is set by the METADIG_RESOLUTION_CACHE environment variable
+(an empty value disables the cache), and is otherwise under ~/.cache/metadig. Failures to read
+or write the database are logged as warnings and the URL is resolved without the cache.
+
+Classes:
+- ResolutionCache: SQLite cache of the (resolvable, message) result of each URL.
+
+Example Usage:
+    cache = ResolutionCache("/var/cache/metadig/resolutions.sqlite3")
+    result = cache.get(url)
+    if result is None:
+        result = resolve(url)
+        cache.set(url, result)
+
+    # Disable the cache used by 'isResolvable'
+    configure_resolution_cache(None)
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+import urllib.parse
+from typing import Optional
+
+# Database of the cache used by 'isResolvable'
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "metadig", "resolutions.sqlite3"
+)
+# Environment variable that overrides the database of the default cache
+CACHE_PATH_ENV_VAR = "METADIG_RESOLUTION_CACHE"
+
+logger = logging.getLogger(__name__)
+
+_default_cache = None
+_default_cache_configured = False
+_default_cache_lock = threading.Lock()
+
+# The (path, process id) of the databases whose schema has been created by this process
+_initialized_databases = set()
+_initialized_databases_lock = threading.Lock()
+
+
+class ResolutionCache:
+    """
+    A process-safe cache of URL resolutions, stored in an SQLite database.
+
+    Attributes:
+        path (str): Path of the SQLite database.
+        positive_ttl (float): Seconds for which a resolvable URL is cached.
+        negative_ttl (float): Seconds for which an unresolvable URL is cached.
+
+    Methods:
+        get(url):
+            Returns the cached result of a URL, or None if it is missing or expired.
+
+        set(url, result):
+            Caches the result of a URL.
+
+        clear():
+            Removes all of the cached results.
+    """
+
+    # Seconds for which a resolvable URL is cached
+    DEFAULT_POSITIVE_TTL = 7 * 24 * 60 * 60
+    # Seconds for which an error status or network failure is cached
+    DEFAULT_NEGATIVE_TTL = 60 * 60
+    # Seconds to wait for another process to release a lock on the database
+    BUSY_TIMEOUT = 30
+    # Minimum seconds between two sweeps of the expired results
+    PRUNE_INTERVAL = 60 * 60
+
+    def __init__(
+        self,
+        path: str = DEFAULT_CACHE_PATH,
+        positive_ttl: float = DEFAULT_POSITIVE_TTL,
+        negative_ttl: float = DEFAULT_NEGATIVE_TTL,
+    ):
+        """
+        Initializes the ResolutionCache. The database is created on first use.
+
+        Args:
+            path (str): Path of the SQLite database.
+            positive_ttl (float): Seconds for which a resolvable URL is cached.
+            negative_ttl (float): Seconds for which an unresolvable URL is cached.
+        """
+        self.path = path
+        self.positive_ttl = positive_ttl
+        self.negative_ttl = negative_ttl
+        # SQLite connections cannot be shared between threads, or with forked processes
+        self._local = threading.local()
+        # When the expired results were last swept, in epoch seconds
+        self._pruned_at = 0.0
+        self._prune_lock = threading.Lock()
+
+    def get(self, url: str):
+        """
+        Returns the cached result of a URL. The result of the URL as it was given is
+        preferred, and otherwise the result of an equivalent spelling of the URL is returned,
+        with the message naming the URL that was resolved.
+
+        Args:
+            url (str): The URL, which is looked up by its normalized form.
+
+        Returns:
+            tuple: The (resolvable, message) result, or None if it is missing or expired.
+        """
+        try:
+            row = (
+                self._connect()
+                .execute(
+                    "SELECT resolvable, message, resolved_at FROM resolutions"
+                    " WHERE key = ? ORDER BY url = ? DESC, resolved_at DESC LIMIT 1",
+                    (normalize_url(url), url),
+                )
+                .fetchone()
+            )
+        except (sqlite3.Error, OSError) as e:
+            logger.warning("Unable to read resolution cache %s: %s", self.path, e)
+            return None
+        if row is None:
+            return None
+        resolvable, message, resolved_at = row
+        ttl = self.positive_ttl if resolvable else self.negative_ttl
+        if time.time() - resolved_at >= ttl:
+            return None
+        return (bool(resolvable), message)
+
+    def set(self, url: str, result: tuple):
+        """
+        Caches the result of a URL.
+
+        Args:
+            url (str): The URL that was resolved.
+            result (tuple): The (resolvable, message) result of 'isResolvable'.
+        """
+        resolvable, message = result
+        try:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO resolutions"
+                " (key, url, resolvable, message, resolved_at) VALUES (?, ?, ?, ?, ?)",
+                (normalize_url(url), url, int(resolvable), str(message), time.time()),
+            )
+            self._prune(conn)
+        except (sqlite3.Error, OSError) as e:
+            logger.warning("Unable to write resolution cache %s: %s", self.path, e)
+
+    def clear(self):
+        """Removes all of the cached results."""
+        self._connect().execute("DELETE FROM resolutions")
+
+    def _connect(self):
+        """Return the connection of the current thread, opening it if needed."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Autocommit, so that every write is visible to the other processes immediately
+        conn = sqlite3.connect(
+            self.path, timeout=self.BUSY_TIMEOUT, isolation_level=None
+        )
+        database = (os.path.abspath(self.path), os.getpid())
+        with _initialized_databases_lock:
+            if database not in _initialized_databases:
+                try:
+                    # Let readers in other processes proceed while a result is written
+                    conn.execute("PRAGMA journal_mode=WAL")
+                except sqlite3.Error:
+                    pass
+                # Results are keyed by the normalized URL, and by the URL as it was given so
+                # that each message names the URL it was requested with
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS resolutions (key TEXT, url TEXT,"
+                    " resolvable INTEGER, message TEXT, resolved_at REAL,"
+                    " PRIMARY KEY (key, url))"
+                )
+                _initialized_databases.add(database)
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+    def _prune(self, conn):
+        """Drop the results that have expired for every TTL, at most once every
+        'PRUNE_INTERVAL' seconds."""
+        now = time.time()
+        with self._prune_lock:
+            if now - self._pruned_at < self.PRUNE_INTERVAL:
+                return
+            self._pruned_at = now
+        conn.execute(
+            "DELETE FROM resolutions WHERE resolved_at < ?",
+            (now - max(self.positive_ttl, self.negative_ttl),),
+        )
+
+
+def normalize_url(url: str):
+    """
+    Normalizes a URL for use as a cache key. The scheme and host are lowercased, default ports,
+    fragments and surrounding whitespace are removed, and an empty path becomes '/'.
+
+    Args:
+        url (str): The URL to normalize.
+
+    Returns:
+        str: The normalized URL.
+    """
+    url_comps = urllib.parse.urlsplit(url.strip())
+    scheme = url_comps.scheme.lower()
+    netloc = url_comps.netloc.lower()
+    try:
+        port = url_comps.port
+    except ValueError:
+        port = None
+    if (scheme, port) in (("http", 80), ("https", 443)):
+        netloc = netloc.rsplit(":", 1)[0]
+    return urllib.parse.urlunsplit(
+        (scheme, netloc, url_comps.path or "/", url_comps.query, "")
+    )
+
+
+def get_default_cache_path():
+    """
+    Returns the database path of the default resolution cache, which is read from the
+    METADIG_RESOLUTION_CACHE environment variable and defaults to 'DEFAULT_CACHE_PATH'.
+
+    Returns:
+        str: The path of the SQLite database, or None if the variable is set to an empty
+            value to disable the cache.
+    """
+    path = os.environ.get(CACHE_PATH_ENV_VAR)
+    if path is None:
+        return DEFAULT_CACHE_PATH
+    return os.path.expanduser(path) if path else None
+
+
+def get_resolution_cache():
+    """
+    Returns the process-wide resolution cache, creating it with the default database path
+    (see 'get_default_cache_path') if 'configure_resolution_cache' has not been called.
+
+    Returns:
+        ResolutionCache: The resolution cache, or None if it has been disabled.
+    """
+    global _default_cache, _default_cache_configured
+    with _default_cache_lock:
+        if not _default_cache_configured:
+            path = get_default_cache_path()
+            _default_cache = ResolutionCache(path) if path is not None else None
+            _default_cache_configured = True
+        return _default_cache
+
+
+def configure_resolution_cache(
+    path: Optional[str] = DEFAULT_CACHE_PATH,
+    positive_ttl: float = ResolutionCache.DEFAULT_POSITIVE_TTL,
+    negative_ttl: float = ResolutionCache.DEFAULT_NEGATIVE_TTL,
+):
+    """
+    Replaces the process-wide resolution cache.
+
+    Args:
+        path (str): Path of the SQLite database, or None to disable the cache.
+        positive_ttl (float): Seconds for which a resolvable URL is cached.
+        negative_ttl (float): Seconds for which an unresolvable URL is cached.
+
+    Returns:
+        ResolutionCache: The new resolution cache, or None if it is disabled.
+    """
+    global _default_cache, _default_cache_configured
+    cache = None
+    if path is not None:
+        cache = ResolutionCache(
+            path, positive_ttl=positive_ttl, negative_ttl=negative_ttl
+        )
+    with _default_cache_lock:
+        _default_cache = cache
+        _default_cache_configured = True
+    return cache
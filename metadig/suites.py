@@ -1,12 +1,20 @@
 """Metadig suite utilities"""
 
+import functools
+import importlib
+import itertools
 import os
 import multiprocessing
 import json
-from typing import Dict, Any, Optional
+import queue
+import threading
+import time
+from typing import Dict, Any, Callable, Iterable, Optional, TextIO, Tuple, Union
 from datetime import datetime
 from lxml import etree
 import metadig.checks as checks
+import metadig.metadata as metadata
+from metadig.data_pid_resolver import get_data_pid_resolver
 
 
 def does_file_exist(path_to_check: str):
@@ -17,175 +25,1285 @@ def does_file_exist(path_to_check: str):
         return False
 
 
+class CheckRegistry:
+    """An index of the metadig checks in a directory that maps check ids to their file paths
+    and environments.
+
+    Each check file is parsed once. 'refresh' lists the directory and only re-parses the checks
+    whose mtime or size have changed, dropping checks that were removed. The index can also be
+    persisted to a JSON file, so that a new process does not need to parse unchanged checks.
+
+    Example Usage:
+        registry = CheckRegistry("/path/to/checks", index_path="/path/to/index.json")
+        suite_results = run_suite(suite_path, registry, metadata_xml_path, sysmeta_path)
+    """
+
+    INDEX_VERSION = 1
+
+    def __init__(self, checks_path: str, index_path: Optional[str] = None):
+        """Initialize the CheckRegistry and index the checks found in the directory.
+
+        :param str checks_path: Path to the folder containing metadig checks.
+        :param str index_path: Path to a JSON file to load the index from and save it to.
+        """
+        self.checks_path = checks_path
+        self.index_path = index_path
+        # Entries are keyed by file name, in directory listing order
+        self._entries = {}
+        self._lock = threading.Lock()
+        if index_path is not None:
+            self._load_index()
+        self.refresh()
+
+    @staticmethod
+    def _read_check(file_path: str):
+        """Parse a check and return its index entry: the check id, its environment and an
+        error message if the check could not be parsed."""
+        check_id = None
+        try:
+            # pylint: disable=I1101
+            root = etree.parse(file_path).getroot()
+
+            # Get the id of the check
+            id_elem = root.find("id")
+            if id_elem is not None and id_elem.text:
+                check_id = id_elem.text.strip()
+            else:
+                print(f"Warning: No <id> found in {file_path}")
+            # Get the environment of the check
+            env_elem = root.find("environment")
+            if env_elem is None:
+                raise ValueError("No <environment> element")
+            environment = env_elem.text
+            if not environment:
+                print(f"Warning: No <environment> found in {file_path}")
+            return {"check_id": check_id, "environment": environment, "error": None}
+        # pylint: disable=W0718
+        except Exception as e:
+            return {"check_id": check_id, "environment": None, "error": str(e)}
+
+    def refresh(self):
+        """Bring the index up to date with the checks directory, parsing new and modified
+        checks only.
+
+        :return: True if the index changed, False otherwise
+        :rtype: bool
+        """
+        with self._lock:
+            changed = False
+            entries = {}
+            for filename in os.listdir(self.checks_path):
+                if not filename.endswith(".xml"):
+                    continue
+                file_path = os.path.join(self.checks_path, filename)
+                try:
+                    stat = os.stat(file_path)
+                except FileNotFoundError:
+                    continue
+                entry = self._entries.get(filename)
+                if (
+                    entry is None
+                    or entry["mtime_ns"] != stat.st_mtime_ns
+                    or entry["size"] != stat.st_size
+                ):
+                    entry = self._read_check(file_path)
+                    entry["mtime_ns"] = stat.st_mtime_ns
+                    entry["size"] = stat.st_size
+                    changed = True
+                entries[filename] = entry
+            if entries.keys() != self._entries.keys():
+                changed = True
+            self._entries = entries
+            if changed and self.index_path is not None:
+                self._save_index()
+            return changed
+
+    def get_maps(self):
+        """Get the mappings of check ids to file paths and environments.
+
+        :return: Tuple of two dictionaries:
+            (1) a dictionary mapping check ids to file paths (or an error message if the
+                check could not be parsed),
+            (2) a dictionary mapping check ids to check environment
+        """
+        id_to_path_dict = {}
+        id_to_env_dict = {}
+        with self._lock:
+            for filename, entry in self._entries.items():
+                file_path = os.path.join(self.checks_path, filename)
+                check_id = entry["check_id"]
+                if entry["error"] is not None:
+                    id_to_path_dict[check_id] = (
+                        f"Error parsing {file_path}: {entry['error']}"
+                    )
+                    continue
+                if check_id is None:
+                    continue
+                id_to_path_dict[check_id] = file_path
+                if entry["environment"]:
+                    id_to_env_dict[check_id] = entry["environment"]
+        return id_to_path_dict, id_to_env_dict
+
+    def _load_index(self):
+        """Load the index entries from the index file, if it exists and belongs to this
+        checks directory."""
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as index_file:
+                index = json.load(index_file)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            print(f"Warning: Unable to read check index {self.index_path}: {e}")
+            return
+        if index.get("version") == self.INDEX_VERSION and index.get(
+            "checks_path"
+        ) == os.path.abspath(self.checks_path):
+            self._entries = index.get("entries", {})
+
+    def _save_index(self):
+        """Write the index entries to the index file, replacing it atomically."""
+        index = {
+            "version": self.INDEX_VERSION,
+            "checks_path": os.path.abspath(self.checks_path),
+            "entries": self._entries,
+        }
+        tmp_index_path = f"{self.index_path}.{os.getpid()}.tmp"
+        with open(tmp_index_path, "w", encoding="utf-8") as index_file:
+            json.dump(index, index_file)
+        os.replace(tmp_index_path, self.index_path)
+
+
+_check_registries = {}
+_check_registries_lock = threading.Lock()
+
+
+def get_check_registry(checks_path: str):
+    """Get the process-wide check registry for the given checks directory, refreshing it so
+    that it reflects the checks currently on disk.
+
+    :param str checks_path: Path to the folder containing metadig checks
+    :return: The check registry for the directory
+    :rtype: CheckRegistry
+    """
+    registry_key = os.path.abspath(checks_path)
+    with _check_registries_lock:
+        registry = _check_registries.get(registry_key)
+        if registry is None:
+            registry = CheckRegistry(checks_path)
+            _check_registries[registry_key] = registry
+            return registry
+    registry.refresh()
+    return registry
+
+
 def map_and_get_check_ids_to_files_and_env(path_to_checks: str):
     """Given a path to a directory of metadig checks, open each check and map the id
-    to the file path.
+    to the file path. Checks are indexed by the process-wide 'CheckRegistry' for the directory,
+    so only new or modified checks are parsed again.
 
     :param str path_to_checks: Path to the folder containing metadig checks
     :return: Tuple of two dictionaries:
          (1) a dictionary mapping check ids to file paths,
          (2) a dictionary mapping check ids to check environment
     """
-    id_to_path_dict = {}
-    id_to_env_dict = {}
+    return get_check_registry(path_to_checks).get_maps()
 
-    for filename in os.listdir(path_to_checks):
-        if filename.endswith(".xml"):
-            file_path = os.path.join(path_to_checks, filename)
 
-            try:
-                # pylint: disable=I1101
-                tree = etree.parse(file_path)
-                root = tree.getroot()
-
-                # Get the file path that matches the id
-                id_elem = root.find("id")
-                if id_elem is not None and id_elem.text:
-                    check_id = id_elem.text.strip()
-                    id_to_path_dict[check_id] = file_path
+class CheckDurationStats:
+    """A small store of how long each check takes to run, used to schedule the checks of a
+    suite longest first (LPT scheduling), so a slow check does not start last and set the
+    suite's tail latency.
+
+    Durations are kept per check file name as an exponentially weighted moving average of the
+    check's wall times. Checks without a recorded duration are expected to take the average
+    duration of the known checks, or 'DEFAULT_DURATION' when no check is known. The stats can
+    be persisted to a JSON file so that they carry over between processes.
+
+    Example Usage:
+        check_stats = CheckDurationStats("/path/to/check_durations.json")
+        with SuiteRunner(check_stats=check_stats) as runner:
+            suite_results = runner.run_suite(
+                suite_path, checks_path, metadata_xml_path, metadata_sysmeta_path
+            )
+    """
+
+    STATS_VERSION = 1
+    # Expected duration in seconds of a check, when no check has a recorded duration
+    DEFAULT_DURATION = 1.0
+    # Weight of the latest wall time in the moving average
+    SMOOTHING = 0.3
+
+    def __init__(self, stats_path: Optional[str] = None):
+        """Initialize the CheckDurationStats.
+
+        :param str stats_path: Path to a JSON file to load the stats from and save them to.
+        """
+        self.stats_path = stats_path
+        # Expected durations in seconds, keyed by check file name
+        self._durations = {}
+        self._changed = False
+        self._lock = threading.Lock()
+        if stats_path is not None:
+            self._load_stats()
+
+    def record(self, check_id: str, seconds: float):
+        """Record the wall time of a check run.
+
+        :param str check_id: The file name of the check.
+        :param float seconds: How long the check took to run.
+        """
+        with self._lock:
+            expected = self._durations.get(check_id)
+            if expected is None:
+                self._durations[check_id] = seconds
+            else:
+                self._durations[check_id] = (
+                    self.SMOOTHING * seconds + (1 - self.SMOOTHING) * expected
+                )
+            self._changed = True
+
+    def expected_duration(self, check_id: str):
+        """Get how long a check is expected to take to run.
+
+        :param str check_id: The file name of the check.
+        :return: The expected duration in seconds
+        :rtype: float
+        """
+        with self._lock:
+            return self._expected_duration(check_id)
+
+    def _expected_duration(self, check_id: str):
+        expected = self._durations.get(check_id)
+        if expected is not None:
+            return expected
+        if self._durations:
+            return sum(self._durations.values()) / len(self._durations)
+        return self.DEFAULT_DURATION
+
+    def order_tasks(self, tagged_tasks: Iterable):
+        """Order tagged check tasks by expected duration, longest first. Tasks with the same
+        expected duration keep their order.
+
+        :param tagged_tasks: Iterable of (tag, task) tuples, where task is the tuple of
+            arguments for 'checks.run_check_task'.
+        :return: List of (tag, task) tuples
+        :rtype: list
+        """
+        with self._lock:
+            return sorted(
+                tagged_tasks,
+                key=lambda tagged_task: -self._expected_duration(
+                    tagged_task[1][0].rsplit("/", 1)[-1]
+                ),
+            )
+
+    def save(self):
+        """Write the stats to the stats file, if they have changed, replacing it
+        atomically."""
+        with self._lock:
+            if self.stats_path is None or not self._changed:
+                return
+            stats = {"version": self.STATS_VERSION, "durations": self._durations}
+            tmp_stats_path = f"{self.stats_path}.{os.getpid()}.tmp"
+            with open(tmp_stats_path, "w", encoding="utf-8") as stats_file:
+                json.dump(stats, stats_file)
+            os.replace(tmp_stats_path, self.stats_path)
+            self._changed = False
+
+    def _load_stats(self):
+        """Load the durations from the stats file, if it exists."""
+        try:
+            with open(self.stats_path, "r", encoding="utf-8") as stats_file:
+                stats = json.load(stats_file)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            print(f"Warning: Unable to read check stats {self.stats_path}: {e}")
+            return
+        if stats.get("version") == self.STATS_VERSION:
+            self._durations = stats.get("durations", {})
+
+
+_default_check_stats = None
+_default_check_stats_lock = threading.Lock()
+
+
+def get_check_stats():
+    """Get the process-wide 'CheckDurationStats', which runners use unless they are given
+    their own, so that check durations build up across suite runs. The stats are kept in
+    memory unless a stats file is set with 'configure_check_stats'.
+
+    :return: The process-wide check stats
+    :rtype: CheckDurationStats
+    """
+    global _default_check_stats
+    with _default_check_stats_lock:
+        if _default_check_stats is None:
+            _default_check_stats = CheckDurationStats()
+        return _default_check_stats
+
+
+def configure_check_stats(stats_path: Optional[str] = None):
+    """Replace the process-wide 'CheckDurationStats'.
+
+    :param str stats_path: Path to a JSON file to load the stats from and save them to, or
+        None to keep the stats in memory.
+    :return: The new process-wide check stats
+    :rtype: CheckDurationStats
+    """
+    global _default_check_stats
+    check_stats = CheckDurationStats(stats_path)
+    with _default_check_stats_lock:
+        _default_check_stats = check_stats
+    return check_stats
+
+
+# Modules imported by each pool worker on start up, so that checks do not pay for them
+PRELOAD_MODULES = (
+    "lxml.etree",
+    "chardet",
+    "pandas",
+    "hashstore",
+    "metadig.metadata",
+    "metadig.object_store",
+)
+
+
+def init_worker(preload_modules=PRELOAD_MODULES, data_object_cache_bytes=None):
+    """Initializer for 'SuiteRunner' pool workers, which imports the modules checks commonly
+    use before the worker receives its first check.
+
+    :param tuple preload_modules: Names of the modules to import
+    :param int data_object_cache_bytes: Number of bytes of data object content the worker
+        may cache, defaults to None (keep 'metadata.DATA_OBJECT_CACHE_MAX_BYTES').
+    """
+    if data_object_cache_bytes is not None:
+        metadata.DATA_OBJECT_CACHE_MAX_BYTES = data_object_cache_bytes
+    for module_name in preload_modules:
+        try:
+            importlib.import_module(module_name)
+        except ImportError as ie:
+            print(f"Warning: Unable to preload module {module_name}: {ie}")
+
+
+class SuiteRunner:
+    """Run metadig-check suites on a long-lived pool of worker processes.
+
+    The pool is created on first use and is reused by every suite run until the runner is
+    closed, so the cost of starting workers and importing the modules checks depend on is only
+    paid once. Workers also keep their compiled check cache between suite runs.
+
+    Each worker caches the data objects its checks read in its own data object cache. The
+    runner's 'data_object_cache_bytes' is the budget for all of its workers together and is
+    split evenly between them, so the peak memory used by the caches does not grow with the
+    number of workers.
+
+    Checks are dispatched longest expected first, based on the wall times recorded in the
+    runner's 'CheckDurationStats'. A check that runs past 'check_timeout', or is still running
+    when its suite exceeds 'suite_timeout', is cancelled (or its worker is recycled if it cannot
+    be cancelled) and reported with an 'ERROR' status, while the rest of the suite completes.
+
+    Example Usage:
+        with SuiteRunner() as runner:
+            for metadata_xml_path, metadata_sysmeta_path in documents:
+                suite_results = runner.run_suite(
+                    suite_path, checks_path, metadata_xml_path, metadata_sysmeta_path
+                )
+    """
+
+    # Seconds a check may run past its time budget before its worker is recycled
+    TIMEOUT_GRACE = 5.0
+
+    def __init__(
+        self,
+        processes: Optional[int] = None,
+        maxtasksperchild: Optional[int] = None,
+        preload_modules: tuple = PRELOAD_MODULES,
+        check_stats: Union[str, CheckDurationStats, None] = None,
+        check_timeout: Optional[float] = None,
+        suite_timeout: Optional[float] = None,
+        data_object_cache_bytes: Optional[int] = None,
+    ):
+        """Initialize the SuiteRunner.
+
+        :param int processes: Number of worker processes, defaults to the number of CPUs.
+        :param int maxtasksperchild: Number of checks a worker runs before it is replaced,
+            defaults to None (workers live as long as the pool).
+        :param tuple preload_modules: Names of the modules each worker imports on start up.
+        :param check_stats: The 'CheckDurationStats' to schedule checks with and record their
+            wall times in, or a path to its JSON file. Defaults to the process-wide stats
+            (see 'get_check_stats').
+        :param float check_timeout: Number of seconds each check may run for, defaults to
+            None (no limit).
+        :param float suite_timeout: Number of seconds all the checks of a suite may run for,
+            defaults to None (no limit).
+        :param int data_object_cache_bytes: Number of bytes of data object content all the
+            workers may cache together, defaults to 'metadata.DATA_OBJECT_CACHE_MAX_BYTES'.
+            Each worker may cache an equal share of it.
+        """
+        self.processes = processes
+        self.maxtasksperchild = maxtasksperchild
+        self.preload_modules = preload_modules
+        if check_stats is None:
+            check_stats = get_check_stats()
+        elif not isinstance(check_stats, CheckDurationStats):
+            check_stats = CheckDurationStats(check_stats)
+        self.check_stats = check_stats
+        self.check_timeout = check_timeout
+        self.suite_timeout = suite_timeout
+        if data_object_cache_bytes is None:
+            data_object_cache_bytes = metadata.DATA_OBJECT_CACHE_MAX_BYTES
+        self.data_object_cache_bytes = data_object_cache_bytes
+        self._pool = None
+
+    @property
+    def pool(self):
+        """The runner's worker pool, which is created on first use."""
+        if self._pool is None:
+            self._pool = multiprocessing.Pool(
+                processes=self.processes,
+                initializer=init_worker,
+                initargs=(self.preload_modules, self.worker_data_object_cache_bytes),
+                maxtasksperchild=self.maxtasksperchild,
+            )
+        return self._pool
+
+    @property
+    def worker_data_object_cache_bytes(self):
+        """The number of bytes of data object content each worker may cache."""
+        return self.data_object_cache_bytes // (self.processes or os.cpu_count() or 1)
+
+    def close(self):
+        """Shut down the worker pool once the checks that are running have completed."""
+        self.check_stats.save()
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    def terminate(self):
+        """Stop the worker pool immediately, without waiting for running checks."""
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.terminate()
+
+    def plan_suite(
+        self,
+        suite_path: str,
+        checks_path: Union[str, CheckRegistry],
+        metadata_xml_path: str,
+        metadata_sysmeta_path: str,
+        store_props: Optional[Dict[str, Any]] = None,
+        refresh_checks: bool = True,
+        metadata_sysmeta: Optional[Dict[str, Any]] = None,
+        data_pids: Optional[list] = None,
+    ):
+        """Determine the checks of a suite to run against a metadata document, and resolve
+        the evaluation context they share.
+
+        :param str suite_path: Path to the suite xml containing the checks to run.
+        :param checks_path: Path to the checks found in the suite to be executed, or a
+            'CheckRegistry' indexing them.
+        :param str metadata_xml_path: Path to the XML metadata document.
+        :param str metadata_sysmeta_path: Path to the sysmeta for the XML metadata document
+        :param Dict store_props: Dictionary containing the store properties: store_type,
+            store_path, store_depth, store_width, store_algorithm, store_metadata_namespace
+        :param bool refresh_checks: Whether to refresh a given 'CheckRegistry' before
+            looking up the suite's checks.
+        :param Dict metadata_sysmeta: The variables already parsed from the sysmeta document
+            with 'checks.get_sysmeta_vars', if available.
+        :param list data_pids: The data pids already retrieved for the metadata document, if
+            available (see 'resolve_corpus_data_pids').
+        :return: The plan for the suite run
+        :rtype: SuitePlan
+        """
+        # Confirm files exist at the given paths
+        if not does_file_exist(suite_path):
+            raise FileNotFoundError(f"Suite path not found: {suite_path}")
+        if not does_file_exist(metadata_xml_path):
+            raise FileNotFoundError(f"Metadata not found: {metadata_xml_path}")
+        if not does_file_exist(metadata_sysmeta_path):
+            raise FileNotFoundError(
+                f"Metadata sysmeta not found: {metadata_sysmeta_path}"
+            )
+
+        # Read the suite_path & get the checks to run
+        # pylint: disable=I1101
+        suite_doc = etree.parse(suite_path).getroot()
+        suite_name = suite_path.rsplit("/", 1)[-1]
+
+        if isinstance(checks_path, CheckRegistry):
+            check_registry = checks_path
+            if refresh_checks:
+                check_registry.refresh()
+        else:
+            check_registry = get_check_registry(checks_path)
+        check_file_map, check_env_map = check_registry.get_maps()
+
+        # Resolve the sysmeta, member node url and data pids once and share them with all checks
+        if metadata_sysmeta is None:
+            metadata_sysmeta = checks.get_sysmeta_vars(metadata_sysmeta_path)
+        plan = SuitePlan(suite_name, metadata_sysmeta)
+        evaluation_context = None
+        try:
+            evaluation_context = checks.EvaluationContext.from_sysmeta_path(
+                metadata_sysmeta_path, metadata_sysmeta, data_pids
+            )
+        # pylint: disable=W0718
+        except Exception as ec_exception:
+            plan.evaluation_context_error = str(ec_exception)
+
+        for check in suite_doc.findall("check"):
+            check_id = check.find("id").text
+            check_env = check_env_map.get(check_id)
+            check_id_path = check_file_map.get(check_id)
+            # 'run_suite' only executes python checks
+            if check_env == "python":
+                if check_id_path is None:
+                    plan.run_comments.append(
+                        f"Check not found in check map for check: {check_id}"
+                    )
+                elif does_file_exist(check_id_path):
+                    check_tuple_item = (
+                        check_id_path,
+                        metadata_xml_path,
+                        metadata_sysmeta_path,
+                        store_props,
+                        evaluation_context,
+                    )
+                    plan.tasks.append(check_tuple_item)
                 else:
-                    print(f"Warning: No <id> found in {file_path}")
-                # Get the environment of the check
-                env_elem = root.find("environment")
-                env_elem_txt = env_elem.text
-                if env_elem is not None and env_elem_txt:
-                    check_id = id_elem.text.strip()
-                    id_to_env_dict[check_id] = env_elem_txt
+                    plan.run_comments.append(
+                        f"Check not found at path: {check_id_path}"
+                    )
+            else:
+                if check_env is None:
+                    output_msg = (
+                        f"Check not found for: {check_id}"
+                        + f" in: {check_registry.checks_path}"
+                    )
                 else:
-                    print(f"Warning: No <environment> found in {file_path}")
-            # pylint: disable=W0718
-            except Exception as e:
-                # If there is an unexpected exception, add it to the dict with an err msg
-                check_id = (
-                    id_elem.text.strip()
-                    if id_elem is not None and id_elem.text
-                    else None
+                    output_msg = f"Incompatible check environment ({check_env}) for check: {check_id}."
+                plan.check_results.append(
+                    checks.CheckResult(check_id, "N/A", output_msg, "ERROR")
+                )
+
+        if not plan.tasks:
+            raise RuntimeError(
+                "No checks to run. Details: " + ", ".join(plan.run_comments)
+            )
+        return plan
+
+    def run_suite(
+        self,
+        suite_path: str,
+        checks_path: Union[str, CheckRegistry],
+        metadata_xml_path: str,
+        metadata_sysmeta_path: str,
+        store_props: Optional[Dict[str, Any]] = None,
+        structured: bool = False,
+        compact: bool = False,
+    ):
+        """Run a metadig-check suite which can contain multiple checks on this runner's pool.
+
+        :param str suite_path: Path to the suite xml containing the checks to run.
+        :param checks_path: Path to the checks found in the suite to be executed, or a
+            'CheckRegistry' indexing them.
+        :param str metadata_xml_path: Path to the XML metadata document.
+        :param str metadata_sysmeta_path: Path to the sysmeta for the XML metadata document
+        :param Dict store_props: Dictionary containing the store properties: store_type,
+            store_path, store_depth, store_width, store_algorithm, store_metadata_namespace
+        :param bool structured: Whether to return the suite results as a dictionary of
+            'checks.CheckResult' records instead of a JSON string.
+        :param bool compact: Whether to serialize the suite results without indentation.
+        :return: The result of the suite function.
+        """
+        plan = self.plan_suite(
+            suite_path,
+            checks_path,
+            metadata_xml_path,
+            metadata_sysmeta_path,
+            store_props,
+        )
+        if plan.evaluation_context_error is not None:
+            # None of the checks can be run without the context, report the error for each
+            results = plan.get_context_error_results()
+        else:
+            # Run the checks on the runner's warm pool
+            results = [None] * len(plan.tasks)
+            for task_index, result in self.imap_checks(
+                self.check_stats.order_tasks(plan.tagged_tasks()),
+                max_in_flight=len(plan.tasks),
+            ):
+                results[task_index] = result
+            self.check_stats.save()
+        suite_results = plan.get_suite_results(results)
+        if structured:
+            return suite_results
+        return checks.dumps_results(suite_results, compact)
+
+    def iter_suite(
+        self,
+        suite_path: str,
+        checks_path: Union[str, CheckRegistry],
+        metadata_xml_path: str,
+        metadata_sysmeta_path: str,
+        store_props: Optional[Dict[str, Any]] = None,
+        max_in_flight: Optional[int] = None,
+    ):
+        """Run a metadig-check suite on this runner's pool and yield the result of each check
+        as soon as it completes, instead of waiting for the whole suite.
+
+        The results of the suite's checks that cannot be run are yielded first, followed by
+        the results of the checks that are run, in completion order.
+
+        :param str suite_path: Path to the suite xml containing the checks to run.
+        :param checks_path: Path to the checks found in the suite to be executed, or a
+            'CheckRegistry' indexing them.
+        :param str metadata_xml_path: Path to the XML metadata document.
+        :param str metadata_sysmeta_path: Path to the sysmeta for the XML metadata document
+        :param Dict store_props: Dictionary containing the store properties: store_type,
+            store_path, store_depth, store_width, store_algorithm, store_metadata_namespace
+        :param int max_in_flight: Maximum number of checks submitted to the pool at a time,
+            defaults to all of the suite's checks.
+        :return: Generator of 'checks.CheckResult' records
+        """
+        plan = self.plan_suite(
+            suite_path,
+            checks_path,
+            metadata_xml_path,
+            metadata_sysmeta_path,
+            store_props,
+        )
+        yield from plan.check_results
+        if plan.evaluation_context_error is not None:
+            yield from plan.get_context_error_results()
+            return
+        if max_in_flight is None:
+            max_in_flight = len(plan.tasks)
+        for _, result in self.imap_checks(
+            self.check_stats.order_tasks(plan.tagged_tasks()), max_in_flight
+        ):
+            yield result
+        self.check_stats.save()
+
+    def run_corpus(
+        self,
+        suite_path: str,
+        checks_path: Union[str, CheckRegistry],
+        documents: Union[str, Iterable[Tuple[str, str]]],
+        output_path: str,
+        store_props: Optional[Dict[str, Any]] = None,
+        max_in_flight: Optional[int] = None,
+    ):
+        """Run a metadig-check suite against every metadata document of a corpus.
+
+        The checks of all documents are scheduled over this runner's pool, with at most
+        'max_in_flight' checks submitted at a time, so memory stays bounded no matter the size
+        of the corpus. As soon as all of a document's checks have completed, its suite results
+        are written to the output file as one line of JSON, with the document's
+        'metadata_path' added. Documents that cannot be run are written with a 'FAILURE'
+        run status and the reason in their run comments.
+
+        Documents are planned a window at a time, so that the data pids of a window are
+        retrieved with one query per member node instead of one query per document.
+
+        :param str suite_path: Path to the suite xml containing the checks to run.
+        :param checks_path: Path to the checks found in the suite to be executed, or a
+            'CheckRegistry' indexing them.
+        :param documents: Iterable of (metadata_xml_path, metadata_sysmeta_path) tuples, or a
+            path to a corpus manifest or folder (see 'read_corpus').
+        :param str output_path: Path to the file to write the newline-delimited JSON suite
+            results to.
+        :param Dict store_props: Dictionary containing the store properties: store_type,
+            store_path, store_depth, store_width, store_algorithm, store_metadata_namespace
+        :param int max_in_flight: Maximum number of checks submitted to the pool at a time,
+            defaults to twice the number of worker processes.
+        :return: The number of documents whose suite results were written
+        :rtype: int
+        """
+        if isinstance(documents, str):
+            documents = read_corpus(documents)
+        # Refresh the check index once for the whole corpus
+        if isinstance(checks_path, CheckRegistry):
+            checks_path.refresh()
+        else:
+            checks_path = get_check_registry(checks_path)
+        if max_in_flight is None:
+            max_in_flight = 2 * (self.processes or os.cpu_count() or 1)
+
+        # Plans and results of the documents with checks that have not completed yet
+        pending_documents = {}
+        documents_written = 0
+
+        with open(output_path, "w", encoding="utf-8") as output_file:
+
+            def write_document(metadata_xml_path, suite_results):
+                nonlocal documents_written
+                suite_results["metadata_path"] = metadata_xml_path
+                output_file.write(checks.dumps_results(suite_results, True) + "\n")
+                output_file.flush()
+                documents_written += 1
+
+            def corpus_documents():
+                # A window fills one data pid query of each member node
+                window_size = get_data_pid_resolver().batch_size
+                indexed_documents = enumerate(documents)
+                while True:
+                    window = list(itertools.islice(indexed_documents, window_size))
+                    if not window:
+                        return
+                    window_data_pids = resolve_corpus_data_pids(
+                        metadata_sysmeta_path
+                        for _, (_, metadata_sysmeta_path) in window
+                    )
+                    for document_index, document in window:
+                        yield document_index, document, window_data_pids.get(
+                            document[1], (None, None)
+                        )
+
+            def corpus_tasks():
+                for document_index, document, resolved in corpus_documents():
+                    metadata_xml_path, metadata_sysmeta_path = document
+                    metadata_sysmeta, data_pids = resolved
+                    try:
+                        plan = self.plan_suite(
+                            suite_path,
+                            checks_path,
+                            metadata_xml_path,
+                            metadata_sysmeta_path,
+                            store_props,
+                            refresh_checks=False,
+                            metadata_sysmeta=metadata_sysmeta,
+                            data_pids=data_pids,
+                        )
+                    # pylint: disable=W0718
+                    except Exception as e:
+                        write_document(
+                            metadata_xml_path,
+                            get_failed_suite_results(suite_path, str(e)),
+                        )
+                        continue
+                    if plan.evaluation_context_error is not None:
+                        write_document(
+                            metadata_xml_path,
+                            plan.get_suite_results(plan.get_context_error_results()),
+                        )
+                        continue
+                    pending_documents[document_index] = {
+                        "metadata_path": metadata_xml_path,
+                        "plan": plan,
+                        "results": [None] * len(plan.tasks),
+                        "remaining": len(plan.tasks),
+                    }
+                    for task_index, task in self.check_stats.order_tasks(
+                        plan.tagged_tasks()
+                    ):
+                        yield (document_index, task_index), task
+
+            for (document_index, task_index), result in self.imap_checks(
+                corpus_tasks(),
+                max_in_flight=max_in_flight,
+                suite_key=lambda tag: tag[0],
+            ):
+                pending_document = pending_documents[document_index]
+                pending_document["results"][task_index] = result
+                pending_document["remaining"] -= 1
+                if pending_document["remaining"] == 0:
+                    del pending_documents[document_index]
+                    write_document(
+                        pending_document["metadata_path"],
+                        pending_document["plan"].get_suite_results(
+                            pending_document["results"]
+                        ),
+                    )
+
+        self.check_stats.save()
+        return documents_written
+
+    def imap_checks(
+        self,
+        tagged_tasks: Iterable,
+        max_in_flight: int,
+        suite_key: Optional[Callable] = None,
+    ):
+        """Run checks on the pool and yield their results in completion order.
+
+        Tasks are pulled lazily from 'tagged_tasks' so that no more than 'max_in_flight'
+        checks are submitted to the pool at a time. The wall time of each check is recorded
+        in the runner's 'CheckDurationStats'.
+
+        When the runner has a 'check_timeout' or 'suite_timeout', no more checks are submitted
+        than there are workers, so that every submitted check is running. Workers cancel checks
+        that run past 'check_timeout'. If a check is still running 'TIMEOUT_GRACE' seconds
+        later, or when its suite runs past 'suite_timeout', the pool is recycled: the check is
+        reported as timed out and the other running checks are submitted again.
+
+        :param tagged_tasks: Iterable of (tag, task) tuples, where task is the tuple of
+            arguments for 'checks.run_check_task' and tag identifies the task to the caller.
+        :param int max_in_flight: Maximum number of checks submitted to the pool at a time.
+        :param Callable suite_key: Function that returns the suite of a task from its tag, so
+            that the 'suite_timeout' applies to each suite. Defaults to all tasks belonging to
+            the same suite.
+        :return: Generator of (tag, result) tuples, where result is the 'checks.CheckResult'
+            of the task
+        """
+        completed = queue.Queue()
+        tagged_tasks = iter(tagged_tasks)
+        tasks_exhausted = False
+        max_in_flight = max(1, max_in_flight)
+        has_timeouts = self.check_timeout is not None or self.suite_timeout is not None
+        if has_timeouts:
+            max_in_flight = min(max_in_flight, self.processes or os.cpu_count() or 1)
+        # Submitted tasks, keyed by submission, as (tag, task, suite deadline, deadline)
+        running = {}
+        submissions = itertools.count()
+        suite_deadlines = {}
+
+        def submit(tag, task, suite_deadline):
+            submission = next(submissions)
+            deadline = suite_deadline
+            if self.check_timeout is not None:
+                check_deadline = (
+                    time.monotonic() + self.check_timeout + self.TIMEOUT_GRACE
                 )
-                id_to_path_dict[check_id] = f"Error parsing {file_path}: {e}"
+                if deadline is None or check_deadline < deadline:
+                    deadline = check_deadline
+            running[submission] = (tag, task, suite_deadline, deadline)
+            self.pool.apply_async(
+                run_timed_check_task,
+                (task, self.check_timeout),
+                callback=functools.partial(put_tagged, completed, submission),
+                error_callback=functools.partial(
+                    put_tagged_error, completed, submission, task
+                ),
+            )
+
+        while True:
+            while not tasks_exhausted and len(running) < max_in_flight:
+                try:
+                    tag, task = next(tagged_tasks)
+                except StopIteration:
+                    tasks_exhausted = True
+                    break
+                suite_deadline = None
+                if self.suite_timeout is not None:
+                    suite = suite_key(tag) if suite_key is not None else None
+                    suite_deadline = suite_deadlines.setdefault(
+                        suite, time.monotonic() + self.suite_timeout
+                    )
+                    if suite_deadline <= time.monotonic():
+                        yield tag, self.get_timeout_result(task, suite_timed_out=True)
+                        continue
+                submit(tag, task, suite_deadline)
+            if not running:
+                return
+
+            wait_time = None
+            if has_timeouts:
+                deadlines = [
+                    entry[3] for entry in running.values() if entry[3] is not None
+                ]
+                if deadlines:
+                    wait_time = max(0, min(deadlines) - time.monotonic())
+            try:
+                submission, (result, elapsed) = completed.get(timeout=wait_time)
+            except queue.Empty:
+                now = time.monotonic()
+                timed_out = [
+                    submission
+                    for submission, entry in running.items()
+                    if entry[3] is not None and entry[3] <= now
+                ]
+                for submission in timed_out:
+                    tag, task, suite_deadline, _ = running.pop(submission)
+                    suite_timed_out = (
+                        suite_deadline is not None and suite_deadline <= now
+                    )
+                    yield tag, self.get_timeout_result(task, suite_timed_out)
+                # The timed out checks cannot be cancelled, so recycle their workers and
+                # submit the checks that were still running to the new pool
+                self.terminate()
+                resubmitted = list(running.values())
+                running.clear()
+                for tag, task, suite_deadline, _ in resubmitted:
+                    submit(tag, task, suite_deadline)
+                continue
 
-    return id_to_path_dict, id_to_env_dict
+            if submission not in running:
+                # The result of a check submitted to a pool that has since been recycled
+                continue
+            tag = running.pop(submission)[0]
+            if elapsed is not None:
+                self.check_stats.record(result.check_id, elapsed)
+            yield tag, result
+
+    def get_timeout_result(self, task: tuple, suite_timed_out: bool = False):
+        """Get the result of a check that ran past its time budget.
+
+        :param tuple task: The arguments for 'checks.run_check_task' of the check.
+        :param bool suite_timed_out: Whether the suite's time budget was exceeded, rather than
+            the check's.
+        :return: The check result
+        :rtype: checks.CheckResult
+        """
+        check_id = task[0].rsplit("/", 1)[-1]
+        if suite_timed_out:
+            msg = f"Suite exceeded its time budget of {self.suite_timeout} seconds"
+        else:
+            msg = f"Check exceeded its time budget of {self.check_timeout} seconds"
+        return checks.CheckResult.from_timeout(check_id, msg)
+
+
+def run_timed_check_task(obj_tuple, timeout: Optional[float] = None):
+    """Run a check with 'checks.run_check_task' and measure its wall time.
+
+    :param tuple obj_tuple: The arguments for 'checks.run_check_task'.
+    :param float timeout: Number of seconds the check may run for before it is cancelled.
+    :return: Tuple of the 'checks.CheckResult' and the wall time in seconds
+    :rtype: tuple
+    """
+    start_time = time.perf_counter()
+    result = checks.run_check_task(obj_tuple, timeout)
+    return result, time.perf_counter() - start_time
+
+
+def resolve_corpus_data_pids(metadata_sysmeta_paths: Iterable[str]):
+    """Read the sysmeta of many metadata documents and retrieve their data pids, with one
+    batched query per member node (see 'checks.get_data_pids_many') instead of one query per
+    document.
+
+    :param metadata_sysmeta_paths: Paths to the sysmeta of the metadata documents
+    :return: Dictionary of the (sysmeta variables, data pids) of each sysmeta path. Sysmeta
+        that cannot be read is left out, and the data pids are None when the query of the
+        document's member node failed, so that 'plan_suite' reports the error of each document.
+    :rtype: Dict
+    """
+    metadata_sysmetas = {}
+    node_identifiers = {}
+    for metadata_sysmeta_path in dict.fromkeys(metadata_sysmeta_paths):
+        try:
+            metadata_sysmeta = checks.get_sysmeta_vars(metadata_sysmeta_path)
+        # pylint: disable=W0718
+        except Exception:
+            continue
+        metadata_sysmetas[metadata_sysmeta_path] = metadata_sysmeta
+        node_identifiers.setdefault(
+            metadata_sysmeta["authoritative_member_node"], []
+        ).append(metadata_sysmeta["identifier"])
+
+    node_data_pids = {}
+    for member_node, identifiers in node_identifiers.items():
+        try:
+            node_data_pids[member_node] = checks.get_data_pids_many(
+                identifiers, member_node
+            )
+        # pylint: disable=W0718
+        except Exception:
+            node_data_pids[member_node] = {}
+
+    return {
+        metadata_sysmeta_path: (
+            metadata_sysmeta,
+            node_data_pids[metadata_sysmeta["authoritative_member_node"]].get(
+                metadata_sysmeta["identifier"]
+            ),
+        )
+        for metadata_sysmeta_path, metadata_sysmeta in metadata_sysmetas.items()
+    }
+
+
+def put_tagged(completed: queue.Queue, tag, result):
+    """Pool callback that queues a completed check's result with its tag."""
+    completed.put((tag, result))
+
+
+def put_tagged_error(completed: queue.Queue, tag, task, error):
+    """Pool error callback that queues the result of a check that could not be run with its
+    tag."""
+    check_id = task[0].rsplit("/", 1)[-1]
+    completed.put((tag, (checks.CheckResult.from_error(check_id, error), None)))
+
+
+class SuitePlan:
+    """The checks of a suite to run against a metadata document, along with the results and
+    comments gathered while planning the run.
+
+    Attributes:
+        suite_name (str): File name of the suite.
+        metadata_sysmeta (dict): The variables parsed from the metadata's sysmeta document.
+        tasks (list): Tuples of arguments for 'checks.run_check_task', one per check to run.
+        check_results (list): Results of the checks of the suite that cannot be run.
+        run_comments (list): Messages about issues found while planning the run.
+        evaluation_context_error (str): Why the evaluation context could not be resolved,
+            if it could not be.
+    """
+
+    def __init__(self, suite_name: str, metadata_sysmeta: Dict[str, Any]):
+        self.suite_name = suite_name
+        self.metadata_sysmeta = metadata_sysmeta
+        self.tasks = []
+        self.check_results = []
+        self.run_comments = []
+        self.evaluation_context_error = None
+
+    def tagged_tasks(self):
+        """Get the tasks of the plan, tagged with their index.
+
+        :return: List of (index, task) tuples
+        """
+        return list(enumerate(self.tasks))
+
+    def get_context_error_results(self):
+        """Get the results of the plan's checks when its evaluation context could not be
+        resolved.
+
+        :return: List of 'checks.CheckResult' records
+        """
+        return [
+            checks.CheckResult.from_error(
+                task[0].rsplit("/", 1)[-1], self.evaluation_context_error
+            )
+            for task in self.tasks
+        ]
+
+    def get_suite_results(self, results: list):
+        """Format the suite results from the results of the plan's checks.
+
+        :param list results: The 'checks.CheckResult' records of the plan's tasks, in task
+            order.
+        :return: The suite results, with a 'checks.CheckResult' record per check
+        :rtype: dict
+        """
+        check_results = self.check_results + list(results)
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        metadata_sysmeta = self.metadata_sysmeta
+        sysmeta = {
+            "origin_member_node": metadata_sysmeta.get("authoritative_member_node"),
+            "rights_holder": metadata_sysmeta.get("rights_holder"),
+            "date_uploaded": metadata_sysmeta.get("date_uploaded"),
+            "format_id": metadata_sysmeta.get("format_id"),
+            "obsoletes": metadata_sysmeta.get("obsoletes"),
+        }
+        # Format results
+        suite_results = {
+            "suite": self.suite_name,
+            "timestamp": timestamp,
+            "object_identifier": metadata_sysmeta.get("identifier"),
+            "run_status": "SUCCESS" if check_results else "FAILURE",
+            "run_comments": self.run_comments,
+            "sysmeta": sysmeta,
+            "results": check_results,
+        }
+        return suite_results
+
+
+def get_failed_suite_results(suite_path: str, msg: str):
+    """Get the suite results for a metadata document that the suite could not be run for.
+
+    :param str suite_path: Path to the suite xml.
+    :param str msg: Why the suite could not be run.
+    :return: The suite results
+    :rtype: dict
+    """
+    return {
+        "suite": suite_path.rsplit("/", 1)[-1],
+        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "object_identifier": None,
+        "run_status": "FAILURE",
+        "run_comments": [msg],
+        "sysmeta": None,
+        "results": [],
+    }
+
+
+def write_ndjson(records: Iterable[Dict[str, Any]], output: Union[str, TextIO]):
+    """Write records as newline-delimited JSON, one line per record, as they are produced.
+
+    Each line is flushed as soon as it is written, so that a reader following the output sees
+    every record once it is available.
+
+    :param records: Iterable of JSON serializable records or 'checks.CheckResult' records,
+        such as the generator returned by 'SuiteRunner.iter_suite'.
+    :param output: Path to the file to write to, or a writable text stream.
+    :return: The number of records written
+    :rtype: int
+    """
+    if isinstance(output, str):
+        with open(output, "w", encoding="utf-8") as output_file:
+            return write_ndjson(records, output_file)
+
+    records_written = 0
+    for record in records:
+        output.write(checks.dumps_results(record, True) + "\n")
+        output.flush()
+        records_written += 1
+    return records_written
+
+
+def read_corpus(corpus_path: str):
+    """Read the (metadata, sysmeta) document pairs of a corpus.
+
+    A corpus is either a folder or a manifest file. In a folder, every metadata document
+    'name.xml' is paired with the sysmeta document 'name_sysmeta.xml' next to it. A manifest
+    lists one pair per line: the path to the metadata document and the path to its sysmeta,
+    separated by a tab or a comma. Relative paths are resolved against the manifest's folder,
+    and blank lines and lines starting with '#' are ignored.
+
+    :param str corpus_path: Path to the corpus folder or manifest.
+    :return: List of (metadata_xml_path, metadata_sysmeta_path) tuples
+    :rtype: list
+    """
+    documents = []
+    if os.path.isdir(corpus_path):
+        for filename in sorted(os.listdir(corpus_path)):
+            if not filename.endswith(".xml") or filename.endswith("_sysmeta.xml"):
+                continue
+            sysmeta_filename = filename[: -len(".xml")] + "_sysmeta.xml"
+            sysmeta_path = os.path.join(corpus_path, sysmeta_filename)
+            if does_file_exist(sysmeta_path):
+                documents.append((os.path.join(corpus_path, filename), sysmeta_path))
+        return documents
+
+    manifest_dir = os.path.dirname(os.path.abspath(corpus_path))
+    with open(corpus_path, "r", encoding="utf-8") as manifest:
+        for line_number, line in enumerate(manifest, start=1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            delimiter = "\t" if "\t" in line else ","
+            paths = [path.strip() for path in line.split(delimiter)]
+            if len(paths) != 2:
+                raise ValueError(
+                    f"Invalid corpus manifest line {line_number} in {corpus_path}: {line}"
+                )
+            documents.append(tuple(os.path.join(manifest_dir, path) for path in paths))
+    return documents
 
 
 def run_suite(
     suite_path: str,
-    checks_path: str,
+    checks_path: Union[str, CheckRegistry],
     metadata_xml_path: str,
     metadata_sysmeta_path: str,
     store_props: Optional[Dict[str, Any]] = None,
+    structured: bool = False,
+    compact: bool = False,
+    check_timeout: Optional[float] = None,
+    suite_timeout: Optional[float] = None,
 ):
-    """Run a metadig-check suite which can contain multiple checks.
+    """Run a metadig-check suite which can contain multiple checks. To run many suites, use a
+    'SuiteRunner' instead, which keeps its worker pool between runs.
 
     :param str suite_path: Path to the suite xml containing the checks to run.
-    :param str checks_path: Path to the checks found in the suite to be executed.
+    :param checks_path: Path to the checks found in the suite to be executed, or a
+        'CheckRegistry' indexing them.
     :param str metadata_xml_path: Path to the XML metadata document.
     :param str metadata_sysmeta_path: Path to the sysmeta for the XML metadata document
     :param Dict store_props: Dictionary containing the store properties: store_type, store_path,
         store_depth, store_width, store_algorithm, store_metadata_namespace
+    :param bool structured: Whether to return the suite results as a dictionary of
+        'checks.CheckResult' records instead of a JSON string.
+    :param bool compact: Whether to serialize the suite results without indentation.
+    :param float check_timeout: Number of seconds each check may run for.
+    :param float suite_timeout: Number of seconds all the checks of the suite may run for.
     :return: The result of the suite function.
     """
-    # Confirm files exist at the given paths
-    if not does_file_exist(suite_path):
-        raise FileNotFoundError(f"Suite path not found: {suite_path}")
-    if not does_file_exist(metadata_xml_path):
-        raise FileNotFoundError(f"Metadata not found: {metadata_xml_path}")
-    if not does_file_exist(metadata_sysmeta_path):
-        raise FileNotFoundError(f"Metadata sysmeta not found: {metadata_sysmeta_path}")
-
-    # Read the suite_path & get the checks to run
-    # pylint: disable=I1101
-    suite_doc = etree.parse(suite_path).getroot()
-
-    # Create list of checks to run
-    check_results = []
-    checks_to_run_list = []
-    # And a list of messages to include if there are issues
-    additional_run_comments = []
-    check_file_map, check_env_map = map_and_get_check_ids_to_files_and_env(checks_path)
-    for check in suite_doc.findall("check"):
-        check_id = check.find("id").text
-        check_env = check_env_map.get(check_id)
-        check_id_path = check_file_map.get(check_id)
-        # 'run_suite' only executes python checks
-        if check_env == "python":
-            if check_id_path is None:
-                additional_run_comments.append(
-                    f"Check not found in check map for check: {check_id}"
-                )
-            elif does_file_exist(check_id_path):
-                check_tuple_item = (
-                    check_id_path,
-                    metadata_xml_path,
-                    metadata_sysmeta_path,
-                    store_props,
-                )
-                checks_to_run_list.append(check_tuple_item)
-            else:
-                additional_run_comments.append(
-                    f"Check not found at path: {check_id_path}"
-                )
-        else:
-            if check_env is None:
-                output_msg = f"Check not found for: {check_id} in: {checks_path}"
-            else:
-                output_msg = f"Incompatible check environment ({check_env}) for check: {check_id}."
-            check_results.append(
-                {
-                    "check_id": check_id,
-                    "identifiers": "N/A",
-                    "output": output_msg,
-                    "status": "ERROR",
-                }
-            )
+    with SuiteRunner(
+        check_timeout=check_timeout, suite_timeout=suite_timeout
+    ) as runner:
+        return runner.run_suite(
+            suite_path,
+            checks_path,
+            metadata_xml_path,
+            metadata_sysmeta_path,
+            store_props,
+            structured,
+            compact,
+        )
 
-    if not checks_to_run_list:
-        raise RuntimeError("No checks to run. Details: " + additional_run_comments)
-
-    # Set up multiprocessing pool
-    pool = multiprocessing.Pool()
-    results = pool.imap(checks.try_run_check, checks_to_run_list)
-    pool.close()  # Close the pool and wait for all processes to complete
-    pool.join()
-
-    # Gather variables to add to suite results
-    for result, check_id, msg in results:
-        if result is None:
-            check_results.append(
-                {
-                    "check_id": check_id,
-                    "identifiers": "N/A",
-                    "output": f"Unexpected exception: {msg}",
-                    "status": "ERROR",
-                }
-            )
-        else:
-            result_data = json.loads(result)
-            check_results.append(
-                {
-                    "check_id": check_id,
-                    "identifiers": result_data.get("identifiers", ["N/A"]),
-                    "output": result_data.get("output"),
-                    "status": result_data.get("status"),
-                }
-            )
-    suite_name = suite_path.rsplit("/", 1)[-1]
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    metadata_sysmeta = checks.get_sysmeta_vars(metadata_sysmeta_path)
-    sysmeta = {
-        "origin_member_node": metadata_sysmeta.get("authoritative_member_node"),
-        "rights_holder": metadata_sysmeta.get("rights_holder"),
-        "date_uploaded": metadata_sysmeta.get("date_uploaded"),
-        "format_id": metadata_sysmeta.get("format_id"),
-        "obsoletes": metadata_sysmeta.get("obsoletes"),
-    }
-    # Format results
-    suite_results = {
-        "suite": suite_name,
-        "timestamp": timestamp,
-        "object_identifier": metadata_sysmeta.get("identifier"),
-        "run_status": "SUCCESS" if check_results else "FAILURE",
-        "run_comments": additional_run_comments,
-        "sysmeta": sysmeta,
-        "results": check_results,
-    }
-    json_suite_results = json.dumps(suite_results, indent=4)
-    return json_suite_results
+
+def iter_suite(
+    suite_path: str,
+    checks_path: Union[str, CheckRegistry],
+    metadata_xml_path: str,
+    metadata_sysmeta_path: str,
+    store_props: Optional[Dict[str, Any]] = None,
+    check_timeout: Optional[float] = None,
+    suite_timeout: Optional[float] = None,
+):
+    """Run a metadig-check suite and yield the result of each check as soon as it completes.
+    See 'SuiteRunner.iter_suite'.
+
+    :param str suite_path: Path to the suite xml containing the checks to run.
+    :param checks_path: Path to the checks found in the suite to be executed, or a
+        'CheckRegistry' indexing them.
+    :param str metadata_xml_path: Path to the XML metadata document.
+    :param str metadata_sysmeta_path: Path to the sysmeta for the XML metadata document
+    :param Dict store_props: Dictionary containing the store properties: store_type, store_path,
+        store_depth, store_width, store_algorithm, store_metadata_namespace
+    :param float check_timeout: Number of seconds each check may run for.
+    :param float suite_timeout: Number of seconds all the checks of the suite may run for.
+    :return: Generator of 'checks.CheckResult' records, in completion order
+    """
+    with SuiteRunner(
+        check_timeout=check_timeout, suite_timeout=suite_timeout
+    ) as runner:
+        yield from runner.iter_suite(
+            suite_path,
+            checks_path,
+            metadata_xml_path,
+            metadata_sysmeta_path,
+            store_props,
+        )
+
+
+def run_corpus(
+    suite_path: str,
+    checks_path: Union[str, CheckRegistry],
+    documents: Union[str, Iterable[Tuple[str, str]]],
+    output_path: str,
+    store_props: Optional[Dict[str, Any]] = None,
+    max_in_flight: Optional[int] = None,
+    check_timeout: Optional[float] = None,
+    suite_timeout: Optional[float] = None,
+):
+    """Run a metadig-check suite against every metadata document of a corpus, writing the
+    suite results of each document to the output file as one line of JSON. See
+    'SuiteRunner.run_corpus'.
+
+    :param str suite_path: Path to the suite xml containing the checks to run.
+    :param checks_path: Path to the checks found in the suite to be executed, or a
+        'CheckRegistry' indexing them.
+    :param documents: Iterable of (metadata_xml_path, metadata_sysmeta_path) tuples, or a
+        path to a corpus manifest or folder (see 'read_corpus').
+    :param str output_path: Path to the file to write the newline-delimited JSON results to.
+    :param Dict store_props: Dictionary containing the store properties: store_type, store_path,
+        store_depth, store_width, store_algorithm, store_metadata_namespace
+    :param int max_in_flight: Maximum number of checks submitted to the pool at a time.
+    :param float check_timeout: Number of seconds each check may run for.
+    :param float suite_timeout: Number of seconds the checks of each document may run for.
+    :return: The number of documents whose suite results were written
+    :rtype: int
+    """
+    with SuiteRunner(
+        check_timeout=check_timeout, suite_timeout=suite_timeout
+    ) as runner:
+        return runner.run_corpus(
+            suite_path,
+            checks_path,
+            documents,
+            output_path,
+            store_props,
+            max_in_flight,
+        )
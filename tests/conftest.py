@@ -1,9 +1,14 @@
 """This pytest conf file provides fixtures (variables, methods) for metadig pytests."""
 
 import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 import pytest
 from hashstore import HashStoreFactory
 from metadig import MetaDigClientUtilities
+from metadig import http_client
+from metadig import resolution_cache
 
 
 @pytest.fixture(name="mcdu")
@@ -128,3 +133,103 @@ def init_hashstore_with_test_data(store):
     )
 
     return True
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """A stand-in for remote servers, that keeps connections alive."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):  # pylint: disable=C0103
+        """Respond according to the request path."""
+        self._respond(include_body=True)
+
+    def do_HEAD(self):  # pylint: disable=C0103
+        """Respond according to the request path, without a body."""
+        self._respond(include_body=False)
+
+    def _respond(self, include_body):
+        server = self.server
+        with server.lock:
+            server.requests.append(self.path)
+            server.request_times.append(time.monotonic())
+            server.client_ports.add(self.client_address[1])
+        if self.path == "/flaky":
+            with server.lock:
+                server.flaky_failures -= 1
+                fail = server.flaky_failures >= 0
+            if fail:
+                self._send(503, b"unavailable", include_body)
+                return
+        elif self.path == "/missing":
+            self._send(404, b"not found", include_body)
+            return
+        elif self.path == "/redirect":
+            self.send_response(302)
+            self.send_header("Location", "/ok")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        elif self.path == "/slow":
+            with server.lock:
+                server.in_flight += 1
+                server.max_in_flight = max(server.max_in_flight, server.in_flight)
+            time.sleep(0.1)
+            with server.lock:
+                server.in_flight -= 1
+        self._send(200, b"ok", include_body)
+
+    def _send(self, status, body, include_body):
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if include_body:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):  # pylint: disable=W0622
+        """Keep the test output quiet."""
+
+
+@pytest.fixture(name="http_server")
+def init_server():
+    """Run a local stand-in HTTP server for the network helpers."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.requests = []
+    server.request_times = []
+    server.client_ports = set()
+    server.flaky_failures = 0
+    server.in_flight = 0
+    server.max_in_flight = 0
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(name="default_http_client")
+def init_default_client():
+    """Replace the process-wide HTTP client for a test."""
+    # pylint: disable=W0212
+    previous_client = http_client._default_client
+    client = http_client.configure_http_client(timeout=5, backoff_factor=0)
+    yield client
+    client.close()
+    http_client._default_client = previous_client
+
+
+@pytest.fixture(name="resolution_cache_path", autouse=True)
+def init_resolution_cache(tmp_path):
+    """Give each test its own 'isResolvable' cache, rather than the user's cache."""
+    # pylint: disable=W0212
+    previous_cache = resolution_cache._default_cache
+    previous_configured = resolution_cache._default_cache_configured
+    cache_path = tmp_path / "resolutions.sqlite3"
+    resolution_cache.configure_resolution_cache(str(cache_path))
+    yield cache_path
+    resolution_cache._default_cache = previous_cache
+    resolution_cache._default_cache_configured = previous_configured
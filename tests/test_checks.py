@@ -3,7 +3,10 @@
 import json
 import multiprocessing
 import os
+import shutil
+import socket
 import pytest
+from lxml import etree
 from metadig import checks
 from metadig.object_store import StoreManager
 
@@ -44,6 +47,235 @@ def test_run_check_metadata_entity_attributename():
     assert result_data["status"] == "SUCCESS"
 
 
+def test_run_check_with_metadata_document():
+    """Test that 'run_check' can run a metadata check against an already loaded document."""
+    sample_check_file_path = get_test_data_path(
+        "checks/resource.license.present-2.0.0.xml"
+    )
+    sample_metadata_file_path = get_test_data_path("doi:10.18739_A2QJ78081.xml")
+    sample_sysmeta_file_path = get_test_data_path("doi:10.18739_A2QJ78081_sysmeta.xml")
+    metadata_document = checks.MetadataDocument.from_path(sample_metadata_file_path)
+
+    result = checks.run_check(
+        sample_check_file_path,
+        None,
+        sample_sysmeta_file_path,
+        metadata_document=metadata_document,
+    )
+    result_data = json.loads(result)
+    assert result_data["status"] == "SUCCESS"
+
+
+def test_run_check_with_evaluation_context():
+    """Test that 'run_check' uses a supplied evaluation context instead of resolving it."""
+    sample_check_file_path = get_test_data_path(
+        "checks/resource.license.present-2.0.0.xml"
+    )
+    sample_metadata_file_path = get_test_data_path("doi:10.18739_A2QJ78081.xml")
+    sample_sysmeta_file_path = get_test_data_path("doi:10.18739_A2QJ78081_sysmeta.xml")
+    sysmeta_vars = checks.get_sysmeta_vars(sample_sysmeta_file_path)
+    with open(sample_sysmeta_file_path, "r", encoding="utf-8") as f:
+        system_metadata = f.read()
+    evaluation_context = checks.EvaluationContext(
+        sysmeta_vars, system_metadata, "https://arcticdata.io/metacat/d1/mn/v2", []
+    )
+
+    result = checks.run_check(
+        sample_check_file_path,
+        sample_metadata_file_path,
+        sample_sysmeta_file_path,
+        evaluation_context=evaluation_context,
+    )
+    result_data = json.loads(result)
+    assert result_data["status"] == "SUCCESS"
+
+
+def test_run_check_structured():
+    """Test that 'run_check' returns a 'CheckResult' in structured mode, which serializes to
+    the same output as the JSON mode."""
+    sample_check_file_path = get_test_data_path(
+        "checks/resource.license.present-2.0.0.xml"
+    )
+    sample_metadata_file_path = get_test_data_path("doi:10.18739_A2QJ78081.xml")
+    sample_sysmeta_file_path = get_test_data_path("doi:10.18739_A2QJ78081_sysmeta.xml")
+    with open(sample_sysmeta_file_path, "r", encoding="utf-8") as f:
+        system_metadata = f.read()
+    evaluation_context = checks.EvaluationContext(
+        checks.get_sysmeta_vars(sample_sysmeta_file_path), system_metadata, None, []
+    )
+
+    json_result = json.loads(
+        checks.run_check(
+            sample_check_file_path,
+            sample_metadata_file_path,
+            sample_sysmeta_file_path,
+            evaluation_context=evaluation_context,
+        )
+    )
+    result = checks.run_check(
+        sample_check_file_path,
+        sample_metadata_file_path,
+        sample_sysmeta_file_path,
+        evaluation_context=evaluation_context,
+        structured=True,
+    )
+
+    assert isinstance(result, checks.CheckResult)
+    assert not hasattr(result, "__dict__")
+    assert result.check_id == "resource.license.present-2.0.0.xml"
+    assert result.status == json_result["status"]
+    assert result.output == json_result["output"]
+    assert result.identifiers == json_result.get("identifiers", ["N/A"])
+
+
+def test_dumps_results():
+    """Test that 'dumps_results' serializes check results, compactly if requested."""
+    result = checks.CheckResult("check.xml", ["pid"], "A message.", "SUCCESS")
+    expected_result = {
+        "check_id": "check.xml",
+        "identifiers": ["pid"],
+        "output": "A message.",
+        "status": "SUCCESS",
+    }
+
+    compact_json = checks.dumps_results({"results": [result]}, compact=True)
+    assert compact_json == json.dumps(
+        {"results": [expected_result]}, separators=(",", ":")
+    )
+    assert json.loads(checks.dumps_results(result)) == expected_result
+    assert "\n    " in checks.dumps_results(result)
+
+
+def test_run_check_task_error():
+    """Test that 'run_check_task' returns an 'ERROR' result when the check cannot be run."""
+    result = checks.run_check_task(
+        (
+            get_test_data_path("checks/not-a-check.xml"),
+            get_test_data_path("doi:10.18739_A2QJ78081.xml"),
+            get_test_data_path("doi:10.18739_A2QJ78081_sysmeta.xml"),
+            None,
+        )
+    )
+
+    assert result.check_id == "not-a-check.xml"
+    assert result.status == "ERROR"
+    assert result.output.startswith("Unexpected exception: ")
+
+
+def test_is_resolvable_timeout(monkeypatch):
+    """Test that 'isResolvable' gives up on a server that does not respond."""
+    monkeypatch.setattr(checks, "URL_TIMEOUT", 0.2)
+    with socket.socket() as server:
+        # The server accepts connections but never responds
+        server.bind(("127.0.0.1", 0))
+        server.listen()
+        url = f"http://127.0.0.1:{server.getsockname()[1]}/"
+
+        resolvable, msg = checks.isResolvable(url)
+    assert resolvable is False
+    assert "Timed out resolving URL" in msg
+
+
+def test_is_resolvable_many(http_server, default_http_client):
+    """Test that 'isResolvable_many' returns the results of 'isResolvable' in input order."""
+    urls = [
+        f"{http_server.url}/ok",
+        f"{http_server.url}/missing",
+        "not a url",
+        f"{http_server.url}/redirect",
+    ]
+    results = checks.isResolvable_many(urls, host_interval=0)
+    assert results == [checks.isResolvable(url) for url in urls]
+    assert [resolvable for resolvable, _ in results] == [True, False, False, True]
+    assert checks.isResolvable_many([]) == []
+
+
+def test_is_resolvable_many_deduplicates(http_server, default_http_client):
+    """Test that 'isResolvable_many' resolves identical urls once."""
+    ok_url = f"{http_server.url}/ok"
+    missing_url = f"{http_server.url}/missing"
+    results = checks.isResolvable_many(
+        [ok_url, missing_url, ok_url, ok_url], host_interval=0
+    )
+    assert results[0] == results[2] == results[3]
+    assert results[1][0] is False
+    assert sorted(http_server.requests) == ["/missing", "/ok"]
+
+
+def test_is_resolvable_many_reuses_executor(http_server, default_http_client):
+    """Test that 'isResolvable_many' resolves urls on the same thread pool for every call."""
+    executor = checks.get_resolve_executor()
+    checks.isResolvable_many([f"{http_server.url}/ok"], host_interval=0)
+    checks.isResolvable_many([f"{http_server.url}/missing"], host_interval=0)
+    assert checks.get_resolve_executor() is executor
+
+
+def test_is_resolvable_many_host_interval(http_server, default_http_client):
+    """Test that 'isResolvable_many' spaces out the requests to a host."""
+    urls = [f"{http_server.url}/ok?page={page}" for page in range(4)]
+    results = checks.isResolvable_many(urls, host_interval=0.05)
+    assert all(resolvable for resolvable, _ in results)
+    request_times = sorted(http_server.request_times)
+    gaps = [later - earlier for earlier, later in zip(request_times, request_times[1:])]
+    assert min(gaps) >= 0.04
+
+
+def test_run_check_task_timeout(tmp_path):
+    """Test that 'run_check_task' cancels a check that runs past its time budget."""
+    check_path = tmp_path / "loop.check.xml"
+    shutil.copy(
+        get_test_data_path("checks/resource.license.present-2.0.0.xml"), check_path
+    )
+    check_text = check_path.read_text(encoding="utf-8")
+    check_path.write_text(
+        check_text.replace("def call():", "def call():\n  while True: pass", 1),
+        encoding="utf-8",
+    )
+    sample_sysmeta_file_path = get_test_data_path("doi:10.18739_A2QJ78081_sysmeta.xml")
+    evaluation_context = checks.EvaluationContext(
+        checks.get_sysmeta_vars(sample_sysmeta_file_path), "", None, []
+    )
+
+    result = checks.run_check_task(
+        (
+            str(check_path),
+            get_test_data_path("doi:10.18739_A2QJ78081.xml"),
+            sample_sysmeta_file_path,
+            None,
+            evaluation_context,
+        ),
+        timeout=0.2,
+    )
+    assert result.status == "ERROR"
+    assert result.output.startswith("Check timed out: ")
+
+
+def test_metadata_document_lazy_views():
+    """Test that a 'MetadataDocument' only builds the namespace-stripped view when needed."""
+    sample_metadata_file_path = get_test_data_path("doi:10.18739_A2QJ78081.xml")
+    metadata_document = checks.MetadataDocument.from_path(sample_metadata_file_path)
+
+    assert metadata_document.root.tag.startswith("{")
+    # pylint: disable=W0212
+    assert metadata_document._root_no_ns is None
+    assert metadata_document.root_no_ns.tag == "eml"
+    assert metadata_document.root_no_ns.xpath("/eml/dataset/title")
+    with open(sample_metadata_file_path, "r", encoding="utf-8") as f:
+        assert metadata_document.text == f.read()
+
+
+def test_metadata_document_from_root():
+    """Test that a 'MetadataDocument' can be created from an already parsed tree."""
+    sample_metadata_file_path = get_test_data_path("doi:10.18739_A2QJ78081.xml")
+    # pylint: disable=I1101
+    root = etree.parse(sample_metadata_file_path).getroot()
+    metadata_document = checks.MetadataDocument(root=root)
+
+    assert metadata_document.root is root
+    assert metadata_document.root_no_ns.xpath("/eml/dataset/title")
+    assert b"dataset" in metadata_document.raw
+
+
 def test_run_check_datatable_variables_congruent(
     storemanager_props, init_hashstore_with_test_data
 ):
@@ -241,6 +473,56 @@ def test_run_check_error_missing_pid_objects(
     assert len(result_data["output"]) == 6
 
 
+def test_load_check_cached():
+    """Test that 'load_check' parses a check once and returns the cached check afterwards."""
+    checks.clear_check_cache()
+    check_path = get_test_data_path("checks/resource.license.present-2.0.0.xml")
+
+    compiled_check = checks.load_check(check_path)
+    assert compiled_check.check_id == "resource.license.present-2.0.0"
+    assert compiled_check.environment == "python"
+    assert compiled_check.code is not None
+    assert len(compiled_check.selectors) > 0
+    assert checks.load_check(check_path) is compiled_check
+
+
+def test_load_check_reloads_modified_check(tmp_path):
+    """Test that 'load_check' parses a check again when the file has changed on disk."""
+    checks.clear_check_cache()
+    check_path = tmp_path / "resource.license.present-2.0.0.xml"
+    shutil.copy(
+        get_test_data_path("checks/resource.license.present-2.0.0.xml"), check_path
+    )
+
+    compiled_check = checks.load_check(str(check_path))
+    stat = os.stat(check_path)
+    os.utime(check_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    reloaded_check = checks.load_check(str(check_path))
+    assert reloaded_check is not compiled_check
+    assert reloaded_check.check_id == compiled_check.check_id
+
+
+def test_load_check_evicts_least_recently_used(monkeypatch):
+    """Test that the check cache evicts the least recently used check when full."""
+    checks.clear_check_cache()
+    monkeypatch.setattr(checks, "CHECK_CACHE_MAX_SIZE", 2)
+    license_path = get_test_data_path("checks/resource.license.present-2.0.0.xml")
+    differs_path = get_test_data_path("checks/entity.attributeName.differs-2.0.0.xml")
+    stepcode_path = get_test_data_path(
+        "checks/provenance.processStepCode.present-2.0.0.xml"
+    )
+
+    license_check = checks.load_check(license_path)
+    differs_check = checks.load_check(differs_path)
+    # Touch the license check so that the attributeName check is the least recently used
+    assert checks.load_check(license_path) is license_check
+    _ = checks.load_check(stepcode_path)
+
+    assert checks.load_check(license_path) is license_check
+    assert checks.load_check(differs_path) is not differs_check
+
+
 def test_get_sysmeta_vars():
     """Test that we are able to retrieve the expected identifier and member node
     from a given sysmeta document."""
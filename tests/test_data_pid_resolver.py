@@ -0,0 +1,225 @@
+"""Test module for the metadig data_pid_resolver module."""
+
+import re
+import threading
+import urllib.error
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from xml.sax.saxutils import escape
+import pytest
+from metadig import checks
+from metadig import data_pid_resolver
+from metadig.data_pid_resolver import DataPidResolver, solr_phrase
+
+# The 'isDocumentedBy' field of each Solr document in the stand-in index
+SOLR_INDEX = {
+    "doi:10.5063/AA": ["doi:10.5063/AA"],
+    "urn:uuid:aa-1": ["doi:10.5063/AA"],
+    "urn:uuid:aa-2": ["doi:10.5063/AA"],
+    "urn:uuid:aa-3": ["doi:10.5063/AA", "doi:10.5063/BB"],
+    "urn:uuid:bb-1": ["doi:10.5063/BB"],
+    "urn:uuid:cc-1": ['doi:10.5063/"CC"'],
+    "urn:uuid:zz-1": ["doi:10.5063/ZZ"],
+}
+
+
+class SolrHandler(BaseHTTPRequestHandler):
+    """A stand-in for the Solr query endpoint of a member node."""
+
+    def do_GET(self):  # pylint: disable=C0103
+        """Respond with the documents documented by the queried identifiers."""
+        server = self.server
+        params = dict(urllib.parse.parse_qsl(urllib.parse.urlsplit(self.path).query))
+        server.queries.append(params)
+        if server.error_status is not None:
+            self.send_error(server.error_status)
+            return
+        if server.reject_cursors and "cursorMark" in params:
+            self.send_error(400, "Unknown parameter: cursorMark")
+            return
+        identifiers = [
+            re.sub(r"\\(.)", r"\1", phrase)
+            for phrase in re.findall(r'"((?:[^"\\]|\\.)*)"', params["q"])
+        ]
+        matches = sorted(
+            pid
+            for pid, documented_by in SOLR_INDEX.items()
+            if set(documented_by) & set(identifiers)
+        )
+        rows = int(params["rows"])
+        cursor_mark = params.get("cursorMark") if server.cursors else None
+        offset = int(params.get("start", 0))
+        if cursor_mark is not None:
+            offset = 0 if cursor_mark == "*" else int(cursor_mark)
+        page = matches[offset : offset + rows]
+
+        docs = "".join(
+            f'<doc><str name="id">{escape(pid)}</str><arr name="isDocumentedBy">'
+            + "".join(f"<str>{escape(d)}</str>" for d in SOLR_INDEX[pid])
+            + "</arr></doc>"
+            for pid in page
+        )
+        next_cursor = ""
+        if cursor_mark is not None:
+            next_cursor = f'<str name="nextCursorMark">{offset + len(page)}</str>'
+        body = (
+            f'<response><result name="response" numFound="{len(matches)}" '
+            f'start="{offset}">{docs}</result>{next_cursor}</response>'
+        ).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/xml")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # pylint: disable=W0622
+        """Keep the test output quiet."""
+
+
+@pytest.fixture(name="solr_server")
+def init_solr_server():
+    """Run a local stand-in for a member node's Solr query endpoint."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SolrHandler)
+    server.queries = []
+    server.cursors = True
+    server.reject_cursors = False
+    server.error_status = None
+    server.url = f"http://127.0.0.1:{server.server_address[1]}/metacat/d1/mn/v2"
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(name="default_resolver")
+def init_default_resolver():
+    """Give a test its own process-wide data pid resolver."""
+    # pylint: disable=W0212
+    previous_resolver = data_pid_resolver._default_resolver
+    yield data_pid_resolver.configure_data_pid_resolver()
+    data_pid_resolver._default_resolver = previous_resolver
+
+
+def test_solr_phrase():
+    """Check that quotes and backslashes are escaped in a Solr phrase."""
+    assert solr_phrase("doi:10.5063/AA") == '"doi:10.5063/AA"'
+    assert solr_phrase('a"b\\c') == '"a\\"b\\\\c"'
+
+
+def test_resolve_batches(solr_server):
+    """Check that many identifiers are queried together and grouped by identifier."""
+    resolver = DataPidResolver(batch_size=2)
+    data_pids = resolver.resolve(
+        ["doi:10.5063/AA", "doi:10.5063/BB", 'doi:10.5063/"CC"', "doi:10.5063/NONE"],
+        solr_server.url,
+    )
+    assert data_pids == {
+        "doi:10.5063/AA": ["urn:uuid:aa-1", "urn:uuid:aa-2", "urn:uuid:aa-3"],
+        "doi:10.5063/BB": ["urn:uuid:aa-3", "urn:uuid:bb-1"],
+        'doi:10.5063/"CC"': ["urn:uuid:cc-1"],
+        "doi:10.5063/NONE": [],
+    }
+    assert len(solr_server.queries) == 2
+    assert " OR " in solr_server.queries[0]["q"]
+
+
+def test_resolve_pages_with_cursor(solr_server):
+    """Check that results beyond the first page are retrieved with a cursor."""
+    resolver = DataPidResolver(rows=2)
+    data_pids = resolver.resolve(["doi:10.5063/AA", "doi:10.5063/BB"], solr_server.url)
+    assert data_pids["doi:10.5063/AA"] == [
+        "urn:uuid:aa-1",
+        "urn:uuid:aa-2",
+        "urn:uuid:aa-3",
+    ]
+    assert data_pids["doi:10.5063/BB"] == ["urn:uuid:aa-3", "urn:uuid:bb-1"]
+    assert [query["cursorMark"] for query in solr_server.queries] == ["*", "2", "4"]
+
+
+def test_resolve_pages_without_cursor(solr_server):
+    """Check that results are paged with offsets when cursors are not supported."""
+    solr_server.cursors = False
+    resolver = DataPidResolver(rows=2)
+    data_pids = resolver.resolve(["doi:10.5063/AA", "doi:10.5063/BB"], solr_server.url)
+    assert data_pids["doi:10.5063/AA"] == [
+        "urn:uuid:aa-1",
+        "urn:uuid:aa-2",
+        "urn:uuid:aa-3",
+    ]
+    assert data_pids["doi:10.5063/BB"] == ["urn:uuid:aa-3", "urn:uuid:bb-1"]
+    assert [query.get("start") for query in solr_server.queries] == [None, "2", "4"]
+
+
+def test_resolve_cursor_rejected(solr_server):
+    """Check that results are paged with offsets when the cursor parameters are rejected."""
+    solr_server.reject_cursors = True
+    resolver = DataPidResolver(rows=2)
+    data_pids = resolver.resolve(["doi:10.5063/AA"], solr_server.url)
+    assert data_pids["doi:10.5063/AA"] == [
+        "urn:uuid:aa-1",
+        "urn:uuid:aa-2",
+        "urn:uuid:aa-3",
+    ]
+    assert [query.get("cursorMark") for query in solr_server.queries] == [
+        "*",
+        None,
+        None,
+    ]
+    assert [query.get("start") for query in solr_server.queries] == [None, None, "2"]
+    assert "sort" not in solr_server.queries[1]
+
+
+def test_resolve_cached(solr_server):
+    """Check that the data pids of an identifier are only queried once."""
+    resolver = DataPidResolver()
+    first = resolver.resolve(["doi:10.5063/AA"], solr_server.url)
+    first["doi:10.5063/AA"].append("modified by the caller")
+    data_pids = resolver.resolve(["doi:10.5063/AA", "doi:10.5063/BB"], solr_server.url)
+    assert data_pids["doi:10.5063/AA"] == [
+        "urn:uuid:aa-1",
+        "urn:uuid:aa-2",
+        "urn:uuid:aa-3",
+    ]
+    assert len(solr_server.queries) == 2
+    assert "AA" not in solr_server.queries[1]["q"]
+
+    resolver.clear_cache()
+    resolver.resolve(["doi:10.5063/AA"], solr_server.url)
+    assert len(solr_server.queries) == 3
+
+
+def test_resolve_cache_expires(solr_server):
+    """Check that expired data pids are queried again."""
+    resolver = DataPidResolver(ttl=0)
+    resolver.resolve(["doi:10.5063/AA"], solr_server.url)
+    resolver.resolve(["doi:10.5063/AA"], solr_server.url)
+    assert len(solr_server.queries) == 2
+
+
+def test_get_data_pids_wrapper(solr_server, default_http_client, default_resolver):
+    """Check that 'get_data_pids' returns the data pids of a single identifier."""
+    data_pids = checks.get_data_pids("doi:10.5063/AA", "urn:node:TEST", solr_server.url)
+    assert data_pids == ["urn:uuid:aa-1", "urn:uuid:aa-2", "urn:uuid:aa-3"]
+    data_pids = checks.get_data_pids_many(
+        ["doi:10.5063/AA", "doi:10.5063/ZZ"], "urn:node:TEST", solr_server.url
+    )
+    assert data_pids["doi:10.5063/ZZ"] == ["urn:uuid:zz-1"]
+    assert len(solr_server.queries) == 2
+
+
+def test_get_data_pids_unavailable(default_http_client, default_resolver):
+    """Check that 'get_data_pids' raises a RuntimeError when the query fails."""
+    with pytest.raises(RuntimeError):
+        checks.get_data_pids("doi:10.5063/AA", "urn:node:TEST", "ftp://127.0.0.1/v2")
+
+
+def test_get_data_pids_error_status(solr_server, default_http_client, default_resolver):
+    """Check that an error status of the member node is raised as a RuntimeError caused by
+    an HTTPError."""
+    solr_server.error_status = 500
+    with pytest.raises(urllib.error.HTTPError):
+        DataPidResolver().resolve(["doi:10.5063/AA"], solr_server.url)
+    with pytest.raises(RuntimeError) as excinfo:
+        checks.get_data_pids_many(["doi:10.5063/AA"], "urn:node:TEST", solr_server.url)
+    assert isinstance(excinfo.value.__cause__, urllib.error.HTTPError)
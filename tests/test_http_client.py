@@ -0,0 +1,197 @@
+"""Test module for the metadig http_client module."""
+
+import multiprocessing
+import socket
+import threading
+import urllib.error
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from metadig import checks
+from metadig.http_client import TIMEOUT_ERRORS, HTTPClient
+
+
+@pytest.fixture(name="client")
+def init_client():
+    """Create an HTTP client that does not wait between retries."""
+    client = HTTPClient(timeout=5, backoff_factor=0)
+    yield client
+    client.close()
+
+
+def test_request_keep_alive(http_server, client):
+    """Check that requests to a host reuse the same connection."""
+    for _ in range(5):
+        response = client.request("GET", f"{http_server.url}/ok")
+        assert response.status == 200
+        assert response.body == b"ok"
+    assert len(http_server.requests) == 5
+    assert len(http_server.client_ports) == 1
+
+
+def test_request_head(http_server, client):
+    """Check that a HEAD request returns the status without a body."""
+    response = client.request("HEAD", f"{http_server.url}/ok")
+    assert response.status == 200
+    assert response.body == b""
+    # The connection is still usable after a response without a body
+    assert client.request("GET", f"{http_server.url}/ok").body == b"ok"
+    assert len(http_server.client_ports) == 1
+
+
+def test_request_follows_redirects(http_server, client):
+    """Check that redirects are followed to the final response."""
+    response = client.request("GET", f"{http_server.url}/redirect")
+    assert response.status == 200
+    assert response.url == f"{http_server.url}/ok"
+    assert http_server.requests == ["/redirect", "/ok"]
+
+
+def test_request_retries_transient_status(http_server, client):
+    """Check that a transient error status is retried."""
+    http_server.flaky_failures = 2
+    response = client.request("GET", f"{http_server.url}/flaky")
+    assert response.status == 200
+    assert http_server.requests == ["/flaky"] * 3
+
+
+def test_request_retries_are_bounded(http_server):
+    """Check that the last response is returned once the retries are exhausted."""
+    http_server.flaky_failures = 10
+    client = HTTPClient(max_retries=1, backoff_factor=0)
+    response = client.request("GET", f"{http_server.url}/flaky")
+    assert response.status == 503
+    assert len(http_server.requests) == 2
+    with pytest.raises(urllib.error.HTTPError):
+        response.raise_for_status()
+
+
+def test_request_error_status(http_server, client):
+    """Check that error statuses are returned and raised as an HTTPError."""
+    response = client.request("GET", f"{http_server.url}/missing")
+    assert response.status == 404
+    assert len(http_server.requests) == 1
+    with pytest.raises(urllib.error.HTTPError) as excinfo:
+        response.raise_for_status()
+    assert excinfo.value.code == 404
+
+
+def test_request_connection_refused(http_server, client):
+    """Check that a server that cannot be reached raises a URLError."""
+    url = f"{http_server.url}/ok"
+    http_server.shutdown()
+    http_server.server_close()
+    with pytest.raises(urllib.error.URLError):
+        client.request("GET", url)
+
+
+def test_request_timeout_not_retried():
+    """Check that a request to a server that does not respond is not retried."""
+    connections = []
+    with socket.socket() as server:
+        # The server accepts connections but never responds
+        server.bind(("127.0.0.1", 0))
+        server.listen()
+        server.settimeout(2)
+
+        def accept():
+            try:
+                while True:
+                    connections.append(server.accept()[0])
+            except OSError:
+                pass
+
+        thread = threading.Thread(target=accept, daemon=True)
+        thread.start()
+        client = HTTPClient(timeout=0.2, max_retries=2, backoff_factor=0)
+        with pytest.raises(TIMEOUT_ERRORS):
+            client.request("GET", f"http://127.0.0.1:{server.getsockname()[1]}/")
+        assert len(connections) == 1
+    for conn in connections:
+        conn.close()
+
+
+def request_ok(client, url):
+    """Request a URL from a forked process, exiting with an error status on failure."""
+    if client.request("GET", url, timeout=2).body != b"ok":
+        raise RuntimeError(f"Unexpected response from {url}")
+
+
+def test_request_after_fork(http_server, client):
+    """Check that forked processes do not share the pooled connections of their parent."""
+    url = f"{http_server.url}/ok"
+    assert client.request("GET", url).status == 200
+    context = multiprocessing.get_context("fork")
+    processes = [
+        context.Process(target=request_ok, args=(client, url)) for _ in range(2)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    assert [process.exitcode for process in processes] == [0, 0]
+    # The parent's connection is still usable, and each child opened its own
+    assert client.request("GET", url).status == 200
+    assert len(http_server.client_ports) == 3
+
+
+def clear_proxy_environment(monkeypatch):
+    """Remove the proxy settings of the test environment."""
+    for name in ("http_proxy", "https_proxy", "no_proxy", "all_proxy"):
+        monkeypatch.delenv(name, raising=False)
+        monkeypatch.delenv(name.upper(), raising=False)
+
+
+def test_request_through_proxy(http_server, monkeypatch):
+    """Check that http requests are sent to the proxy configured in the environment."""
+    clear_proxy_environment(monkeypatch)
+    monkeypatch.setenv("http_proxy", http_server.url)
+    client = HTTPClient(timeout=5, backoff_factor=0)
+    response = client.request("GET", "http://metadig.invalid/ok")
+    client.close()
+    assert response.status == 200
+    assert http_server.requests == ["http://metadig.invalid/ok"]
+
+
+def test_request_bypasses_proxy(http_server, monkeypatch):
+    """Check that hosts listed in 'no_proxy' are requested directly."""
+    clear_proxy_environment(monkeypatch)
+    monkeypatch.setenv("http_proxy", "http://127.0.0.1:9")
+    monkeypatch.setenv("no_proxy", "127.0.0.1")
+    client = HTTPClient(timeout=5, backoff_factor=0)
+    response = client.request("GET", f"{http_server.url}/ok")
+    client.close()
+    assert response.status == 200
+    assert http_server.requests == ["/ok"]
+
+
+def test_request_unsupported_url(client):
+    """Check that a URL that is not http(s) raises a URLError."""
+    with pytest.raises(urllib.error.URLError):
+        client.request("GET", "ftp://example.com/file.txt")
+
+
+def test_request_per_host_limit(http_server):
+    """Check that the number of concurrent requests to a host is limited."""
+    client = HTTPClient(max_connections_per_host=2)
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        statuses = list(
+            executor.map(
+                lambda _: client.request("GET", f"{http_server.url}/slow").status,
+                range(6),
+            )
+        )
+    client.close()
+    assert statuses == [200] * 6
+    assert http_server.max_in_flight <= 2
+    assert len(http_server.client_ports) <= 2
+
+
+def test_is_resolvable_uses_client(http_server, default_http_client):
+    """Check that 'isResolvable' resolves URLs through the pooled client."""
+    resolvable, msg = checks.isResolvable(f"{http_server.url}/redirect")
+    assert resolvable is True
+    assert "status 200" in msg
+    resolvable, msg = checks.isResolvable(f"{http_server.url}/missing")
+    assert resolvable is False
+    assert "Not Found" in msg
+    assert len(http_server.client_ports) == 1
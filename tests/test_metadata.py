@@ -1,5 +1,13 @@
 """Test module for 'metadata' module"""
 
+import codecs
+import hashlib
+import io
+import math
+import mmap
+import os
+import pandas
+import pytest
 from metadig import metadata
 from metadig import StoreManager
 
@@ -14,6 +22,48 @@ def test_read_sysmeta_element(storemanager_props, init_hashstore_with_test_data)
     assert fid == "text/csv"
 
 
+def test_parse_sysmeta(storemanager_props, init_hashstore_with_test_data):
+    """Confirm that 'parse_sysmeta' reads the commonly used fields."""
+    assert init_hashstore_with_test_data
+    manager = StoreManager(storemanager_props)
+    _, sys = manager.get_object("test-pid")
+
+    sysmeta = metadata.parse_sysmeta(sys)
+    assert sysmeta == metadata.SystemMetadata(
+        identifier="test-pid",
+        format_id="text/csv",
+        size=18934,
+        checksum="793852a27f007fa0e28f670e8630108d21c8d545",
+        checksum_algorithm="SHA-1",
+        file_name="test-data.csv",
+    )
+    assert metadata.parse_sysmeta(sys) == sysmeta
+
+
+def test_parse_sysmeta_stops_early():
+    """Confirm that 'parse_sysmeta' stops reading once all the fields are found, and that
+    missing fields are None."""
+    sysmeta = metadata.parse_sysmeta(
+        io.BytesIO(
+            b"<systemMetadata><identifier>pid</identifier><formatId>text/csv</formatId>"
+            + b"<size>3</size><checksum algorithm='MD5'>abc</checksum>"
+            + b"<replica><fileName>not-a-field</fileName></replica>"
+            + b"<fileName>data.csv</fileName><unclosed>"
+        )
+    )
+    assert sysmeta.file_name == "data.csv"
+    assert sysmeta.checksum_algorithm == "MD5"
+
+    sysmeta = metadata.parse_sysmeta(
+        io.BytesIO(b"<systemMetadata><identifier>pid</identifier></systemMetadata>")
+    )
+    assert sysmeta.identifier == "pid"
+    assert sysmeta.file_name is None and sysmeta.size is None
+
+    with pytest.raises(ValueError):
+        metadata.parse_sysmeta(io.BytesIO(b"<systemMetadata><identifier>"))
+
+
 def test_find_entity():
     """Test 'find_eml_entity' is able to find the expected entity."""
     doc = """<?xml version="1.0" encoding="UTF-8"?>
@@ -265,6 +315,52 @@ def test_find_duplicate_column_content_found(
     assert len(dupes) == 2
 
 
+def test_find_duplicate_column_content_matches_column_hashes():
+    """Confirm that 'find_duplicate_column_content' reports each duplicate column with its
+    first original column and the hash of its values."""
+    df = pandas.DataFrame(
+        {
+            "a": [1, 2, 3, 4],
+            "b": [4, 3, 2, 1],
+            "c": [1, 2, 3, 4],
+            "d": ["x", None, "z", "x"],
+            "e": [1.0, 2.0, 3.0, 4.0],
+            "f": ["x", None, "z", "x"],
+            "g": [1, 2, 3, 4],
+        }
+    )
+
+    def hash_series(series):
+        return hashlib.md5(
+            pandas.util.hash_pandas_object(series, index=False).values
+        ).hexdigest()
+
+    assert metadata.find_duplicate_column_content(df) == [
+        ("c", "a", hash_series(df["c"])),
+        ("f", "d", hash_series(df["f"])),
+        ("g", "a", hash_series(df["g"])),
+    ]
+
+
+def test_find_duplicate_column_content_hash_collision(monkeypatch):
+    """Confirm that columns whose hashes collide are compared by their values."""
+
+    class CollidingHash:
+        """Stand-in for an md5 hash that is the same for any content."""
+
+        def __init__(self, content):
+            self.content = content
+
+        def hexdigest(self):
+            return "0" * 32
+
+    monkeypatch.setattr(metadata.hashlib, "md5", CollidingHash)
+    # Columns with the same type, number of missing values and set of values
+    df = pandas.DataFrame({"a": [1, 2, 3], "b": [3, 2, 1], "c": [3, 2, 1]})
+
+    assert metadata.find_duplicate_column_content(df) == [("c", "b", "0" * 32)]
+
+
 def test_find_duplicate_column_names_none(
     storemanager_props, init_hashstore_with_test_data
 ):
@@ -341,6 +437,79 @@ def test_find_duplicate_rows_found(storemanager_props, init_hashstore_with_test_
     assert dupe_rows_found is not None
 
 
+def test_find_duplicate_row_groups():
+    """Confirm that 'find_duplicate_row_groups' returns the indices and groups of the
+    duplicate rows, and a bounded sample of the repeated rows."""
+    df = pandas.DataFrame(
+        {"a": [1, 2, 1, 3, 2, 1, 4], "b": ["x", "y", "x", "z", "y", "x", "w"]}
+    )
+
+    duplicate_rows = metadata.find_duplicate_row_groups(df, sample_size=2)
+    assert list(duplicate_rows.row_indices) == [0, 1, 2, 4, 5]
+    assert list(duplicate_rows.group_ids) == [0, 1, 0, 1, 0]
+    assert duplicate_rows.num_groups == 2
+    assert duplicate_rows.num_duplicate_rows == 3
+    assert list(duplicate_rows.sample.index) == [2, 4]
+
+    assert metadata.find_duplicate_row_groups(df.drop_duplicates()) is None
+
+
+def test_find_duplicate_row_groups_in_chunks(
+    storemanager_props, init_hashstore_with_test_data
+):
+    """Confirm that duplicate rows found across chunks match the ones found in the whole
+    data frame."""
+    assert init_hashstore_with_test_data
+    manager = StoreManager(storemanager_props)
+    data_object = metadata.DataObject(manager, "test-pid-duprows")
+    df, _ = metadata.read_csv_with_metadata(
+        data_object.raw.decode("utf-8", errors="replace"), ",", 0
+    )
+    chunks, error = data_object.read_csv_chunks(",", 0, chunksize=2)
+    assert error is None
+
+    duplicate_rows = metadata.find_duplicate_row_groups_in_chunks(
+        chunks, sample_size=None
+    )
+    duplicated = df.duplicated(keep=False)
+    assert list(duplicate_rows.row_indices) == list(df.index[duplicated])
+    assert duplicate_rows.sample.astype(str).equals(
+        df[df.duplicated(keep="first")].astype(str)
+    )
+    assert duplicate_rows.num_duplicate_rows == len(duplicate_rows.sample)
+
+
+def test_duplicate_row_groups_merges_hashes_linearly(monkeypatch):
+    """Confirm that the hashes of the rows added so far are merged a logarithmic number of
+    times, rather than once for every chunk."""
+    merged_sizes = []
+    # pylint: disable=W0212
+    merge_sorted_hashes = metadata._merge_sorted_hashes
+
+    def counting_merge_sorted_hashes(*hashes):
+        merged_sizes.append(sum(len(chunk_hashes) for chunk_hashes in hashes))
+        return merge_sorted_hashes(*hashes)
+
+    monkeypatch.setattr(metadata, "_merge_sorted_hashes", counting_merge_sorted_hashes)
+    num_chunks, chunk_rows = 256, 64
+    duplicate_rows = metadata.DuplicateRowGroups()
+    for chunk_index in range(num_chunks):
+        start = chunk_index * chunk_rows
+        duplicate_rows.update(
+            pandas.DataFrame(
+                {"a": range(start, start + chunk_rows)},
+                index=range(start, start + chunk_rows),
+            )
+        )
+    duplicate_rows.update(pandas.DataFrame({"a": [5]}, index=[num_chunks * chunk_rows]))
+
+    num_rows = num_chunks * chunk_rows
+    assert sum(merged_sizes) <= num_rows * (math.log2(num_chunks) + 2)
+    assert list(duplicate_rows.row_indices) == [5, num_rows]
+    assert list(duplicate_rows.sample["a"]) == [5]
+    assert duplicate_rows.sample_size == metadata.DUPLICATE_ROW_SAMPLE_SIZE
+
+
 def test_find_number_of_columns(storemanager_props, init_hashstore_with_test_data):
     """Confirm that 'find_number_of_columns' counts columns successfully."""
     assert init_hashstore_with_test_data
@@ -358,6 +527,260 @@ def test_find_number_of_columns(storemanager_props, init_hashstore_with_test_dat
     assert num_of_cols == 9
 
 
+def test_read_csv_with_metadata_sources(
+    storemanager_props, init_hashstore_with_test_data, tmp_path
+):
+    """Test that bytes, binary streams and paths are read like the decoded text."""
+    assert init_hashstore_with_test_data
+    manager = StoreManager(storemanager_props)
+
+    obj, _ = manager.get_object("test-pid-utf-8-decode-errors")
+    d_read = obj.read()
+    obj.close()
+    csv_path = tmp_path / "data.csv"
+    csv_path.write_bytes(d_read)
+    df, error = metadata.read_csv_with_metadata(
+        d_read.decode("latin-1"), ",", 1, "latin-1"
+    )
+    assert error is None
+
+    with open(csv_path, "rb") as stream:
+        for source in (d_read, stream, csv_path):
+            source_df, error = metadata.read_csv_with_metadata(
+                source, ",", 1, "latin-1"
+            )
+            assert error is None
+            assert source_df.equals(df)
+
+    # Without an encoding, the bytes that are not utf-8 are replaced
+    source_df, error = metadata.read_csv_with_metadata(d_read, ",", 1)
+    assert error is None
+    assert list(source_df.columns)[1:] == list(df.columns)[1:]
+    assert "\ufffd" in source_df.columns[0]
+
+
+def test_read_csv_with_metadata_pyarrow(tmp_path):
+    """Test that a csv can be read with the pyarrow engine."""
+    pytest.importorskip("pyarrow")
+    csv_path = tmp_path / "data.csv"
+    csv_path.write_bytes(b"a;b\n1;x\n2;y\n")
+
+    df, error = metadata.read_csv_with_metadata(csv_path, ";", 1, engine="pyarrow")
+    assert error is None
+    assert list(df.columns) == ["a", "b"]
+    assert list(df["a"]) == [1, 2]
+
+
+def test_data_object_read_csv_local_file(
+    storemanager_props, init_hashstore_with_test_data
+):
+    """Confirm that the table of a data object in a local store is parsed without loading
+    its content."""
+    assert init_hashstore_with_test_data
+    manager = StoreManager(storemanager_props)
+    data_object = metadata.DataObject(manager, "test-pid-3skip")
+    assert os.path.isfile(data_object.local_path)
+
+    df, error = data_object.read_csv(",", 4)
+    assert error is None
+    assert list(df.columns)[0] == "Year"
+    assert data_object.encoding == "utf-8"
+    # The table is held by the data object, but not the content it was parsed from
+    table_size = df.memory_usage(deep=True).sum()
+    assert table_size < data_object.nbytes
+    assert data_object.nbytes < table_size + os.path.getsize(data_object.local_path)
+
+
+def test_read_csv_chunks_with_metadata(
+    storemanager_props, init_hashstore_with_test_data
+):
+    """Test that a text delimited document can be read in chunks from a store stream, with
+    the header line handled as in 'read_csv_with_metadata'."""
+    assert init_hashstore_with_test_data
+    manager = StoreManager(storemanager_props)
+
+    pid = "test-pid-3skip"
+    obj, _ = manager.get_object(pid)
+    d_read = obj.read().decode("utf-8", errors="replace")
+    df, _ = metadata.read_csv_with_metadata(d_read, ",", 4)
+
+    obj, _ = manager.get_object(pid)
+    with obj:
+        chunks, error = metadata.read_csv_chunks_with_metadata(obj, ",", 4, chunksize=2)
+        assert error is None
+        chunks = list(chunks)
+    assert all(len(chunk) <= 2 for chunk in chunks)
+    assert list(chunks[0].columns) == list(df.columns)
+    assert pandas.concat(chunks).astype(str).equals(df.astype(str))
+
+
+def test_read_csv_chunks_with_metadata_error(tmp_path):
+    """Test that errors in the header of a chunked read are returned."""
+    csv_path = tmp_path / "empty.csv"
+    csv_path.write_bytes(b"")
+
+    chunks, error = metadata.read_csv_chunks_with_metadata(str(csv_path), ",", 1)
+    assert chunks is None
+    assert error.startswith("Error reading CSV:")
+
+    chunks, error = metadata.read_csv_chunks_with_metadata(str(csv_path), ",", "1")
+    assert chunks is None
+    assert "cannot determine 'header_line'" in error
+
+
+@pytest.mark.parametrize(
+    "pid, header_line",
+    [("test-pid", 0), ("test-pid-3skip", 4), ("test-pid-4dupcols", 1)],
+)
+def test_read_csv_header_with_metadata(
+    storemanager_props, init_hashstore_with_test_data, pid, header_line
+):
+    """Test that only the header of a text delimited document is read, with the same column
+    names as when the whole document is read."""
+    assert init_hashstore_with_test_data
+    manager = StoreManager(storemanager_props)
+
+    obj, _ = manager.get_object(pid)
+    d_read = obj.read()
+    df, _ = metadata.read_csv_with_metadata(
+        d_read.decode("utf-8", errors="replace"), ",", header_line
+    )
+
+    class CountingStream(io.BytesIO):
+        """Stream that counts the bytes read from it."""
+
+        bytes_read = 0
+
+        def read(self, size=-1):
+            data = super().read(size)
+            self.bytes_read += len(data)
+            return data
+
+    stream = CountingStream(d_read)
+    columns, error = metadata.read_csv_header_with_metadata(
+        stream, ",", header_line, read_size=8
+    )
+    assert error is None
+    assert columns == list(df.columns)
+    assert stream.bytes_read < len(d_read)
+
+
+def test_read_csv_header_with_metadata_sources(tmp_path):
+    """Test that the header is read from decoded content, bytes and paths, with the same
+    meaning of str as 'read_csv_with_metadata'."""
+    csv_path = tmp_path / "data.csv"
+    csv_path.write_bytes("Année,b\n1,2\n".encode("latin-1"))
+
+    expected = (["Année", "b"], None)
+    assert metadata.read_csv_header_with_metadata("Année,b\n1,2\n", ",", 1) == expected
+    assert (
+        metadata.read_csv_header_with_metadata(csv_path, ",", 1, "latin-1") == expected
+    )
+    assert (
+        metadata.read_csv_header_with_metadata(csv_path.read_bytes(), ",", 1, "latin-1")
+        == expected
+    )
+
+
+def test_read_csv_header_with_metadata_error():
+    """Test that errors reading the header are returned."""
+    columns, error = metadata.read_csv_header_with_metadata(b"", ",", 0)
+    assert columns is None
+    assert error.startswith("Error reading CSV:")
+
+    columns, error = metadata.read_csv_header_with_metadata(b"a,b\n", ",", "1")
+    assert columns is None
+    assert "cannot determine 'header_line'" in error
+
+    # A header without rows is read to the end of the content
+    assert metadata.read_csv_header_with_metadata(b"a;b", ";", 1) == (["a", "b"], None)
+
+
+def test_data_object_read_csv_header(storemanager_props, init_hashstore_with_test_data):
+    """Confirm that the header of a data object is read without loading its content."""
+    assert init_hashstore_with_test_data
+    manager = StoreManager(storemanager_props)
+    data_object = metadata.DataObject(manager, "test-pid-3skip")
+
+    columns, error = data_object.read_csv_header(",", 4)
+    assert error is None
+    assert columns[0] == "Year"
+    # Only the column names are held by the data object
+    assert 0 < data_object.nbytes < os.path.getsize(data_object.local_path)
+    assert data_object.read_csv_header(",", 4)[0] is columns
+
+
+@pytest.mark.parametrize(
+    "pid",
+    ["test-pid", "test-pid-4dupcols", "test-pid-dupcols-names", "test-pid-duprows"],
+)
+def test_find_in_chunks_matches_data_frame(
+    storemanager_props, init_hashstore_with_test_data, pid
+):
+    """Confirm that the chunk-aware helpers find the same duplicates and number of columns
+    as the data frame helpers."""
+    assert init_hashstore_with_test_data
+    manager = StoreManager(storemanager_props)
+    data_object = metadata.DataObject(manager, pid)
+    df, _ = metadata.read_csv_with_metadata(
+        data_object.raw.decode("utf-8", errors="replace"), ",", 0
+    )
+
+    def read_chunks():
+        chunks, error = data_object.read_csv_chunks(",", 0, chunksize=3)
+        assert error is None
+        return chunks
+
+    # Column types are inferred per chunk, so only the duplicate pairs are compared
+    assert [
+        (dup, orig)
+        for dup, orig, _ in metadata.find_duplicate_column_content_in_chunks(
+            read_chunks()
+        )
+    ] == [(dup, orig) for dup, orig, _ in metadata.find_duplicate_column_content(df)]
+    assert metadata.find_number_of_columns_in_chunks(
+        read_chunks()
+    ) == metadata.find_number_of_columns(df)
+
+    duplicate_rows = metadata.find_duplicate_rows_in_chunks(read_chunks())
+    if metadata.find_duplicate_rows(df) is None:
+        assert duplicate_rows is None
+    else:
+        assert list(duplicate_rows.index) == list(df.index[df.duplicated(keep="first")])
+
+
+def test_find_duplicate_rows_in_chunks_bounded(monkeypatch):
+    """Confirm that 'find_duplicate_rows_in_chunks' keeps a bounded sample of the duplicate
+    rows, and that its cost grows linearly with the number of chunks."""
+    chunks = [pandas.DataFrame({"a": [1] * 100}) for _ in range(50)]
+    duplicate_rows = metadata.find_duplicate_rows_in_chunks(chunks, sample_size=3)
+    assert list(duplicate_rows["a"]) == [1, 1, 1]
+    assert len(metadata.find_duplicate_rows_in_chunks(chunks)) == (
+        metadata.DUPLICATE_ROW_SAMPLE_SIZE
+    )
+
+    merged_sizes = []
+    # pylint: disable=W0212
+    merge_sorted_hashes = metadata._merge_sorted_hashes
+
+    def counting_merge_sorted_hashes(*hashes):
+        merged_sizes.append(sum(len(chunk_hashes) for chunk_hashes in hashes))
+        return merge_sorted_hashes(*hashes)
+
+    monkeypatch.setattr(metadata, "_merge_sorted_hashes", counting_merge_sorted_hashes)
+
+    def merged_rows_per_row(num_chunks, chunk_rows=32):
+        merged_sizes.clear()
+        metadata.find_duplicate_rows_in_chunks(
+            pandas.DataFrame({"a": range(start, start + chunk_rows)})
+            for start in range(0, num_chunks * chunk_rows, chunk_rows)
+        )
+        return sum(merged_sizes) / (num_chunks * chunk_rows)
+
+    # Sixteen times as many chunks is far less than sixteen times as much work per row
+    assert merged_rows_per_row(1024) < 2 * merged_rows_per_row(64)
+
+
 def test_detect_text_encoding_ascii(storemanager_props, init_hashstore_with_test_data):
     """Confirm that 'detect_text_encoding' reads the bytes as ascii."""
     assert init_hashstore_with_test_data
@@ -381,7 +804,7 @@ def test_detect_text_encoding_utf8(storemanager_props, init_hashstore_with_test_
     bytes_read = obj.read()
 
     enc_type, msg = metadata.detect_text_encoding(bytes_read)
-    assert enc_type == "Windows-1252"
+    assert enc_type == "utf-8"
     assert msg is None
 
 
@@ -398,6 +821,100 @@ def test_detect_text_encoding_other(storemanager_props, init_hashstore_with_test
     assert msg is None
 
 
+class RecordingDetector:
+    """Stand-in for chardet's incremental detector that records the bytes it is fed."""
+
+    def __init__(self):
+        self.fed = b""
+        self.done = False
+
+    def feed(self, chunk):
+        self.fed += bytes(chunk)
+
+    def close(self):
+        return {"encoding": "utf-8", "confidence": 0.5}
+
+
+def test_detect_text_encoding_sample_size(monkeypatch):
+    """Confirm that 'detect_text_encoding' only feeds the sample to the detector, and reports
+    decoding errors found anywhere in the content."""
+    detectors = []
+
+    def make_detector():
+        detectors.append(RecordingDetector())
+        return detectors[-1]
+
+    monkeypatch.setattr(metadata.chardet, "UniversalDetector", make_detector)
+    monkeypatch.setattr(metadata, "ENCODING_CHUNK_SIZE", 16)
+    raw = b"a" * 100 + b"\xff" + b"b" * 100
+
+    enc_type, msg = metadata.detect_text_encoding(raw, sample_size=40)
+    assert detectors[0].fed == raw[:40]
+    assert enc_type == "utf-8"
+    assert msg == (
+        "A decoding error has been detected while attempting to decode the document"
+        + " with detected encoding: utf-8. Confidence level of encoding type: 50.0%."
+        + " Error Details: Error at byte 100: b'\\xff'"
+    )
+
+    metadata.detect_text_encoding(raw, sample_size=None)
+    assert detectors[1].fed == raw
+
+
+def test_detect_text_encoding_skips_detector(monkeypatch):
+    """Confirm that 'detect_text_encoding' does not run the detector for ascii or utf-8."""
+    monkeypatch.setattr(metadata.chardet, "UniversalDetector", None)
+
+    assert metadata.detect_text_encoding(b"plain text") == ("ascii", None)
+    assert metadata.detect_text_encoding("d\u00e9j\u00e0 vu".encode("utf-8")) == (
+        "utf-8",
+        None,
+    )
+
+
+def test_detect_text_encoding_utf8_bom(monkeypatch):
+    """Confirm that 'detect_text_encoding' reports utf-8 content with a byte order mark as
+    'utf-8-sig', so that decoding it drops the byte order mark."""
+    monkeypatch.setattr(metadata.chardet, "UniversalDetector", None)
+    raw = codecs.BOM_UTF8 + "col_a,col_\u00e9\n1,2\n".encode("utf-8")
+
+    enc_type, msg = metadata.detect_text_encoding(raw)
+    assert (enc_type, msg) == ("utf-8-sig", None)
+    assert raw.decode(enc_type).startswith("col_a")
+    assert metadata.detect_text_encoding(memoryview(raw)) == ("utf-8-sig", None)
+    assert metadata.detect_text_encoding(codecs.BOM_UTF8 + b"plain") == (
+        "utf-8-sig",
+        None,
+    )
+
+
+def test_detect_text_encoding_memory_map(tmp_path):
+    """Confirm that 'detect_text_encoding' reads buffers other than bytes."""
+    for content, expected in (
+        (b"plain text", ("ascii", None)),
+        ("d\u00e9j\u00e0 vu".encode("utf-8"), ("utf-8", None)),
+    ):
+        path = tmp_path / "content.txt"
+        path.write_bytes(content)
+        with open(path, "rb") as f, mmap.mmap(
+            f.fileno(), 0, access=mmap.ACCESS_READ
+        ) as content_map:
+            assert metadata.detect_text_encoding(content_map) == expected
+
+
+def test_find_decode_error(monkeypatch):
+    """Confirm that 'find_decode_error' reports offsets in the whole content when the
+    undecodable sequence spans chunks."""
+    monkeypatch.setattr(metadata, "ENCODING_CHUNK_SIZE", 4)
+    raw = "abc\u20ac".encode("utf-8") + b"\xe2\x82" + b"xyz"
+
+    assert metadata.find_decode_error("abc\u20acxyz".encode("utf-8"), "utf-8") is None
+    assert metadata.find_decode_error(raw, "utf-8") == (6, 8)
+    with pytest.raises(UnicodeDecodeError) as e:
+        raw.decode("utf-8")
+    assert (e.value.start, e.value.end) == (6, 8)
+
+
 def test_escape_for_markdown():
     """Confirm that special characters are escaped"""
     string_to_escape = "American_Black_Duck_x_Mallard_.hybrid."
@@ -433,3 +950,135 @@ def test_find_entity_index_multi_pid():
 
     result = metadata.find_entity_index(fname, pid, entity_names, ids)
     assert result == 1
+
+
+def test_eml_entity_index():
+    """Confirm that 'EMLEntityIndex' finds the first entity matching the id, entityName or
+    objectName, and that the index of a document is memoized."""
+    doc = """<eml:eml xmlns:eml="https://eml.ecoinformatics.org/eml-2.2.0"><dataset>
+      <dataTable id="urn-uuid-1"><entityName>first.csv</entityName></dataTable>
+      <dataTable><entityName>second.csv</entityName>
+        <physical><objectName>second-object.csv</objectName></physical></dataTable>
+      <dataTable id="urn-uuid-3"><entityName>second.csv</entityName></dataTable>
+      <otherEntity id="urn-uuid-4"><entityName>other.pdf</entityName></otherEntity>
+    </dataset></eml:eml>"""
+
+    index = metadata.get_eml_entity_index(doc)
+    assert metadata.get_eml_entity_index(doc) is index
+    assert len(index.entities) == 4
+    assert index.find("urn:uuid:1", "second.csv") is index.entities[0]
+    assert index.find("urn:uuid:3", "second.csv") is index.entities[1]
+    assert index.find(["urn:uuid:9"], ["second-object.csv"]) is index.entities[1]
+    assert index.find("urn:uuid:4", "missing.csv") is index.entities[3]
+    assert index.find("urn:uuid:9", "missing.csv") is None
+    assert metadata.find_eml_entity(doc, "urn:uuid:3", "x") is index.entities[2]
+
+
+def test_entity_list_index():
+    """Confirm that 'EntityListIndex' finds the first entity by filename, then by pid."""
+    entity_names = ["data.csv", "other.csv", "data.csv"]
+    ids = ["urn-uuid-1", "urn-uuid-2", "urn-uuid-2"]
+
+    index = metadata.EntityListIndex(entity_names, ids)
+    assert index.find_index("data.csv", "urn:uuid:2") == 0
+    assert index.find_index("final.csv", "urn:uuid:2") == 1
+    assert index.find_index("final.csv", "urn:uuid:3") is None
+    assert (
+        metadata.EntityListIndex("data.csv", "urn-uuid-1").find_index("x", "urn:uuid:1")
+        == 0
+    )
+
+
+def test_get_data_object_memoized(storemanager_props, init_hashstore_with_test_data):
+    """Confirm that a data object's content is read, decoded and parsed only once."""
+    assert init_hashstore_with_test_data
+    metadata.clear_data_object_cache()
+    manager = StoreManager(storemanager_props)
+    get_object_calls = []
+    store_get_object = manager.get_object
+
+    def get_object(pid):
+        get_object_calls.append(pid)
+        return store_get_object(pid)
+
+    manager.get_object = get_object
+
+    data_object = metadata.get_data_object(manager, "test-pid")
+    assert data_object.file_name == "test-data.csv"
+    assert data_object.format_id == "text/csv"
+    assert data_object.encoding == "ascii"
+    assert data_object.encoding_error is None
+    assert data_object.text.startswith("Year,Site,")
+    df, error = data_object.read_csv(",", 1)
+    assert error is None
+    assert list(df.columns)[:2] == ["Year", "Site"]
+
+    assert metadata.get_data_object(manager, "test-pid") is data_object
+    assert data_object.system_metadata is data_object.system_metadata
+    assert data_object.read_csv(",", 1)[0] is df
+    # The sysmeta and the content are each retrieved once
+    assert get_object_calls == ["test-pid", "test-pid"]
+
+
+def test_data_object_cache_evicts_least_recently_used(
+    monkeypatch, storemanager_props, init_hashstore_with_test_data
+):
+    """Confirm that the data object cache evicts the least recently used data objects
+    when it exceeds its memory budget."""
+    assert init_hashstore_with_test_data
+    metadata.clear_data_object_cache()
+    manager = StoreManager(storemanager_props)
+    first_data_object = metadata.get_data_object(manager, "test-pid")
+    assert first_data_object.raw
+    # Either data object (with its sysmeta) fits in the budget, but not both
+    testdata_dir = os.path.join(os.path.dirname(__file__), "testdata")
+    monkeypatch.setattr(
+        metadata,
+        "DATA_OBJECT_CACHE_MAX_BYTES",
+        max(
+            os.path.getsize(os.path.join(testdata_dir, "test-data.csv")),
+            os.path.getsize(os.path.join(testdata_dir, "test-data-2_3rowstoskip.csv")),
+        )
+        + os.path.getsize(os.path.join(testdata_dir, "test-pid.xml")),
+    )
+
+    second_data_object = metadata.get_data_object(manager, "test-pid-3skip")
+    assert second_data_object.raw
+    assert metadata.get_data_object(manager, "test-pid-3skip") is second_data_object
+    assert metadata.get_data_object(manager, "test-pid") is not first_data_object
+
+
+def test_data_object_cache_counts_sysmeta_and_headers(
+    storemanager_props, init_hashstore_with_test_data
+):
+    """Confirm that the sysmeta, encoding and headers of a data object count toward the
+    data object cache's memory budget."""
+    assert init_hashstore_with_test_data
+    metadata.clear_data_object_cache()
+    manager = StoreManager(storemanager_props)
+    data_object = metadata.get_data_object(manager, "test-pid-3skip")
+
+    assert data_object.format_id == "text/csv"
+    sysmeta_nbytes = data_object.nbytes
+    assert sysmeta_nbytes > len(data_object.sysmeta)
+    assert data_object.read_csv_header(",", 4)[0][0] == "Year"
+    assert data_object.nbytes > sysmeta_nbytes
+    # pylint: disable=W0212
+    assert metadata._data_object_cache_bytes == data_object.nbytes
+
+
+def test_data_object_cache_max_entries(
+    monkeypatch, storemanager_props, init_hashstore_with_test_data
+):
+    """Confirm that the data object cache evicts the least recently used data objects
+    when it holds too many of them, even if they hold no content."""
+    assert init_hashstore_with_test_data
+    metadata.clear_data_object_cache()
+    monkeypatch.setattr(metadata, "DATA_OBJECT_CACHE_MAX_ENTRIES", 2)
+    manager = StoreManager(storemanager_props)
+    first_data_object = metadata.get_data_object(manager, "test-pid")
+    second_data_object = metadata.get_data_object(manager, "test-pid-3skip")
+    metadata.get_data_object(manager, "test-pid-2")
+
+    assert metadata.get_data_object(manager, "test-pid-3skip") is second_data_object
+    assert metadata.get_data_object(manager, "test-pid") is not first_data_object
@@ -0,0 +1,249 @@
+"""Test module for the metadig node_registry module."""
+
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from metadig import checks
+from metadig import node_registry
+from metadig.node_registry import NodeRegistry, parse_node_list
+
+NODE_LIST_XML = b"""<?xml version="1.0" encoding="UTF-8"?>
+<ns2:nodeList xmlns:ns2="http://ns.dataone.org/service/types/v2.0">
+  <node replicate="true" synchronize="true" type="mn" state="up">
+    <identifier>urn:node:ARCTIC</identifier>
+    <name>Arctic Data Center</name>
+    <baseURL>https://arcticdata.io/metacat/d1/mn</baseURL>
+  </node>
+  <node replicate="true" synchronize="true" type="mn" state="up">
+    <identifier>urn:node:KNB</identifier>
+    <name>KNB</name>
+    <baseURL>https://knb.ecoinformatics.org/knb/d1/mn</baseURL>
+  </node>
+</ns2:nodeList>
+"""
+NODE_LIST_ETAG = '"node-list-1"'
+
+
+class NodeListHandler(BaseHTTPRequestHandler):
+    """Serves the test node list, honouring 'If-None-Match'."""
+
+    def do_GET(self):  # pylint: disable=C0103
+        """Respond with the node list, or 304 if the client already has it."""
+        server = self.server
+        server.requests.append(dict(self.headers))
+        if server.fail:
+            self.send_response(500)
+            self.end_headers()
+            return
+        if self.headers.get("If-None-Match") == NODE_LIST_ETAG:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/xml")
+        self.send_header("ETag", NODE_LIST_ETAG)
+        self.send_header("Content-Length", str(len(NODE_LIST_XML)))
+        self.end_headers()
+        self.wfile.write(NODE_LIST_XML)
+
+    def log_message(self, format, *args):  # pylint: disable=W0622
+        """Keep the test output quiet."""
+
+
+@pytest.fixture(name="cn_server")
+def init_cn_server():
+    """Run a local stand-in for the CN node list endpoint."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), NodeListHandler)
+    server.requests = []
+    server.fail = False
+    server.url = f"http://127.0.0.1:{server.server_address[1]}/cn/v2/node"
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(name="default_registry")
+def init_default_registry():
+    """Restore the process-wide registry after a test replaces it."""
+    # pylint: disable=W0212
+    previous_registry = node_registry._default_registry
+    yield
+    node_registry._default_registry = previous_registry
+
+
+def test_parse_node_list():
+    """Check that the node list is parsed into base URLs keyed by node identifier."""
+    assert parse_node_list(NODE_LIST_XML) == {
+        "urn:node:ARCTIC": "https://arcticdata.io/metacat/d1/mn",
+        "urn:node:KNB": "https://knb.ecoinformatics.org/knb/d1/mn",
+    }
+
+
+def test_get_base_url_fetches_node_list_once(cn_server, tmp_path):
+    """Check that the node list is fetched once and then looked up in memory."""
+    snapshot_path = tmp_path / "member_nodes.json"
+    registry = NodeRegistry(str(snapshot_path), node_list_url=cn_server.url)
+    assert (
+        registry.get_base_url("urn:node:ARCTIC")
+        == "https://arcticdata.io/metacat/d1/mn"
+    )
+    assert (
+        registry.get_base_url("urn:node:KNB")
+        == "https://knb.ecoinformatics.org/knb/d1/mn"
+    )
+    assert len(cn_server.requests) == 1
+
+    with open(snapshot_path, "r", encoding="utf-8") as snapshot_file:
+        snapshot = json.load(snapshot_file)
+    assert snapshot["etag"] == NODE_LIST_ETAG
+    assert snapshot["base_urls"]["urn:node:ARCTIC"].startswith("https://arcticdata.io")
+
+
+def test_get_base_url_reuses_snapshot(cn_server, tmp_path):
+    """Check that a fresh snapshot written by another registry is used without a request."""
+    snapshot_path = str(tmp_path / "member_nodes.json")
+    NodeRegistry(snapshot_path, node_list_url=cn_server.url).get_base_url(
+        "urn:node:ARCTIC"
+    )
+    registry = NodeRegistry(snapshot_path, node_list_url=cn_server.url)
+    assert registry.get_base_url("urn:node:KNB") is not None
+    assert len(cn_server.requests) == 1
+
+
+def test_get_base_url_conditional_refresh(cn_server, tmp_path):
+    """Check that an expired node list is refreshed with a conditional request."""
+    registry = NodeRegistry(
+        str(tmp_path / "member_nodes.json"), ttl=0, node_list_url=cn_server.url
+    )
+    registry.get_base_url("urn:node:ARCTIC")
+    assert (
+        registry.get_base_url("urn:node:ARCTIC")
+        == "https://arcticdata.io/metacat/d1/mn"
+    )
+    assert len(cn_server.requests) == 2
+    assert "If-None-Match" not in cn_server.requests[0]
+    assert cn_server.requests[1]["If-None-Match"] == NODE_LIST_ETAG
+
+
+def test_get_base_url_unknown_node(cn_server):
+    """Check that an unknown node is refreshed at most once per interval."""
+    registry = NodeRegistry(node_list_url=cn_server.url)
+    assert registry.get_base_url("urn:node:DOU") is None
+    assert registry.get_base_url("urn:node:DOU") is None
+    assert len(cn_server.requests) == 1
+
+
+def test_get_base_url_stale_on_failure(cn_server, tmp_path):
+    """Check that a stale node list is used when it cannot be refreshed."""
+    registry = NodeRegistry(
+        str(tmp_path / "member_nodes.json"), ttl=0, node_list_url=cn_server.url
+    )
+    registry.get_base_url("urn:node:ARCTIC")
+    cn_server.fail = True
+    assert (
+        registry.get_base_url("urn:node:ARCTIC")
+        == "https://arcticdata.io/metacat/d1/mn"
+    )
+
+
+def test_get_base_url_stale_retry_interval(cn_server, tmp_path, caplog):
+    """Check that a node list that cannot be refreshed is not requested on every lookup."""
+    registry = NodeRegistry(
+        str(tmp_path / "member_nodes.json"), ttl=0, node_list_url=cn_server.url
+    )
+    registry.get_base_url("urn:node:ARCTIC")
+    cn_server.fail = True
+    for _ in range(5):
+        assert registry.get_base_url("urn:node:KNB") is not None
+    assert len(cn_server.requests) == 2
+    stale_warnings = [
+        record
+        for record in caplog.records
+        if record.name == node_registry.__name__
+        and "stale member node list" in record.getMessage()
+    ]
+    assert [record.levelname for record in stale_warnings] == ["WARNING"]
+
+    # The refresh is tried again once the interval has passed
+    registry.MISS_REFRESH_INTERVAL = 0
+    cn_server.fail = False
+    assert registry.get_base_url("urn:node:KNB") is not None
+    assert len(cn_server.requests) == 3
+
+
+def test_get_base_url_unavailable(cn_server):
+    """Check that an error is raised when there is no node list at all."""
+    cn_server.fail = True
+    registry = NodeRegistry(node_list_url=cn_server.url)
+    with pytest.raises(Exception):
+        registry.get_base_url("urn:node:ARCTIC")
+
+
+def test_get_base_url_offline_xml_snapshot(cn_server, tmp_path):
+    """Check that an offline registry reads a copy of the CN node list."""
+    snapshot_path = tmp_path / "member_nodes.xml"
+    snapshot_path.write_bytes(NODE_LIST_XML)
+    registry = NodeRegistry(
+        str(snapshot_path), ttl=0, offline=True, node_list_url=cn_server.url
+    )
+    assert (
+        registry.get_base_url("urn:node:KNB")
+        == "https://knb.ecoinformatics.org/knb/d1/mn"
+    )
+    assert registry.get_base_url("urn:node:DOU") is None
+    assert len(cn_server.requests) == 0
+    with pytest.raises(RuntimeError):
+        registry.refresh()
+
+
+def test_get_base_url_offline_missing_snapshot(tmp_path):
+    """Check that an offline registry without a snapshot raises a RuntimeError."""
+    registry = NodeRegistry(str(tmp_path / "missing.json"), offline=True)
+    with pytest.raises(RuntimeError):
+        registry.get_base_url("urn:node:ARCTIC")
+    with pytest.raises(ValueError):
+        NodeRegistry(offline=True)
+
+
+def test_get_member_node_url_from_registry(cn_server, tmp_path, default_registry):
+    """Check that get_member_node_url uses the configured node registry."""
+    node_registry.configure_node_registry(
+        str(tmp_path / "member_nodes.json"), node_list_url=cn_server.url
+    )
+    assert (
+        checks.get_member_node_url("urn:node:ARCTIC")
+        == "https://arcticdata.io/metacat/d1/mn/v2"
+    )
+    with pytest.raises(ValueError):
+        checks.get_member_node_url("urn:node:DOU")
+    assert os.path.exists(tmp_path / "member_nodes.json")
+
+
+def test_get_member_node_url_unavailable(tmp_path, default_registry):
+    """Check that get_member_node_url raises a RuntimeError when there is no node list."""
+    node_registry.configure_node_registry(str(tmp_path / "missing.json"), offline=True)
+    with pytest.raises(RuntimeError):
+        checks.get_member_node_url("urn:node:ARCTIC")
+
+
+def test_get_node_registry_snapshot_path(monkeypatch, tmp_path, default_registry):
+    """Check that the default registry reads its snapshot path from the environment
+    variable, and that an empty value keeps the node list in memory only."""
+    monkeypatch.delenv(node_registry.SNAPSHOT_PATH_ENV_VAR, raising=False)
+    assert (
+        node_registry.get_default_snapshot_path() == node_registry.DEFAULT_SNAPSHOT_PATH
+    )
+
+    snapshot_path = str(tmp_path / "member_nodes.json")
+    monkeypatch.setenv(node_registry.SNAPSHOT_PATH_ENV_VAR, snapshot_path)
+    # pylint: disable=W0212
+    node_registry._default_registry = None
+    assert node_registry.get_node_registry().snapshot_path == snapshot_path
+
+    monkeypatch.setenv(node_registry.SNAPSHOT_PATH_ENV_VAR, "")
+    node_registry._default_registry = None
+    assert node_registry.get_node_registry().snapshot_path is None
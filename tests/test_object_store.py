@@ -1,6 +1,7 @@
 """Test module for object_store module"""
 
 import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
 import pytest
 
 from metadig import StoreManager
@@ -52,3 +53,28 @@ def test_object_store_handles_no_object(storemanager_props):
         ObjectNotFoundError, match="Object with identifier not-a-pid not found"
     ):
         _ = manager.get_object("not-a-pid")
+
+
+def test_store_manager_reuses_store(storemanager_props):
+    """Confirm that store managers with equivalent configurations share a store."""
+    StoreManager.clear_cache()
+    manager = StoreManager(storemanager_props)
+    equivalent_props = dict(storemanager_props)
+    equivalent_props["store_depth"] = str(storemanager_props["store_depth"])
+    equivalent_props["store_path"] = storemanager_props["store_path"] + "/"
+
+    assert StoreManager(equivalent_props).store is manager.store
+    StoreManager.clear_cache()
+    assert StoreManager(storemanager_props).store is not manager.store
+
+
+def test_store_manager_cache_is_thread_safe(storemanager_props):
+    """Confirm that store managers created concurrently share a single store."""
+    StoreManager.clear_cache()
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        stores = list(
+            executor.map(
+                lambda _: StoreManager(dict(storemanager_props)).store, range(32)
+            )
+        )
+    assert all(store is stores[0] for store in stores)
@@ -0,0 +1,164 @@
+"""Test module for the metadig resolution_cache module."""
+
+import logging
+import multiprocessing
+import sqlite3
+from metadig import checks
+from metadig import resolution_cache
+from metadig.resolution_cache import (
+    ResolutionCache,
+    configure_resolution_cache,
+    get_default_cache_path,
+    get_resolution_cache,
+    normalize_url,
+)
+
+
+def store_result(cache_path, url, result):
+    """Cache a result from another process."""
+    ResolutionCache(cache_path).set(url, result)
+
+
+def test_normalize_url():
+    """Check that equivalent spellings of a URL have the same key."""
+    assert normalize_url(" HTTPS://Example.org:443/a?b=1#section ") == (
+        "https://example.org/a?b=1"
+    )
+    assert normalize_url("http://example.org") == "http://example.org/"
+    assert normalize_url("http://example.org:8080/A") == "http://example.org:8080/A"
+
+
+def test_get_set(tmp_path):
+    """Check that a cached result is returned for the same and equivalent URLs."""
+    cache = ResolutionCache(str(tmp_path / "cache.sqlite3"))
+    url = "https://example.org/dataset"
+    assert cache.get(url) is None
+    result = (True, f"Successfully resolved the URL {url}: status 200")
+    cache.set(url, result)
+    assert cache.get(url) == result
+    # An equivalent spelling shares the result, with the message of the URL resolved
+    assert cache.get("HTTPS://example.org/dataset#top") == result
+    other_result = (
+        True,
+        "Successfully resolved the URL HTTPS://example.org/dataset#top",
+    )
+    cache.set("HTTPS://example.org/dataset#top", other_result)
+    assert cache.get("HTTPS://example.org/dataset#top") == other_result
+    assert cache.get(url) == result
+    cache.clear()
+    assert cache.get(url) is None
+
+
+def test_separate_ttls(tmp_path):
+    """Check that unresolvable URLs expire separately from resolvable URLs."""
+    cache = ResolutionCache(
+        str(tmp_path / "cache.sqlite3"), positive_ttl=3600, negative_ttl=0
+    )
+    cache.set("https://example.org/ok", (True, "ok"))
+    cache.set("https://example.org/missing", (False, "Not Found"))
+    assert cache.get("https://example.org/ok") == (True, "ok")
+    assert cache.get("https://example.org/missing") is None
+
+
+def test_message_not_rewritten(tmp_path):
+    """Check that a message mentioning the URL within other text is returned unchanged."""
+    cache = ResolutionCache(str(tmp_path / "cache.sqlite3"))
+    url = "https://example.org/a"
+    message = f"Redirected from {url} to {url}/b"
+    cache.set(url, (True, message))
+    assert cache.get("https://EXAMPLE.org/a") == (True, message)
+
+
+def test_prune_interval(tmp_path):
+    """Check that expired results are swept at most once per interval."""
+    cache_path = tmp_path / "cache.sqlite3"
+    cache = ResolutionCache(str(cache_path), positive_ttl=0, negative_ttl=0)
+    cache.set("https://example.org/a", (True, "resolved"))
+    cache.set("https://example.org/b", (True, "resolved"))
+    with sqlite3.connect(cache_path) as conn:
+        urls = [row[0] for row in conn.execute("SELECT url FROM resolutions")]
+    assert urls == ["https://example.org/b"]
+
+
+def test_shared_between_processes(tmp_path):
+    """Check that results cached by another process are visible."""
+    cache_path = str(tmp_path / "cache.sqlite3")
+    cache = ResolutionCache(cache_path)
+    assert cache.get("https://example.org/") is None
+    process = multiprocessing.get_context("spawn").Process(
+        target=store_result,
+        args=(cache_path, "https://example.org/", (True, "resolved")),
+    )
+    process.start()
+    process.join()
+    assert process.exitcode == 0
+    assert cache.get("https://example.org/") == (True, "resolved")
+
+
+def test_unreadable_cache(tmp_path):
+    """Check that a broken cache database is reported and bypassed."""
+    cache_path = tmp_path / "cache.sqlite3"
+    cache_path.write_bytes(b"not a database" * 100)
+    cache = ResolutionCache(str(cache_path))
+    assert cache.get("https://example.org/") is None
+    cache.set("https://example.org/", (True, "resolved"))
+
+
+def test_is_resolvable_cached(http_server, default_http_client, resolution_cache_path):
+    """Check that 'isResolvable' resolves a URL once and then uses the cache."""
+    url = f"{http_server.url}/ok"
+    first = checks.isResolvable(url)
+    assert first[0] is True
+    assert checks.isResolvable(url) == first
+    assert checks.isResolvable(f"{url}#fragment")[0] is True
+    assert http_server.requests == ["/ok"]
+
+    with sqlite3.connect(resolution_cache_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM resolutions").fetchone()[0] == 1
+
+
+def test_is_resolvable_negative_ttl(http_server, default_http_client, tmp_path):
+    """Check that 'isResolvable' resolves failures again once they expire."""
+    url = f"{http_server.url}/missing"
+    configure_resolution_cache(str(tmp_path / "negative.sqlite3"), negative_ttl=0)
+    assert checks.isResolvable(url)[0] is False
+    assert checks.isResolvable(url)[0] is False
+    assert http_server.requests == ["/missing", "/missing"]
+
+
+def test_is_resolvable_cache_disabled(http_server, default_http_client):
+    """Check that 'isResolvable' always resolves URLs when the cache is disabled."""
+    configure_resolution_cache(None)
+    assert get_resolution_cache() is None
+    url = f"{http_server.url}/ok"
+    checks.isResolvable(url)
+    checks.isResolvable(url)
+    assert http_server.requests == ["/ok", "/ok"]
+
+
+def test_default_cache_path(monkeypatch, tmp_path):
+    """Check that the default cache is read from the environment variable, and that an empty
+    value disables it."""
+    monkeypatch.delenv(resolution_cache.CACHE_PATH_ENV_VAR, raising=False)
+    assert get_default_cache_path() == resolution_cache.DEFAULT_CACHE_PATH
+
+    cache_path = str(tmp_path / "env.sqlite3")
+    monkeypatch.setenv(resolution_cache.CACHE_PATH_ENV_VAR, cache_path)
+    # pylint: disable=W0212
+    monkeypatch.setattr(resolution_cache, "_default_cache_configured", False)
+    assert get_resolution_cache().path == cache_path
+
+    monkeypatch.setenv(resolution_cache.CACHE_PATH_ENV_VAR, "")
+    monkeypatch.setattr(resolution_cache, "_default_cache_configured", False)
+    assert get_resolution_cache() is None
+
+
+def test_get_set_logs_errors(tmp_path, caplog):
+    """Check that a cache that cannot be opened logs a warning and does not raise."""
+    cache = ResolutionCache(str(tmp_path))
+    with caplog.at_level(logging.WARNING, logger=resolution_cache.__name__):
+        assert cache.get("https://example.org/") is None
+        cache.set("https://example.org/", (True, "resolved"))
+    assert [record.levelname for record in caplog.records] == ["WARNING", "WARNING"]
+    assert "Unable to read resolution cache" in caplog.records[0].getMessage()
+    assert "Unable to write resolution cache" in caplog.records[1].getMessage()
@@ -1,7 +1,14 @@
 """Test module for metadig suites."""
 
 import json
+import math
 import os
+import shutil
+import sys
+import pytest
+from metadig import checks
+from metadig import data_pid_resolver
+from metadig import metadata
 from metadig import suites
 
 
@@ -11,6 +18,79 @@ def get_test_data_path(file_name):
     return os.path.join(test_data_directory, file_name)
 
 
+@pytest.fixture(name="offline_evaluation_context")
+def init_offline_evaluation_context(monkeypatch):
+    """Resolve evaluation contexts without data pids, so suites run without the network."""
+
+    def from_sysmeta_path(metadata_sysmeta_path, sysmeta_vars=None, data_pids=None):
+        if sysmeta_vars is None:
+            sysmeta_vars = checks.get_sysmeta_vars(metadata_sysmeta_path)
+        with open(metadata_sysmeta_path, "r", encoding="utf-8") as f:
+            system_metadata = f.read()
+        return checks.EvaluationContext(
+            sysmeta_vars, system_metadata, None, data_pids or []
+        )
+
+    monkeypatch.setattr(
+        checks.EvaluationContext, "from_sysmeta_path", staticmethod(from_sysmeta_path)
+    )
+    monkeypatch.setattr(
+        checks,
+        "get_data_pids_many",
+        lambda identifiers, *args, **kwargs: {pid: [] for pid in identifiers},
+    )
+    return True
+
+
+def write_timing_suite(directory, check_codes):
+    """Write python checks with the given code and a suite that runs them, for testing how
+    suites handle checks that run too long.
+
+    :return: Tuple of the suite path and the checks path
+    """
+    checks_dir = directory / "checks"
+    checks_dir.mkdir()
+    suite_checks = ""
+    for check_id, code in check_codes.items():
+        (checks_dir / f"{check_id}.xml").write_text(
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            + '<mdq:check xmlns:mdq="https://nceas.ucsb.edu/mdqe/v1">\n'
+            + f"  <id>{check_id}</id>\n"
+            + "  <environment>python</environment>\n"
+            + f"  <code><![CDATA[\n{code}\n]]></code>\n"
+            + "  <selector><name>title</name><xpath>/eml/dataset/title</xpath></selector>\n"
+            + "</mdq:check>\n",
+            encoding="utf-8",
+        )
+        suite_checks += f"  <check><id>{check_id}</id></check>\n"
+    suite_path = directory / "timing-suite.xml"
+    suite_path.write_text(
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        + '<mdq:suite xmlns:mdq="https://nceas.ucsb.edu/mdqe/v1">\n'
+        + f"{suite_checks}</mdq:suite>\n",
+        encoding="utf-8",
+    )
+    return str(suite_path), str(checks_dir)
+
+
+FAST_CHECK_CODE = """def call():
+    global output
+    global status
+    output = "Done."
+    status = "SUCCESS"
+"""
+
+
+def is_module_loaded(module_name):
+    """Check whether a module has been imported in the current process."""
+    return module_name in sys.modules
+
+
+def get_data_object_cache_max_bytes():
+    """Get the data object cache budget of the current process."""
+    return metadata.DATA_OBJECT_CACHE_MAX_BYTES
+
+
 def test_run_suite(storemanager_props, init_hashstore_with_test_data):
     """Check that run_suite can execute a suite of checks successfully."""
     assert init_hashstore_with_test_data
@@ -36,6 +116,200 @@ def test_run_suite(storemanager_props, init_hashstore_with_test_data):
     assert suite_data["results"] is not None
 
 
+def test_run_suite_resolves_evaluation_context_once(monkeypatch):
+    """Check that run_suite resolves the evaluation context once for all of its checks."""
+    sample_metadata_file_path = get_test_data_path("doi:10.18739_A2QJ78081.xml")
+    sample_sysmeta_file_path = get_test_data_path("doi:10.18739_A2QJ78081_sysmeta.xml")
+    suite_path = get_test_data_path("FAIR-suite-0.4.0.xml")
+    checks_path = get_test_data_path("checks")
+
+    calls = []
+
+    def from_sysmeta_path(metadata_sysmeta_path, sysmeta_vars=None, data_pids=None):
+        calls.append(metadata_sysmeta_path)
+        with open(metadata_sysmeta_path, "r", encoding="utf-8") as f:
+            system_metadata = f.read()
+        return checks.EvaluationContext(sysmeta_vars, system_metadata, None, [])
+
+    monkeypatch.setattr(
+        checks.EvaluationContext, "from_sysmeta_path", staticmethod(from_sysmeta_path)
+    )
+
+    suite_results = suites.run_suite(
+        suite_path,
+        checks_path,
+        sample_metadata_file_path,
+        sample_sysmeta_file_path,
+    )
+
+    suite_data = json.loads(suite_results)
+    assert calls == [sample_sysmeta_file_path]
+    assert suite_data["object_identifier"] == "doi:10.18739/A2QJ78081"
+    license_result = [
+        result
+        for result in suite_data["results"]
+        if result["check_id"] == "resource.license.present-2.0.0.xml"
+    ]
+    assert license_result[0]["status"] == "SUCCESS"
+
+
+def test_run_suite_evaluation_context_error(monkeypatch):
+    """Check that run_suite reports an error for each check when the evaluation context
+    cannot be resolved."""
+    sample_metadata_file_path = get_test_data_path("doi:10.18739_A2QJ78081.xml")
+    sample_sysmeta_file_path = get_test_data_path("doi:10.18739_A2QJ78081_sysmeta.xml")
+    suite_path = get_test_data_path("FAIR-suite-0.4.0.xml")
+    checks_path = get_test_data_path("checks")
+
+    def from_sysmeta_path(metadata_sysmeta_path, sysmeta_vars=None, data_pids=None):
+        raise RuntimeError(f"Member node unavailable for {metadata_sysmeta_path}")
+
+    monkeypatch.setattr(
+        checks.EvaluationContext, "from_sysmeta_path", staticmethod(from_sysmeta_path)
+    )
+
+    suite_results = suites.run_suite(
+        suite_path,
+        checks_path,
+        sample_metadata_file_path,
+        sample_sysmeta_file_path,
+    )
+
+    suite_data = json.loads(suite_results)
+    python_results = [
+        result
+        for result in suite_data["results"]
+        if result["check_id"].endswith(".xml")
+    ]
+    assert python_results
+    for result in python_results:
+        assert result["status"] == "ERROR"
+        assert "Member node unavailable" in result["output"]
+
+
+def test_suite_runner_reuses_pool(offline_evaluation_context):
+    """Check that a SuiteRunner runs many suites on the same worker pool and shuts it down."""
+    sample_metadata_file_path = get_test_data_path("doi:10.18739_A2QJ78081.xml")
+    sample_sysmeta_file_path = get_test_data_path("doi:10.18739_A2QJ78081_sysmeta.xml")
+    suite_path = get_test_data_path("FAIR-suite-0.4.0.xml")
+    checks_path = get_test_data_path("checks")
+
+    assert offline_evaluation_context
+    with suites.SuiteRunner(processes=2) as runner:
+        first_suite_data = json.loads(
+            runner.run_suite(
+                suite_path,
+                checks_path,
+                sample_metadata_file_path,
+                sample_sysmeta_file_path,
+            )
+        )
+        pool = runner.pool
+        second_suite_data = json.loads(
+            runner.run_suite(
+                suite_path,
+                checks_path,
+                sample_metadata_file_path,
+                sample_sysmeta_file_path,
+            )
+        )
+        assert runner.pool is pool
+        # Confirm workers have preloaded the modules used by checks
+        assert pool.apply(is_module_loaded, ("pandas",))
+
+    # pylint: disable=W0212
+    assert runner._pool is None
+    assert first_suite_data["run_status"] == "SUCCESS"
+    assert [result["status"] for result in first_suite_data["results"]] == [
+        result["status"] for result in second_suite_data["results"]
+    ]
+
+
+def test_suite_runner_splits_data_object_cache():
+    """Check that a SuiteRunner splits its data object cache budget between its workers."""
+    with suites.SuiteRunner(processes=4, data_object_cache_bytes=4096) as runner:
+        assert runner.worker_data_object_cache_bytes == 1024
+        assert runner.pool.apply(get_data_object_cache_max_bytes) == 1024
+    assert metadata.DATA_OBJECT_CACHE_MAX_BYTES == 1024**3
+
+    runner = suites.SuiteRunner(processes=2)
+    assert runner.data_object_cache_bytes == metadata.DATA_OBJECT_CACHE_MAX_BYTES
+    assert (
+        runner.worker_data_object_cache_bytes
+        == metadata.DATA_OBJECT_CACHE_MAX_BYTES // 2
+    )
+
+
+def test_iter_suite(offline_evaluation_context):
+    """Check that iter_suite yields the same check results as run_suite."""
+    sample_metadata_file_path = get_test_data_path("doi:10.18739_A2QJ78081.xml")
+    sample_sysmeta_file_path = get_test_data_path("doi:10.18739_A2QJ78081_sysmeta.xml")
+    suite_path = get_test_data_path("FAIR-suite-0.4.0.xml")
+    checks_path = get_test_data_path("checks")
+
+    assert offline_evaluation_context
+    with suites.SuiteRunner(processes=2) as runner:
+        suite_data = json.loads(
+            runner.run_suite(
+                suite_path,
+                checks_path,
+                sample_metadata_file_path,
+                sample_sysmeta_file_path,
+            )
+        )
+        check_results = list(
+            runner.iter_suite(
+                suite_path,
+                checks_path,
+                sample_metadata_file_path,
+                sample_sysmeta_file_path,
+                max_in_flight=1,
+            )
+        )
+
+    def sort_key(result):
+        return result["check_id"]
+
+    assert sorted(
+        [check_result.to_dict() for check_result in check_results], key=sort_key
+    ) == sorted(suite_data["results"], key=sort_key)
+
+
+def test_run_suite_structured(offline_evaluation_context):
+    """Check that run_suite returns check result records in structured mode."""
+    assert offline_evaluation_context
+    with suites.SuiteRunner(processes=2) as runner:
+        suite_results = runner.run_suite(
+            get_test_data_path("FAIR-suite-0.4.0.xml"),
+            get_test_data_path("checks"),
+            get_test_data_path("doi:10.18739_A2QJ78081.xml"),
+            get_test_data_path("doi:10.18739_A2QJ78081_sysmeta.xml"),
+            structured=True,
+        )
+
+    assert suite_results["run_status"] == "SUCCESS"
+    assert all(
+        isinstance(result, checks.CheckResult) for result in suite_results["results"]
+    )
+    suite_data = json.loads(checks.dumps_results(suite_results, compact=True))
+    assert suite_data["results"][0] == suite_results["results"][0].to_dict()
+
+
+def test_write_ndjson(tmp_path):
+    """Check that write_ndjson writes one line of JSON per record."""
+    output_path = tmp_path / "results.ndjson"
+    records = ({"check_id": f"check-{i}", "status": "SUCCESS"} for i in range(3))
+
+    assert suites.write_ndjson(records, str(output_path)) == 3
+    with open(output_path, "r", encoding="utf-8") as output_file:
+        lines = output_file.readlines()
+    assert [json.loads(line)["check_id"] for line in lines] == [
+        "check-0",
+        "check-1",
+        "check-2",
+    ]
+
+
 def test_map_and_get_check_ids_to_files_paths():
     """Check that 'map_and_get_check_ids_to_files' can read .xml files and map the ids"""
     path_to_checks = get_test_data_path("checks")
@@ -102,6 +376,369 @@ def test_map_and_get_check_ids_to_files_environment():
     assert id_to_checks_env["resource.publicationDate.timeframe.1"] == "rscript"
 
 
+def test_run_corpus(tmp_path, offline_evaluation_context):
+    """Check that run_corpus writes one line of suite results per document of a corpus."""
+    assert offline_evaluation_context
+    suite_path = get_test_data_path("FAIR-suite-0.4.0.xml")
+    checks_path = get_test_data_path("checks")
+    manifest_path = tmp_path / "manifest.tsv"
+    output_path = tmp_path / "results.ndjson"
+    testdata_dir = get_test_data_path("")
+    manifest_path.write_text(
+        "# metadata\tsysmeta\n"
+        + f"{testdata_dir}doi:10.18739_A2QJ78081.xml\t"
+        + f"{testdata_dir}doi:10.18739_A2QJ78081_sysmeta.xml\n"
+        + f"{testdata_dir}doi:10.18739_A2RJ48X0F.xml\t"
+        + f"{testdata_dir}doi:10.18739_A2RJ48X0F_sysmeta.xml\n"
+        + f"{testdata_dir}missing.xml\t"
+        + f"{testdata_dir}doi:10.18739_A2RJ48X0F_sysmeta.xml\n",
+        encoding="utf-8",
+    )
+
+    with suites.SuiteRunner(processes=2) as runner:
+        documents_written = runner.run_corpus(
+            suite_path,
+            checks_path,
+            str(manifest_path),
+            str(output_path),
+            max_in_flight=3,
+        )
+
+    assert documents_written == 3
+    with open(output_path, "r", encoding="utf-8") as output_file:
+        suite_data = {
+            os.path.basename(line_data["metadata_path"]): line_data
+            for line_data in map(json.loads, output_file)
+        }
+    assert suite_data["doi:10.18739_A2QJ78081.xml"]["run_status"] == "SUCCESS"
+    assert (
+        suite_data["doi:10.18739_A2QJ78081.xml"]["object_identifier"]
+        == "doi:10.18739/A2QJ78081"
+    )
+    assert suite_data["doi:10.18739_A2RJ48X0F.xml"]["results"]
+    assert suite_data["missing.xml"]["run_status"] == "FAILURE"
+    assert "Metadata not found" in suite_data["missing.xml"]["run_comments"][0]
+
+
+def test_run_corpus_batches_data_pids(tmp_path, monkeypatch):
+    """Check that run_corpus retrieves the data pids of many documents with each query."""
+    # pylint: disable=W0212
+    previous_resolver = data_pid_resolver._default_resolver
+    resolver = data_pid_resolver.configure_data_pid_resolver(batch_size=3)
+    queries = []
+
+    def query(identifiers, member_node_url):
+        queries.append(identifiers)
+        return {pid: [f"{pid}/data"] for pid in identifiers}
+
+    monkeypatch.setattr(resolver, "_query", query)
+    monkeypatch.setattr(
+        checks, "get_member_node_url", lambda member_node: "http://127.0.0.1:1/v2"
+    )
+    suite_path, checks_path = write_timing_suite(
+        tmp_path,
+        {
+            "check.data.pids": FAST_CHECK_CODE.replace(
+                'output = "Done."', "output = ','.join(dataPids)"
+            )
+        },
+    )
+    sysmeta_template = open(
+        get_test_data_path("doi:10.18739_A2QJ78081_sysmeta.xml"), encoding="utf-8"
+    ).read()
+    documents = []
+    for index in range(7):
+        sysmeta_path = tmp_path / f"sysmeta-{index}.xml"
+        sysmeta_path.write_text(
+            sysmeta_template.replace("doi:10.18739/A2QJ78081", f"doi:test/{index}"),
+            encoding="utf-8",
+        )
+        documents.append(
+            (get_test_data_path("doi:10.18739_A2QJ78081.xml"), str(sysmeta_path))
+        )
+    output_path = tmp_path / "results.ndjson"
+
+    try:
+        with suites.SuiteRunner(processes=2) as runner:
+            documents_written = runner.run_corpus(
+                suite_path, checks_path, documents, str(output_path)
+            )
+    finally:
+        data_pid_resolver._default_resolver = previous_resolver
+
+    assert documents_written == 7
+    assert len(queries) <= math.ceil(7 / 3)
+    with open(output_path, "r", encoding="utf-8") as output_file:
+        outputs = sorted(
+            json.loads(line)["results"][0]["output"] for line in output_file
+        )
+    assert outputs == [f"doi:test/{index}/data" for index in range(7)]
+
+
+def test_read_corpus_folder():
+    """Check that read_corpus pairs metadata documents with their sysmeta in a folder."""
+    documents = suites.read_corpus(get_test_data_path(""))
+
+    assert (
+        get_test_data_path("doi:10.18739_A2QJ78081.xml"),
+        get_test_data_path("doi:10.18739_A2QJ78081_sysmeta.xml"),
+    ) in documents
+    for metadata_xml_path, metadata_sysmeta_path in documents:
+        assert not metadata_xml_path.endswith("_sysmeta.xml")
+        assert suites.does_file_exist(metadata_sysmeta_path)
+
+
+def test_read_corpus_manifest(tmp_path):
+    """Check that read_corpus reads a manifest and resolves its relative paths."""
+    manifest_path = tmp_path / "manifest.csv"
+    manifest_path.write_text(
+        "metadata/doc.xml,sysmeta/doc.xml\n\n/abs/doc.xml, /abs/doc_sysmeta.xml\n",
+        encoding="utf-8",
+    )
+
+    documents = suites.read_corpus(str(manifest_path))
+    assert documents == [
+        (str(tmp_path / "metadata/doc.xml"), str(tmp_path / "sysmeta/doc.xml")),
+        ("/abs/doc.xml", "/abs/doc_sysmeta.xml"),
+    ]
+
+
+def test_check_duration_stats_order_tasks():
+    """Check that tasks are ordered longest expected first, with unknown checks expected to
+    take the average duration of the known checks."""
+    check_stats = suites.CheckDurationStats()
+    check_stats.record("fast.xml", 1.0)
+    check_stats.record("slow.xml", 5.0)
+    tagged_tasks = [
+        (0, ("/checks/fast.xml",)),
+        (1, ("/checks/unknown.xml",)),
+        (2, ("/checks/slow.xml",)),
+    ]
+
+    assert check_stats.expected_duration("unknown.xml") == 3.0
+    assert [tag for tag, _ in check_stats.order_tasks(tagged_tasks)] == [2, 1, 0]
+
+    check_stats.record("fast.xml", 11.0)
+    assert check_stats.expected_duration("fast.xml") == pytest.approx(4.0)
+    assert suites.CheckDurationStats().expected_duration("unknown.xml") == (
+        suites.CheckDurationStats.DEFAULT_DURATION
+    )
+
+
+def test_suite_runner_records_check_durations(tmp_path, offline_evaluation_context):
+    """Check that a SuiteRunner records the wall time of each check in its stats file."""
+    assert offline_evaluation_context
+    stats_path = str(tmp_path / "check_durations.json")
+    with suites.SuiteRunner(processes=2, check_stats=stats_path) as runner:
+        suite_data = json.loads(
+            runner.run_suite(
+                get_test_data_path("FAIR-suite-0.4.0.xml"),
+                get_test_data_path("checks"),
+                get_test_data_path("doi:10.18739_A2QJ78081.xml"),
+                get_test_data_path("doi:10.18739_A2QJ78081_sysmeta.xml"),
+            )
+        )
+
+    check_stats = suites.CheckDurationStats(stats_path)
+    run_check_ids = [
+        result["check_id"]
+        for result in suite_data["results"]
+        if result["check_id"].endswith(".xml")
+    ]
+    assert run_check_ids
+    # pylint: disable=W0212
+    assert sorted(check_stats._durations) == sorted(run_check_ids)
+
+
+def test_run_suite_shares_check_durations(tmp_path, offline_evaluation_context):
+    """Check that the module-level run_suite records check durations in the process-wide
+    stats, so that they build up across calls."""
+    assert offline_evaluation_context
+    # pylint: disable=W0212
+    previous_check_stats = suites._default_check_stats
+    stats_path = tmp_path / "check_durations.json"
+    check_stats = suites.configure_check_stats(str(stats_path))
+    suite_path, checks_path = write_timing_suite(
+        tmp_path, {"check.fast": FAST_CHECK_CODE}
+    )
+    try:
+        for _ in range(2):
+            suites.run_suite(
+                suite_path,
+                checks_path,
+                get_test_data_path("doi:10.18739_A2QJ78081.xml"),
+                get_test_data_path("doi:10.18739_A2QJ78081_sysmeta.xml"),
+            )
+        assert suites.get_check_stats() is check_stats
+    finally:
+        suites._default_check_stats = previous_check_stats
+    assert "check.fast.xml" in json.loads(stats_path.read_text())["durations"]
+
+
+def test_suite_runner_check_timeout(tmp_path, offline_evaluation_context):
+    """Check that a check running past the check timeout is cancelled and reported as an
+    error, while the rest of the suite completes."""
+    assert offline_evaluation_context
+    slow_check_code = """def call():
+    global output
+    global status
+    try:
+        while True:
+            pass
+    except Exception:
+        output = "Swallowed."
+        status = "SUCCESS"
+"""
+    suite_path, checks_path = write_timing_suite(
+        tmp_path, {"slow.check": slow_check_code, "fast.check": FAST_CHECK_CODE}
+    )
+
+    with suites.SuiteRunner(processes=2, check_timeout=0.5) as runner:
+        suite_data = json.loads(
+            runner.run_suite(
+                suite_path,
+                checks_path,
+                get_test_data_path("doi:10.18739_A2QJ78081.xml"),
+                get_test_data_path("doi:10.18739_A2QJ78081_sysmeta.xml"),
+            )
+        )
+
+    results = {result["check_id"]: result for result in suite_data["results"]}
+    assert results["fast.check.xml"]["status"] == "SUCCESS"
+    assert results["slow.check.xml"]["status"] == "ERROR"
+    assert "Check timed out" in results["slow.check.xml"]["output"]
+
+
+def test_iter_suite_check_timeout(tmp_path, offline_evaluation_context):
+    """Check that the module-level iter_suite passes its time budgets to its runner."""
+    assert offline_evaluation_context
+    suite_path, checks_path = write_timing_suite(
+        tmp_path,
+        {
+            "slow.check": FAST_CHECK_CODE.replace(
+                "def call():\n", "def call():\n    while True:\n        pass\n"
+            )
+        },
+    )
+
+    results = list(
+        suites.iter_suite(
+            suite_path,
+            checks_path,
+            get_test_data_path("doi:10.18739_A2QJ78081.xml"),
+            get_test_data_path("doi:10.18739_A2QJ78081_sysmeta.xml"),
+            check_timeout=0.5,
+        )
+    )
+
+    assert [result.status for result in results] == ["ERROR"]
+    assert "Check timed out" in results[0].output
+
+
+def test_suite_runner_recycles_hung_worker(tmp_path, offline_evaluation_context):
+    """Check that a check that cannot be cancelled has its worker recycled once its suite runs
+    past the suite timeout, and that the pool is usable afterwards."""
+    assert offline_evaluation_context
+    hung_check_code = """def call():
+    import signal
+    import time
+    signal.pthread_sigmask(signal.SIG_BLOCK, [signal.SIGALRM])
+    time.sleep(60)
+"""
+    suite_path, checks_path = write_timing_suite(
+        tmp_path, {"hung.check": hung_check_code, "fast.check": FAST_CHECK_CODE}
+    )
+    metadata_path = get_test_data_path("doi:10.18739_A2QJ78081.xml")
+    sysmeta_path = get_test_data_path("doi:10.18739_A2QJ78081_sysmeta.xml")
+
+    with suites.SuiteRunner(processes=2, suite_timeout=1) as runner:
+        suite_data = json.loads(
+            runner.run_suite(suite_path, checks_path, metadata_path, sysmeta_path)
+        )
+        results = {result["check_id"]: result for result in suite_data["results"]}
+        assert results["fast.check.xml"]["status"] == "SUCCESS"
+        assert results["hung.check.xml"]["status"] == "ERROR"
+        assert "Suite exceeded its time budget" in results["hung.check.xml"]["output"]
+
+        check_results = list(
+            runner.iter_suite(suite_path, checks_path, metadata_path, sysmeta_path)
+        )
+        assert sorted(result.status for result in check_results) == [
+            "ERROR",
+            "SUCCESS",
+        ]
+
+
+def test_check_registry_maps():
+    """Check that a 'CheckRegistry' maps check ids to the same files and environments as
+    'map_and_get_check_ids_to_files_and_env'."""
+    path_to_checks = get_test_data_path("checks")
+    registry = suites.CheckRegistry(path_to_checks)
+
+    id_to_checks_dict, id_to_checks_env = registry.get_maps()
+    assert id_to_checks_dict["resource.license.present-2.0.0"] == get_test_data_path(
+        "checks/resource.license.present-2.0.0.xml"
+    )
+    assert id_to_checks_env["resource.publicationDate.timeframe.1"] == "rscript"
+    assert (id_to_checks_dict, id_to_checks_env) == (
+        suites.map_and_get_check_ids_to_files_and_env(path_to_checks)
+    )
+
+
+def test_check_registry_refresh(tmp_path):
+    """Check that 'CheckRegistry.refresh' picks up new, modified and removed checks."""
+    shutil.copy(
+        get_test_data_path("checks/resource.license.present-2.0.0.xml"), tmp_path
+    )
+    registry = suites.CheckRegistry(str(tmp_path))
+    assert not registry.refresh()
+
+    # Add a check
+    shutil.copy(
+        get_test_data_path("checks/entity.attributeName.differs-2.0.0.xml"), tmp_path
+    )
+    assert registry.refresh()
+    id_to_checks_dict, _ = registry.get_maps()
+    assert "entity.attributeName.differs-2.0.0" in id_to_checks_dict
+
+    # Modify a check's id
+    license_check_path = tmp_path / "resource.license.present-2.0.0.xml"
+    license_check = license_check_path.read_text(encoding="utf-8")
+    license_check_path.write_text(
+        license_check.replace(
+            "<id>resource.license.present-2.0.0</id>",
+            "<id>resource.license.present-2.0.10</id>",
+        ),
+        encoding="utf-8",
+    )
+    assert registry.refresh()
+    id_to_checks_dict, _ = registry.get_maps()
+    assert "resource.license.present-2.0.10" in id_to_checks_dict
+    assert "resource.license.present-2.0.0" not in id_to_checks_dict
+
+    # Remove a check
+    os.remove(tmp_path / "entity.attributeName.differs-2.0.0.xml")
+    assert registry.refresh()
+    id_to_checks_dict, _ = registry.get_maps()
+    assert "entity.attributeName.differs-2.0.0" not in id_to_checks_dict
+
+
+def test_check_registry_index_file(tmp_path, monkeypatch):
+    """Check that a 'CheckRegistry' saves its index and does not parse unchanged checks when
+    loaded from the index file."""
+    path_to_checks = get_test_data_path("checks")
+    index_path = str(tmp_path / "check_index.json")
+    registry = suites.CheckRegistry(path_to_checks, index_path=index_path)
+    assert os.path.isfile(index_path)
+
+    def read_check(file_path):
+        raise AssertionError(f"Unexpected parse of unchanged check: {file_path}")
+
+    monkeypatch.setattr(suites.CheckRegistry, "_read_check", staticmethod(read_check))
+    reloaded_registry = suites.CheckRegistry(path_to_checks, index_path=index_path)
+    assert reloaded_registry.get_maps() == registry.get_maps()
+
+
 def test_does_file_exist():
     """Test that exceptions are raised when a file cannot be found at the given path."""
     path_that_does_not_exist = "/this/path/does/not/exist"